@@ -0,0 +1,129 @@
+"""CPU inference benchmark — denoising steps/sec for each CPU profile setting.
+
+Loads one checkpoint on CPU and times txt2img denoising (VAE decode
+excluded) as the ``cpu:`` settings are enabled one after another: untuned
+fp32, explicit thread counts, channels-last, SDPA attention and finally
+bf16 autocast. Each row is cumulative, so the speedup column shows what
+every setting adds on this machine.
+
+Usage:
+    python benchmarks/bench_cpu.py MODEL [--size 512] [--steps 8] [--threads 8,16]
+        [--affinity 0-15]
+
+MODEL is a .safetensors checkpoint or a diffusers directory / HuggingFace id.
+Needs the diffusers extra (pip install -e ".[diffusers]").
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import os
+import time
+from pathlib import Path
+
+import torch
+from diffusers import AutoPipelineForText2Image
+from diffusers.models.attention_processor import AttnProcessor2_0
+
+from forge.backends.diffusers_backend.backend import ARCHITECTURE_PIPELINES
+from forge.backends.diffusers_backend.cpu_profile import (
+    BF16_FLAGS,
+    cpu_flags,
+    parse_cpu_list,
+    physical_cores,
+    read_cpuinfo,
+)
+from forge.models.safetensors_header import inspect_safetensors
+
+
+def _load(model: str):
+    path = Path(model)
+    if path.is_file():
+        architecture = inspect_safetensors(path).architecture
+        pipeline_cls = ARCHITECTURE_PIPELINES.get(architecture)
+        if pipeline_cls is None:
+            raise SystemExit(f"{path.name}: unsupported architecture {architecture}")
+        return pipeline_cls.from_single_file(str(path), torch_dtype=torch.float32)
+    return AutoPipelineForText2Image.from_pretrained(model, torch_dtype=torch.float32)
+
+
+def _steps_per_second(pipe, args: argparse.Namespace, bf16: bool) -> float:
+    autocast = (
+        torch.autocast("cpu", dtype=torch.bfloat16) if bf16 else contextlib.nullcontext()
+    )
+
+    def run(steps: int) -> None:
+        pipe(
+            prompt="a lighthouse on a cliff at dusk",
+            width=args.size,
+            height=args.size,
+            num_inference_steps=steps,
+            generator=torch.Generator().manual_seed(0),
+            output_type="latent",
+        )
+
+    with torch.inference_mode(), autocast:
+        run(1)  # first call pays for allocator and kernel selection
+        started = time.perf_counter()
+        run(args.steps)
+    return args.steps / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("model")
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--steps", type=int, default=8)
+    parser.add_argument("--threads", default="", help="comma-separated intra-op thread counts")
+    parser.add_argument("--affinity", default="", help='pin to a CPU list, e.g. "0-15"')
+    args = parser.parse_args()
+
+    cpuinfo = read_cpuinfo()
+    affinity = parse_cpu_list(args.affinity) if args.affinity else []
+    if affinity:
+        os.sched_setaffinity(0, affinity)
+    cores = physical_cores(cpuinfo, affinity or sorted(os.sched_getaffinity(0)))
+    thread_counts = [int(t) for t in args.threads.split(",") if t] or [cores]
+    has_bf16 = bool(cpu_flags(cpuinfo) & BF16_FLAGS)
+    print(
+        f"torch {torch.__version__}, {cores} physical cores, "
+        f"native bf16: {'yes' if has_bf16 else 'no'}, {args.size}px, {args.steps} steps"
+    )
+
+    pipe = _load(args.model).to("cpu")
+    pipe.set_progress_bar_config(disable=True)
+    pipe.enable_attention_slicing()  # the untuned configuration
+
+    rows = [
+        (
+            f"fp32, default threads ({torch.get_num_threads()})",
+            _steps_per_second(pipe, args, bf16=False),
+        )
+    ]
+    by_threads = {}
+    for threads in thread_counts:
+        torch.set_num_threads(threads)
+        by_threads[threads] = _steps_per_second(pipe, args, bf16=False)
+        rows.append((f"+ {threads} intra-op threads", by_threads[threads]))
+    # Later settings build on the fastest thread count
+    torch.set_num_threads(max(by_threads, key=by_threads.get))
+
+    for module in (pipe.unet, pipe.vae):
+        module.to(memory_format=torch.channels_last)
+    rows.append(("+ channels_last", _steps_per_second(pipe, args, bf16=False)))
+
+    for module in (pipe.unet, pipe.vae):
+        module.set_attn_processor(AttnProcessor2_0())
+    rows.append(("+ SDPA attention", _steps_per_second(pipe, args, bf16=False)))
+
+    label = "+ bf16 autocast" + ("" if has_bf16 else " (emulated, no native bf16)")
+    rows.append((label, _steps_per_second(pipe, args, bf16=True)))
+
+    baseline = rows[0][1]
+    for name, rate in rows:
+        print(f"{name:>45}: steps/s={rate:7.3f}  speedup={rate / baseline:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Mixed read/write SQLite benchmark — worker status commits vs gallery reads.
+
+Simulates the GPU worker committing job state while several clients page
+through the gallery, and reports throughput and read latency for the default
+aiosqlite engine ("baseline") and the tuned WAL reader/writer profile.
+
+Usage:
+    python benchmarks/bench_db.py [--seconds 5] [--readers 4] [--images 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from forge.config import DatabaseConfig
+from forge.db.engine import (
+    create_engine_and_session,
+    create_read_engine_and_session,
+    run_migrations,
+)
+from forge.db.tables import GeneratedImage, Job
+
+
+async def _seed(session_factory, images: int) -> list[str]:
+    job_ids = []
+    async with session_factory() as session:
+        for i in range(images // 4):
+            job = Job(prompt=f"prompt {i}")
+            session.add(job)
+            await session.flush()
+            job_ids.append(job.id)
+            for n in range(4):
+                session.add(
+                    GeneratedImage(
+                        job_id=job.id,
+                        file_path=f"/tmp/forge_{job.id}_{n}.png",
+                        width=512,
+                        height=512,
+                        prompt=f"prompt {i}",
+                    )
+                )
+        await session.commit()
+    return job_ids
+
+
+async def _writer(session_factory, job_ids: list[str], deadline: float, stats: dict) -> None:
+    i = 0
+    while time.monotonic() < deadline:
+        job_id = job_ids[i % len(job_ids)]
+        async with session_factory() as session:
+            await session.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(status="running", started_at=datetime.now(UTC))
+            )
+            await session.commit()
+        stats["writes"] += 1
+        i += 1
+
+
+async def _reader(session_factory, deadline: float, stats: dict) -> None:
+    page = 0
+    while time.monotonic() < deadline:
+        t0 = time.perf_counter()
+        async with session_factory() as session:
+            await session.execute(select(func.count(GeneratedImage.id)))
+            stmt = (
+                select(GeneratedImage)
+                .order_by(GeneratedImage.created_at.desc())
+                .offset((page % 20) * 50)
+                .limit(50)
+            )
+            (await session.execute(stmt)).scalars().all()
+        stats["read_latencies"].append(time.perf_counter() - t0)
+        page += 1
+
+
+async def _run_profile(name: str, db_path: Path, args: argparse.Namespace) -> None:
+    url = f"sqlite+aiosqlite:///{db_path}"
+    if name == "baseline":
+        engine = create_async_engine(url)
+        await run_migrations(engine)
+        write_factory = read_factory = async_sessionmaker(engine, expire_on_commit=False)
+        engines = [engine]
+    else:
+        config = DatabaseConfig()
+        engine, write_factory = create_engine_and_session(db_path, config)
+        await run_migrations(engine)
+        read_engine, read_factory = create_read_engine_and_session(db_path, config)
+        engines = [engine, read_engine]
+
+    job_ids = await _seed(write_factory, args.images)
+    stats: dict = {"writes": 0, "read_latencies": []}
+    deadline = time.monotonic() + args.seconds
+
+    await asyncio.gather(
+        _writer(write_factory, job_ids, deadline, stats),
+        *[_reader(read_factory, deadline, stats) for _ in range(args.readers)],
+    )
+    for e in engines:
+        await e.dispose()
+
+    lat = sorted(stats["read_latencies"])
+    p95 = lat[int(len(lat) * 0.95)] if lat else 0.0
+    print(
+        f"{name:>9}: writes/s={stats['writes'] / args.seconds:8.1f}  "
+        f"reads/s={len(lat) / args.seconds:8.1f}  "
+        f"read p50={statistics.median(lat) * 1000 if lat else 0:6.2f}ms  "
+        f"p95={p95 * 1000:6.2f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--images", type=int, default=5000)
+    args = parser.parse_args()
+
+    for name in ("baseline", "tuned"):
+        with tempfile.TemporaryDirectory() as tmp:
+            await _run_profile(name, Path(tmp) / "bench.db", args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+"""Feature caching benchmark — speedup and image similarity against full UNet steps.
+
+Generates the same prompts and seeds with every UNet step run in full
+(the baseline), then with deep-feature caching at each interval (see
+forge/backends/diffusers_backend/feature_cache.py). Each row reports time
+per image, speedup, and how close the images stay to the baseline: PSNR
+and SSIM on luma, averaged over the seeds. As a rough guide, SSIM above
+0.9 is hard to tell apart at a glance, which is the bar for draft-quality
+jobs.
+
+Usage:
+    python benchmarks/bench_feature_cache.py MODEL [--size 512] [--steps 25]
+        [--seeds 0,1,2] [--intervals 2,3,5] [--guard 0.2] [--device cuda]
+
+MODEL is a .safetensors checkpoint or a diffusers directory / HuggingFace id.
+Needs the diffusers extra (pip install -e ".[diffusers]").
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+from diffusers import AutoPipelineForText2Image
+
+from forge.backends.diffusers_backend.backend import ARCHITECTURE_PIPELINES
+from forge.backends.diffusers_backend.feature_cache import FeatureCache
+from forge.models.safetensors_header import inspect_safetensors
+
+PROMPT = "a lighthouse on a cliff at dusk, detailed, dramatic clouds"
+SSIM_WINDOW = 7
+
+
+def _load(model: str, dtype: torch.dtype):
+    path = Path(model)
+    if path.is_file():
+        architecture = inspect_safetensors(path).architecture
+        pipeline_cls = ARCHITECTURE_PIPELINES.get(architecture)
+        if pipeline_cls is None:
+            raise SystemExit(f"{path.name}: unsupported architecture {architecture}")
+        return pipeline_cls.from_single_file(str(path), torch_dtype=dtype)
+    return AutoPipelineForText2Image.from_pretrained(model, torch_dtype=dtype)
+
+
+def _luma(image) -> np.ndarray:
+    return np.asarray(image.convert("L"), dtype=np.float64)
+
+
+def _box(a: np.ndarray, k: int = SSIM_WINDOW) -> np.ndarray:
+    """Mean over every k x k window, from a summed-area table."""
+    table = np.pad(a, ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+    return (table[k:, k:] - table[:-k, k:] - table[k:, :-k] + table[:-k, :-k]) / (k * k)
+
+
+def ssim(a, b) -> float:
+    x, y = _luma(a), _luma(b)
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    mx, my = _box(x), _box(y)
+    vx, vy = _box(x * x) - mx * mx, _box(y * y) - my * my
+    cov = _box(x * y) - mx * my
+    s = ((2 * mx * my + c1) * (2 * cov + c2)) / ((mx * mx + my * my + c1) * (vx + vy + c2))
+    return float(s.mean())
+
+
+def psnr(a, b) -> float:
+    mse = np.mean((_luma(a) - _luma(b)) ** 2)
+    return float("inf") if mse == 0 else float(10 * np.log10(255**2 / mse))
+
+
+def _generate(pipe, args: argparse.Namespace, seeds: list[int], cache: FeatureCache | None):
+    """Images for each seed, and the mean seconds per image."""
+    images, elapsed = [], 0.0
+    for seed in seeds:
+        if cache is not None:
+            cache.start(args.steps)
+        if args.device.startswith("cuda"):
+            torch.cuda.synchronize()
+        started = time.perf_counter()
+        images.append(
+            pipe(
+                prompt=PROMPT,
+                width=args.size,
+                height=args.size,
+                num_inference_steps=args.steps,
+                generator=torch.Generator(args.device).manual_seed(seed),
+            ).images[0]
+        )
+        if args.device.startswith("cuda"):
+            torch.cuda.synchronize()
+        elapsed += time.perf_counter() - started
+    return images, elapsed / len(seeds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("model")
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--steps", type=int, default=25)
+    parser.add_argument("--seeds", default="0,1,2")
+    parser.add_argument("--intervals", default="2,3,5")
+    parser.add_argument("--guard", type=float, default=0.2, help="0 = fixed interval only")
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu")
+    args = parser.parse_args()
+    seeds = [int(s) for s in args.seeds.split(",") if s]
+    intervals = [int(i) for i in args.intervals.split(",") if i]
+
+    dtype = torch.float16 if args.device.startswith("cuda") else torch.float32
+    pipe = _load(args.model, dtype).to(args.device)
+    pipe.set_progress_bar_config(disable=True)
+    print(
+        f"torch {torch.__version__}, {args.device}, {args.size}px, {args.steps} steps, "
+        f"seeds {seeds}, guard {args.guard:g}"
+    )
+
+    with torch.inference_mode():
+        _generate(pipe, args, seeds[:1], None)  # first call pays for kernel selection
+        baseline, base_seconds = _generate(pipe, args, seeds, None)
+        print(f"{'full UNet every step':>28}: {base_seconds:6.2f}s/image  speedup= 1.00x")
+        for interval in intervals:
+            cache = FeatureCache(interval, args.guard)
+            detach = cache.attach(pipe.unet)
+            try:
+                images, seconds = _generate(pipe, args, seeds, cache)
+            finally:
+                detach()
+            scores = [(psnr(a, b), ssim(a, b)) for a, b in zip(images, baseline, strict=True)]
+            reused = cache.reused_steps / (cache.full_steps + cache.reused_steps)
+            print(
+                f"{f'interval {interval} ({reused:.0%} reused)':>28}: {seconds:6.2f}s/image  "
+                f"speedup={base_seconds / seconds:5.2f}x  "
+                f"PSNR={np.mean([p for p, _ in scores]):5.1f}dB  "
+                f"SSIM={np.mean([s for _, s in scores]):.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
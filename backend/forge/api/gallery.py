@@ -2,15 +2,55 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Request
+import asyncio
+from pathlib import Path
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import FileResponse
-from sqlalchemy import func, select
+from PIL import Image
+from sqlalchemy import delete, func, select, update
 
 from forge.db.tables import GeneratedImage
-from forge.schemas.gallery import GalleryImageResponse, GalleryListResponse
+from forge.schemas.gallery import (
+    FileTaskResponse,
+    GalleryBulkAction,
+    GalleryBulkRequest,
+    GalleryBulkResponse,
+    GalleryFilter,
+    GalleryImageResponse,
+    GalleryListResponse,
+    SimilarImageResponse,
+    SimilarImagesResponse,
+)
+from forge.storage.features import extract_features
+from forge.storage.file_tasks import FileTask
+from forge.storage.importer import import_outputs
+from forge.storage.similarity import get_similarity_index
+from forge.storage.uploads import UploadError, copy_to_uploads
 
 router = APIRouter(tags=["gallery"])
 
+# Keep IN (...) lists well under SQLite's bound-variable limit
+ID_CHUNK_SIZE = 500
+
+
+def _image_fields(img: GeneratedImage) -> dict:
+    return {
+        "id": img.id,
+        "job_id": img.job_id,
+        "file_path": img.file_path,
+        "thumbnail_path": img.thumbnail_path,
+        "width": img.width,
+        "height": img.height,
+        "seed": img.seed,
+        "prompt": img.prompt,
+        "negative_prompt": img.negative_prompt,
+        "model_id": img.model_id,
+        "is_favorite": img.is_favorite,
+        "created_at": img.created_at,
+    }
+
 
 @router.get("/gallery", response_model=GalleryListResponse)
 async def list_gallery(
@@ -20,7 +60,7 @@ async def list_gallery(
     favorites_only: bool = False,
 ):
     """List generated images with pagination."""
-    session_factory = request.app.state.session_factory
+    session_factory = request.app.state.read_session_factory
 
     async with session_factory() as session:
         base_query = select(GeneratedImage)
@@ -43,21 +83,7 @@ async def list_gallery(
         )
         result = await session.execute(stmt)
         images = [
-            GalleryImageResponse(
-                id=img.id,
-                job_id=img.job_id,
-                file_path=img.file_path,
-                thumbnail_path=img.thumbnail_path,
-                width=img.width,
-                height=img.height,
-                seed=img.seed,
-                prompt=img.prompt,
-                negative_prompt=img.negative_prompt,
-                model_id=img.model_id,
-                is_favorite=img.is_favorite,
-                created_at=img.created_at,
-            )
-            for img in result.scalars().all()
+            GalleryImageResponse(**_image_fields(img)) for img in result.scalars().all()
         ]
 
     return GalleryListResponse(
@@ -71,7 +97,7 @@ async def list_gallery(
 @router.get("/gallery/{image_id}/image")
 async def get_image(image_id: str, request: Request):
     """Serve the full-size image file."""
-    session_factory = request.app.state.session_factory
+    session_factory = request.app.state.read_session_factory
 
     async with session_factory() as session:
         stmt = select(GeneratedImage).where(GeneratedImage.id == image_id)
@@ -89,7 +115,7 @@ async def get_image(image_id: str, request: Request):
 @router.get("/gallery/{image_id}/thumbnail")
 async def get_thumbnail(image_id: str, request: Request):
     """Serve the thumbnail image."""
-    session_factory = request.app.state.session_factory
+    session_factory = request.app.state.read_session_factory
 
     async with session_factory() as session:
         stmt = select(GeneratedImage).where(GeneratedImage.id == image_id)
@@ -104,6 +130,90 @@ async def get_thumbnail(image_id: str, request: Request):
     return FileResponse(img.thumbnail_path, media_type="image/jpeg")
 
 
+@router.post("/gallery/{image_id}/upload")
+async def send_to_uploads(image_id: str, request: Request):
+    """Make a generated image the source of an img2img, inpaint or outpaint job.
+
+    Returns an upload like ``POST /uploads``. Backends that cache latents
+    keep the ones each image was decoded from, so img2img on the upload at
+    the image's own size skips the VAE encoder.
+    """
+    settings = request.app.state.settings
+    session_factory = request.app.state.read_session_factory
+
+    async with session_factory() as session:
+        stmt = select(GeneratedImage).where(GeneratedImage.id == image_id)
+        img = (await session.execute(stmt)).scalar_one_or_none()
+    if not img:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    try:
+        return await asyncio.to_thread(
+            copy_to_uploads, Path(img.file_path), settings.paths.resolved_uploads
+        )
+    except OSError as exc:
+        raise HTTPException(status_code=404, detail="Image file not found") from exc
+    except UploadError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+
+
+@router.get("/gallery/{image_id}/similar", response_model=SimilarImagesResponse)
+async def find_similar(
+    image_id: str,
+    request: Request,
+    k: int = Query(default=20, ge=1, le=200),
+    method: Literal["phash", "embedding"] = "phash",
+):
+    """Find the images most similar to ``image_id`` (near-duplicates, "more like this")."""
+    settings = request.app.state.settings
+    session_factory = request.app.state.read_session_factory
+    index = get_similarity_index(settings.paths.resolved_outputs)
+
+    async with session_factory() as session:
+        stmt = select(GeneratedImage).where(GeneratedImage.id == image_id)
+        img = (await session.execute(stmt)).scalar_one_or_none()
+    if not img:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    # Images saved before indexing was enabled are indexed on first query
+    if not index.has(image_id, method):
+        def _backfill() -> None:
+            with Image.open(img.file_path) as pil:
+                index.add(image_id, extract_features(pil, embeddings=method == "embedding"))
+
+        try:
+            await asyncio.to_thread(_backfill)
+        except OSError as exc:
+            raise HTTPException(status_code=404, detail="Image file not found") from exc
+
+    # The index is append-only, so deleted images still come back as hits;
+    # widen the search until k live ones are found or the index runs out
+    images: list[SimilarImageResponse] = []
+    seen: set[str] = set()
+    fetch = k
+    while True:
+        hits = await asyncio.to_thread(index.search, image_id, fetch, method)
+        fresh = [h for h in hits if h.image_id not in seen]
+        seen.update(h.image_id for h in fresh)
+        async with session_factory() as session:
+            stmt = select(GeneratedImage).where(
+                GeneratedImage.id.in_([h.image_id for h in fresh])
+            )
+            rows = {r.id: r for r in (await session.execute(stmt)).scalars()}
+        images.extend(
+            SimilarImageResponse(
+                **_image_fields(rows[h.image_id]), score=h.score, distance=h.distance
+            )
+            for h in fresh
+            if h.image_id in rows
+        )
+        if len(images) >= k or len(hits) < fetch:
+            break
+        fetch *= 2
+
+    return SimilarImagesResponse(image_id=image_id, method=method, images=images[:k])
+
+
 @router.patch("/gallery/{image_id}/favorite")
 async def toggle_favorite(image_id: str, request: Request):
     """Toggle favorite status for an image."""
@@ -123,3 +233,177 @@ async def toggle_favorite(image_id: str, request: Request):
         await session.commit()
 
     return {"id": image_id, "is_favorite": img.is_favorite}
+
+
+def _filter_conditions(f: GalleryFilter) -> list:
+    conditions = []
+    if f.favorites_only:
+        conditions.append(GeneratedImage.is_favorite.is_(True))
+    if f.job_id:
+        conditions.append(GeneratedImage.job_id == f.job_id)
+    if f.model_id:
+        conditions.append(GeneratedImage.model_id == f.model_id)
+    if f.prompt_contains:
+        conditions.append(GeneratedImage.prompt.contains(f.prompt_contains))
+    if f.created_after:
+        conditions.append(GeneratedImage.created_at >= f.created_after)
+    if f.created_before:
+        conditions.append(GeneratedImage.created_at < f.created_before)
+    return conditions
+
+
+def _selections(req: GalleryBulkRequest) -> list[list]:
+    """WHERE clauses covering the request's selection, one per statement."""
+    if req.filter is not None:
+        return [_filter_conditions(req.filter)]
+    ids = list(dict.fromkeys(req.ids or []))
+    return [
+        [GeneratedImage.id.in_(ids[i : i + ID_CHUNK_SIZE])]
+        for i in range(0, len(ids), ID_CHUNK_SIZE)
+    ]
+
+
+def _resolve_destination(outputs_dir: Path, destination: str) -> Path:
+    """Resolve a move destination, refusing anything outside the outputs dir."""
+    root = outputs_dir.resolve()
+    target = (root / destination).resolve()
+    if target == root or not target.is_relative_to(root):
+        raise HTTPException(status_code=400, detail="Invalid destination")
+    return target
+
+
+@router.post("/gallery/bulk", response_model=GalleryBulkResponse)
+async def bulk_gallery(req: GalleryBulkRequest, request: Request):
+    """Favorite, unfavorite, delete or move many images in one transaction.
+
+    File deletes and moves run afterwards as a background task; poll
+    ``/gallery/tasks/{id}`` or listen for ``gallery:task_progress`` events.
+    """
+    session_factory = request.app.state.session_factory
+    file_tasks = request.app.state.file_tasks
+    outputs_dir = request.app.state.settings.paths.resolved_outputs
+    selections = _selections(req)
+
+    matched = 0
+    task = None
+
+    if req.action in (GalleryBulkAction.FAVORITE, GalleryBulkAction.UNFAVORITE):
+        is_favorite = req.action == GalleryBulkAction.FAVORITE
+        async with session_factory() as session:
+            for conditions in selections:
+                result = await session.execute(
+                    update(GeneratedImage).where(*conditions).values(is_favorite=is_favorite)
+                )
+                matched += result.rowcount
+            await session.commit()
+
+    elif req.action == GalleryBulkAction.DELETE:
+        paths: list[str] = []
+        async with session_factory() as session:
+            for conditions in selections:
+                rows = await session.execute(
+                    select(GeneratedImage.file_path, GeneratedImage.thumbnail_path).where(
+                        *conditions
+                    )
+                )
+                for file_path, thumbnail_path in rows:
+                    matched += 1
+                    paths.extend(p for p in (file_path, thumbnail_path) if p)
+                await session.execute(delete(GeneratedImage).where(*conditions))
+            await session.commit()
+        task = file_tasks.submit_delete(paths)
+
+    else:
+        target = _resolve_destination(outputs_dir, req.destination)
+        planned: list[dict[str, str]] = []
+        async with session_factory() as session:
+            for conditions in selections:
+                rows = await session.execute(
+                    select(
+                        GeneratedImage.id,
+                        GeneratedImage.file_path,
+                        GeneratedImage.thumbnail_path,
+                    ).where(*conditions)
+                )
+                for image_id, file_path, thumbnail_path in rows:
+                    planned.append(
+                        {
+                            "id": image_id,
+                            "old_file": file_path,
+                            "old_thumb": thumbnail_path,
+                            "file_path": str(target / Path(file_path).name),
+                            "thumbnail_path": (
+                                str(target / "thumbnails" / Path(thumbnail_path).name)
+                                if thumbnail_path
+                                else ""
+                            ),
+                        }
+                    )
+        matched = len(planned)
+
+        moves = [(p["old_file"], p["file_path"]) for p in planned]
+        moves += [(p["old_thumb"], p["thumbnail_path"]) for p in planned if p["old_thumb"]]
+        # Each moved file repoints one column of its row
+        columns = {p["old_file"]: (p["id"], "file_path") for p in planned}
+        columns.update(
+            {p["old_thumb"]: (p["id"], "thumbnail_path") for p in planned if p["old_thumb"]}
+        )
+
+        async def _commit_moves(chunk: list[tuple[str, str]], failed: set[str]) -> None:
+            updates: dict[str, list[dict[str, str]]] = {"file_path": [], "thumbnail_path": []}
+            for src, dst in chunk:
+                if src in columns and src not in failed:
+                    image_id, column = columns[src]
+                    updates[column].append({"id": image_id, column: dst})
+            async with session_factory() as session:
+                for rows in updates.values():
+                    if rows:
+                        await session.execute(update(GeneratedImage), rows)
+                await session.commit()
+
+        task = file_tasks.submit_move(moves, on_chunk=_commit_moves)
+
+    return GalleryBulkResponse(
+        action=req.action,
+        matched=matched,
+        task=FileTaskResponse(**task.to_dict()) if task else None,
+    )
+
+
+@router.get("/gallery/tasks/{task_id}", response_model=FileTaskResponse)
+async def get_file_task(task_id: str, request: Request):
+    """Progress of a background delete/move started by a bulk operation."""
+    task = request.app.state.file_tasks.get(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return FileTaskResponse(**task.to_dict())
+
+
+@router.post("/gallery/import", response_model=FileTaskResponse)
+async def import_gallery(request: Request, regenerate_thumbnails: bool = True):
+    """Rebuild gallery rows from image files under the outputs directory.
+
+    Incremental: files already imported with an unchanged mtime are skipped.
+    """
+    settings = request.app.state.settings
+    session_factory = request.app.state.session_factory
+    file_tasks = request.app.state.file_tasks
+
+    if file_tasks.active("import"):
+        raise HTTPException(status_code=409, detail="An import is already running")
+
+    async def _run(task: FileTask) -> None:
+        async def _progress(done: int, total: int) -> None:
+            task.done, task.total = done, total
+            await file_tasks.report(task)
+
+        stats = await import_outputs(
+            settings.paths.resolved_outputs,
+            session_factory,
+            regenerate_thumbnails=regenerate_thumbnails,
+            progress=_progress,
+        )
+        task.failed = stats.failed
+
+    task = file_tasks.submit("import", 0, _run)
+    return FileTaskResponse(**task.to_dict())
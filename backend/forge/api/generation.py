@@ -4,12 +4,14 @@ from __future__ import annotations
 
 import json
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Request
 from sqlalchemy import select
 
+from forge.backends.samplers import SAMPLERS
 from forge.core.queue import QueuedJob
 from forge.db.tables import GeneratedImage, Job
-from forge.schemas.generation import GenerateRequest, JobResponse, JobStatus
+from forge.schemas.generation import GenerateRequest, JobResponse, JobStatus, SamplerInfo
+from forge.storage.uploads import upload_path
 
 router = APIRouter(tags=["generation"])
 
@@ -19,6 +21,10 @@ async def create_generation(req: GenerateRequest, request: Request):
     """Submit a new generation job."""
     session_factory = request.app.state.session_factory
     job_queue = request.app.state.job_queue
+    uploads_dir = request.app.state.settings.paths.resolved_uploads
+    for upload_id in (req.source_image, req.mask_image):
+        if upload_id and upload_path(uploads_dir, upload_id) is None:
+            raise HTTPException(status_code=422, detail=f"Unknown upload: {upload_id}")
 
     # Create job in DB
     async with session_factory() as session:
@@ -65,7 +71,7 @@ async def create_generation(req: GenerateRequest, request: Request):
 @router.get("/jobs/{job_id}", response_model=JobResponse)
 async def get_job(job_id: str, request: Request):
     """Get the status and result of a job."""
-    session_factory = request.app.state.session_factory
+    session_factory = request.app.state.read_session_factory
 
     async with session_factory() as session:
         stmt = select(Job).where(Job.id == job_id)
@@ -121,3 +127,9 @@ async def cancel_job(job_id: str, request: Request):
     job_queue = request.app.state.job_queue
     job_queue.cancel(job_id)
     return {"status": "cancelled", "job_id": job_id}
+
+
+@router.get("/samplers", response_model=list[SamplerInfo])
+async def list_samplers():
+    """List the available samplers with their recommended steps and CFG scale."""
+    return [SamplerInfo(**sampler.to_dict()) for sampler in SAMPLERS.values()]
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Request
+import asyncio
+import uuid
 
-from forge.models.manager import ModelManager
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from forge.core.queue import KIND_LOAD_MODEL, KIND_UNLOAD_MODEL, QueuedJob
 from forge.schemas.models import ModelInfo, ModelListResponse
 
 router = APIRouter(tags=["models"])
@@ -13,8 +16,8 @@ router = APIRouter(tags=["models"])
 @router.get("/models", response_model=ModelListResponse)
 async def list_models(request: Request, type: str | None = None):
     """List all available models, optionally filtered by type."""
-    settings = request.app.state.settings
-    manager = ModelManager(settings.paths.resolved_models)
+    manager = request.app.state.model_manager
+    await manager.wait_ready()
 
     raw_models = manager.scan_type(type) if type else manager.scan_all()
     models = [ModelInfo(**m) for m in raw_models]
@@ -36,20 +39,45 @@ async def list_models(request: Request, type: str | None = None):
     return ModelListResponse(models=models, active_model=active_model)
 
 
+async def _run_model_op(
+    request: Request, response: Response, kind: str, model_id: str, wait: bool
+) -> dict:
+    """Queue a model operation for the GPU worker, optionally waiting for it."""
+    op = QueuedJob(
+        job_id=uuid.uuid4().hex[:12],
+        params={"model_id": model_id} if model_id else {},
+        kind=kind,
+        done=asyncio.get_running_loop().create_future(),
+    )
+    await request.app.state.job_queue.put(op)
+    if not wait:
+        response.status_code = 202
+        return {"status": "queued", "op_id": op.job_id, "model_id": model_id or None}
+
+    try:
+        elapsed = await op.done
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    status = "loaded" if kind == KIND_LOAD_MODEL else "unloaded"
+    return {
+        "status": status,
+        "op_id": op.job_id,
+        "model_id": model_id or None,
+        "elapsed_seconds": round(elapsed, 2),
+    }
+
+
 @router.post("/models/{model_id}/load")
-async def load_model(model_id: str, request: Request):
-    """Explicitly load a model into VRAM."""
-    worker = request.app.state.worker
-    await worker._ensure_backend()
-    if worker._backend:
-        await worker._backend.load_model(model_id)
-    return {"status": "loaded", "model_id": model_id}
+async def load_model(model_id: str, request: Request, response: Response, wait: bool = True):
+    """Load a model into VRAM.
+
+    The load runs on the GPU worker, after any jobs already queued. Pass
+    ``wait=false`` to return immediately and follow ``model:loading`` events.
+    """
+    return await _run_model_op(request, response, KIND_LOAD_MODEL, model_id, wait)
 
 
 @router.post("/models/unload")
-async def unload_model(request: Request):
-    """Unload the current model to free VRAM."""
-    worker = request.app.state.worker
-    if worker._backend:
-        await worker._backend.unload_model()
-    return {"status": "unloaded"}
+async def unload_model(request: Request, response: Response, wait: bool = True):
+    """Unload loaded models to free VRAM, queued behind pending jobs."""
+    return await _run_model_op(request, response, KIND_UNLOAD_MODEL, "", wait)
@@ -20,6 +20,7 @@ async def get_system_info(request: Request):
 
     gpu_info = GPUInfo()
     models_loaded = []
+    quantization = {}
 
     if worker._backend:
         try:
@@ -33,6 +34,7 @@ async def get_system_info(request: Request):
             )
             if backend_info.get("model_loaded"):
                 models_loaded.append(backend_info["model_loaded"])
+            quantization = backend_info.get("quantization", {})
         except Exception:
             pass
 
@@ -42,6 +44,7 @@ async def get_system_info(request: Request):
         gpu=gpu_info,
         models_loaded=models_loaded,
         queue_length=job_queue.size,
+        quantization=quantization,
         python_version=f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
     )
 
@@ -0,0 +1,37 @@
+"""Uploads API — source and mask images for img2img, inpaint and outpaint."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+
+from forge.storage.uploads import UploadError, save_upload, upload_path
+
+router = APIRouter(tags=["uploads"])
+
+
+@router.post("/uploads")
+async def create_upload(request: Request):
+    """Store an image sent as the raw request body; returns its upload id.
+
+    The body is streamed to disk, so clients should send the file as-is
+    (``Content-Type: image/png`` etc.), not as a multipart form.
+    """
+    settings = request.app.state.settings
+    try:
+        return await save_upload(
+            request.stream(),
+            settings.paths.resolved_uploads,
+            settings.server.max_upload_mb * 1024 * 1024,
+        )
+    except UploadError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+
+
+@router.get("/uploads/{upload_id}")
+async def get_upload(upload_id: str, request: Request):
+    """Serve an uploaded image."""
+    path = upload_path(request.app.state.settings.paths.resolved_uploads, upload_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return FileResponse(path)
@@ -4,17 +4,23 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from forge.config import Settings
 from forge.schemas.generation import GenerateRequest, GenerationMode
 
+if TYPE_CHECKING:
+    from forge.models.manager import ModelManager
+
 
 class BaseBackend(ABC):
     """Interface that every backend must implement."""
 
     name: str = "base"
 
+    # Shared model catalog, assigned by the worker before initialize()
+    model_manager: ModelManager | None = None
+
     @abstractmethod
     async def initialize(self, settings: Settings) -> None:
         """Initialize the backend (load libraries, check GPU, etc.)."""
@@ -13,16 +13,23 @@ import random
 from collections.abc import AsyncIterator
 from typing import Any
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFilter, ImageFont
 
 from forge.backends.base import BaseBackend
+from forge.backends.hires import first_pass_size, refine_steps
+from forge.backends.inpaint_crop import InpaintCrop, crop_sources, paste_crop, plan_crop
 from forge.backends.registry import register_backend
+from forge.backends.sources import SourceImages, edit_steps, edit_strength, prepare_sources
+from forge.backends.upscale import run_upscale
 from forge.config import Settings
-from forge.schemas.generation import GenerateRequest, GenerationMode
+from forge.schemas.generation import SOURCE_MODES, GenerateRequest, GenerationMode
 
 logger = logging.getLogger("forge.backends.demo")
 
 MAX_SEED = 2**32 - 1
+NATIVE_SIZE = 512  # first-pass size for hires jobs
+UPSCALER_SCALE = 4  # of the stand-in upscaler model
 
 
 def _prompt_to_seed(prompt: str, seed: int) -> int:
@@ -115,6 +122,25 @@ def _generate_image(params: GenerateRequest, seed: int) -> Image.Image:
     return img
 
 
+def _edit_image(
+    generated: Image.Image,
+    params: GenerateRequest,
+    sources: SourceImages,
+    crop: InpaintCrop | None,
+) -> Image.Image:
+    """Stand-in for img2img/inpaint: blend the source toward the drawing, inside the mask."""
+    edited = crop_sources(sources, crop) if crop else sources
+    img = Image.blend(edited.image, generated, edit_strength(params))
+    if edited.inpaint:
+        img = Image.composite(img, edited.image, edited.mask)
+    return paste_crop(sources, img, crop) if crop else img
+
+
+def _pixel_upscaler(tiles: np.ndarray) -> np.ndarray:
+    """Stand-in upscaler model: repeat each pixel."""
+    return tiles.repeat(UPSCALER_SCALE, axis=1).repeat(UPSCALER_SCALE, axis=2)
+
+
 @register_backend("demo")
 class DemoBackend(BaseBackend):
     """Generates procedural images using Pillow. No GPU or models needed."""
@@ -138,37 +164,88 @@ class DemoBackend(BaseBackend):
         self, params: GenerateRequest, job_id: str
     ) -> AsyncIterator[dict[str, Any]]:
         seed = params.seed if params.seed >= 0 else random.randint(0, MAX_SEED)
-        total_steps = params.steps
+        loop = asyncio.get_event_loop()
+        if params.mode == GenerationMode.UPSCALE:
+            # Any upscaler id selects the stand-in model, through the real tiling
+            upscaler = _pixel_upscaler if params.upscale.upscaler else None
+            img = await loop.run_in_executor(
+                None,
+                run_upscale,
+                params,
+                self._settings.paths.resolved_uploads,
+                upscaler,
+                UPSCALER_SCALE,
+            )
+            images_info = await self._save([img], params, job_id, seed)
+            yield {"type": "result", "images": images_info, "stats": {}}
+            return
+
+        sources, crop = None, None
+        if params.mode in SOURCE_MODES:
+            sources = await loop.run_in_executor(
+                None, prepare_sources, params, self._settings.paths.resolved_uploads
+            )
+            if params.mode == GenerationMode.INPAINT and params.inpaint_area == "masked":
+                crop = plan_crop(sources.mask, NATIVE_SIZE, params.mask_padding)
+        # Hires jobs draw at the native size and "refine" by resampling
+        size = crop.size if crop else (params.width, params.height)
+        hires = params.hires if sources is None else None
+        if hires is not None:
+            size = first_pass_size(params.width, params.height, NATIVE_SIZE)
+        passes = [edit_steps(params) if sources is not None else params.steps]
+        if hires is not None and size != (params.width, params.height):
+            passes.append(refine_steps(hires, params.steps))
+        total_steps = sum(passes)
 
         # Simulate step-by-step progress
-        for step in range(1, total_steps + 1):
-            # Simulate ~50ms per step for realistic timing
-            await asyncio.sleep(0.05)
-
-            percentage = round(step / total_steps * 100, 1)
-            yield {
-                "type": "progress",
-                "step": step,
-                "total_steps": total_steps,
-                "percentage": percentage,
-            }
+        step = 0
+        for pass_index, pass_steps in enumerate(passes, start=1):
+            for _ in range(pass_steps):
+                # Simulate ~50ms per step for realistic timing
+                await asyncio.sleep(0.05)
+                step += 1
+
+                percentage = round(step / total_steps * 100, 1)
+                yield {
+                    "type": "progress",
+                    "step": step,
+                    "total_steps": total_steps,
+                    "percentage": percentage,
+                    "pass_index": pass_index,
+                    "total_passes": len(passes),
+                }
 
         # Generate the image
-        loop = asyncio.get_event_loop()
-        img = await loop.run_in_executor(None, _generate_image, params, seed)
+        first = params.model_copy(update={"width": size[0], "height": size[1]})
+        img = await loop.run_in_executor(None, _generate_image, first, seed)
+        if sources is not None:
+            img = await loop.run_in_executor(None, _edit_image, img, params, sources, crop)
+        elif img.size != (params.width, params.height):
+            img = img.resize((params.width, params.height), Image.Resampling.LANCZOS)
+
+        images_info = await self._save([img], params, job_id, seed)
+        yield {
+            "type": "result",
+            "images": images_info,
+            "stats": {"inpaint_crop": crop.to_dict()} if crop else {},
+        }
 
+    async def _save(
+        self, images: list[Image.Image], params: GenerateRequest, job_id: str, seed: int
+    ) -> list[dict[str, Any]]:
         # Save via storage module
         from forge.storage.images import save_generation_images
 
-        images_info = await save_generation_images(
-            images=[img],
+        return await save_generation_images(
+            images=images,
             job_id=job_id,
             seed=seed,
             outputs_dir=self._settings.paths.resolved_outputs,
+            similarity_index=self._settings.gallery.similarity_index,
+            embeddings=self._settings.gallery.embeddings,
+            params=params.model_dump(mode="json"),
         )
 
-        yield {"type": "result", "images": images_info}
-
     async def load_model(self, model_id: str) -> None:
         logger.info("Demo backend: load_model('%s') is a no-op", model_id)
 
@@ -187,7 +264,7 @@ class DemoBackend(BaseBackend):
         ]
 
     def get_supported_modes(self) -> list[GenerationMode]:
-        return [GenerationMode.TXT2IMG]
+        return [GenerationMode.TXT2IMG, *SOURCE_MODES, GenerationMode.UPSCALE]
 
     async def get_system_info(self) -> dict[str, Any]:
         return {
@@ -2,30 +2,93 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import copy
+import functools
 import gc
+import hashlib
 import logging
+import os
 import random
-from collections.abc import AsyncIterator
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from dataclasses import replace
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+from PIL import Image
+
 from forge.backends.base import BaseBackend
+from forge.backends.diffusers_backend.compile_cache import (
+    UNET,
+    VAE_DECODER,
+    CompileArtifactCache,
+    CompileState,
+    CompileTarget,
+    artifact_key,
+    warmup_buckets,
+)
+from forge.backends.diffusers_backend.components import ComponentRegistry
+from forge.backends.diffusers_backend.conversion_cache import ConversionCache, conversion_key
+from forge.backends.diffusers_backend.cpu_profile import (
+    CPUProfile,
+    available_memory,
+    resolve_cpu_profile,
+)
+from forge.backends.diffusers_backend.feature_cache import FeatureCache
+from forge.backends.diffusers_backend.latent_cache import LatentCache, image_digest, latent_key
+from forge.backends.diffusers_backend.lora import LoraAdapterCache, LoraPlan
+from forge.backends.diffusers_backend.memory_planner import MemoryPlan, ModelMemory, plan_job
+from forge.backends.diffusers_backend.pipeline_cache import CPU, DEVICE, PipelineCache
+from forge.backends.diffusers_backend.quantization import (
+    DENOISER_COMPONENTS,
+    INT4,
+    INT8_DYNAMIC,
+    NONE,
+    QuantizationReport,
+    quantization_targets,
+)
+from forge.backends.hires import LATENT, first_pass_size, refine_schedule, refine_steps
+from forge.backends.inpaint_crop import crop_sources, paste_crop, plan_crop
 from forge.backends.registry import register_backend
+from forge.backends.samplers import resolve_sampler
+from forge.backends.sources import SourceImages, edit_steps, edit_strength, prepare_sources
+from forge.backends.upscale import run_upscale
 from forge.config import Settings
-from forge.schemas.generation import GenerateRequest, GenerationMode
+from forge.models.gguf_header import inspect_gguf
+from forge.models.safetensors_header import (
+    LORA,
+    SD2,
+    SD15,
+    SDXL,
+    SDXL_REFINER,
+    UNKNOWN,
+    VAE,
+    inspect_safetensors,
+)
+from forge.schemas.generation import SOURCE_MODES, GenerateRequest, GenerationMode, LoraSpec
 
 logger = logging.getLogger("forge.backends.diffusers")
 
 try:
+    import diffusers
     import torch
     from diffusers import (
+        AutoencoderKL,
+        AutoPipelineForImage2Image,
+        AutoPipelineForInpainting,
         AutoPipelineForText2Image,
-        DPMSolverMultistepScheduler,
-        EulerAncestralDiscreteScheduler,
-        EulerDiscreteScheduler,
+        DiffusionPipeline,
         StableDiffusionPipeline,
+        StableDiffusionXLImg2ImgPipeline,
         StableDiffusionXLPipeline,
+        UNet2DConditionModel,
     )
+    from diffusers.models.attention_processor import AttnProcessor2_0
 
     HAS_DIFFUSERS = True
 except ImportError:
@@ -34,14 +97,114 @@ except ImportError:
 if not HAS_DIFFUSERS:
     raise ImportError("diffusers not installed")
 
-SCHEDULER_MAP = {
-    "euler_a": "EulerAncestralDiscreteScheduler",
-    "euler": "EulerDiscreteScheduler",
-    "dpm++_2m": "DPMSolverMultistepScheduler",
-    "dpm++_2m_karras": "DPMSolverMultistepScheduler",
+# Pipeline class for each architecture the safetensors header can identify
+ARCHITECTURE_PIPELINES = {
+    SD15: StableDiffusionPipeline,
+    SD2: StableDiffusionPipeline,
+    SDXL: StableDiffusionXLPipeline,
+    SDXL_REFINER: StableDiffusionXLImg2ImgPipeline,
+}
+
+# Base pipelines supplying text encoders, VAE and configs for GGUF denoisers
+GGUF_BASE_PIPELINES = {
+    SD15: "stable-diffusion-v1-5/stable-diffusion-v1-5",
+    SD2: "stabilityai/stable-diffusion-2-1",
+    SDXL: "stabilityai/stable-diffusion-xl-base-1.0",
+    SDXL_REFINER: "stabilityai/stable-diffusion-xl-refiner-1.0",
+}
+
+# Pipelines derived per mode from the resident one, sharing its components
+DERIVED_PIPELINES = {
+    GenerationMode.IMG2IMG: AutoPipelineForImage2Image,
+    GenerationMode.INPAINT: AutoPipelineForInpainting,
 }
 
 MAX_SEED = 2**32 - 1
+MAX_VAE_OVERRIDES = 2  # standalone VAEs kept loaded for quick swaps
+
+
+def _module_tensors(module: torch.nn.Module) -> list[tuple[str, torch.Tensor]]:
+    return list(module.state_dict(keep_vars=False).items())
+
+
+def _pipeline_bytes(pipe: Any, skip: list[str] | None = None) -> int:
+    """Bytes held by a pipeline's weights and buffers, across all components.
+
+    Components named in ``skip`` (shared with another resident pipeline)
+    aren't counted, so deduplicated pipelines cost only what they add.
+    """
+    return sum(
+        _module_bytes(component)
+        for name, component in pipe.components.items()
+        if isinstance(component, torch.nn.Module) and name not in (skip or ())
+    )
+
+
+def _module_bytes(module: torch.nn.Module) -> int:
+    """Bytes held by a module's state, quantized weights included.
+
+    Dynamically quantized layers keep their packed weights outside
+    ``parameters()``, so this walks the state dict instead.
+    """
+    return sum(_storage_bytes(value) for value in module.state_dict().values())
+
+
+def _storage_bytes(value: Any) -> int:
+    if isinstance(value, (tuple, list)):
+        return sum(_storage_bytes(v) for v in value)
+    if not isinstance(value, torch.Tensor):
+        return 0
+    if hasattr(value, "__tensor_flatten__"):
+        # Quantized tensor subclasses (quanto) wrap packed data and scales
+        inner, _ = value.__tensor_flatten__()
+        return sum(_storage_bytes(getattr(value, name)) for name in inner)
+    return value.numel() * value.element_size()
+
+
+def _quantize_module(module: torch.nn.Module, mode: str) -> torch.nn.Module:
+    """Quantize ``module`` in place."""
+    if mode == INT8_DYNAMIC:
+        return torch.ao.quantization.quantize_dynamic(
+            module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+    try:
+        import optimum.quanto as quanto
+    except ImportError as exc:
+        raise RuntimeError(
+            f"gpu.quantization={mode} needs optimum-quanto: pip install optimum-quanto"
+        ) from exc
+    quanto.quantize(module, weights=quanto.qint4 if mode == INT4 else quanto.qint8)
+    quanto.freeze(module)
+    return module
+
+
+def _module_signature(module: torch.nn.Module) -> str:
+    """Cheap identity hint: tensor layout plus a sample of the first and last tensors."""
+    digest = hashlib.blake2b(digest_size=16)
+    tensors = _module_tensors(module)
+    for name, tensor in tensors:
+        digest.update(f"{name}:{tuple(tensor.shape)}:{tensor.dtype};".encode())
+    for _, tensor in (tensors[:1] + tensors[-1:]) if tensors else ():
+        digest.update(_tensor_bytes(tensor.reshape(-1)[:256]))
+    return digest.hexdigest()
+
+
+def _module_fingerprint(module: torch.nn.Module) -> str:
+    """Hash of every tensor's name, dtype, shape and contents."""
+    digest = hashlib.blake2b(digest_size=32)
+    for name, tensor in _module_tensors(module):
+        digest.update(f"{name}:{tuple(tensor.shape)}:{tensor.dtype};".encode())
+        digest.update(_tensor_bytes(tensor))
+    return digest.hexdigest()
+
+
+def _tensor_bytes(tensor: torch.Tensor) -> memoryview:
+    flat = tensor.detach().reshape(-1).contiguous().cpu()
+    return memoryview(flat.view(torch.uint8).numpy())
+
+
+class GenerationStoppedError(Exception):
+    """Raised from a progress callback to end a job whose updates are no longer read."""
 
 
 @register_backend("diffusers")
@@ -57,23 +220,95 @@ class DiffusersBackend(BaseBackend):
         self._device: str = "cpu"
         self._dtype = None
         self._models_dir: Path | None = None
+        self._cache: PipelineCache | None = None
+        self._conversions: ConversionCache | None = None
+        self._components = ComponentRegistry(_module_signature, _module_fingerprint)
+        # Each cached pipeline's own VAE, restored when no override is requested
+        self._default_vaes: dict[str, Any] = {}
+        self._vae_overrides: OrderedDict[str, Any] = OrderedDict()
+        # LoRA adapters loaded into each cached pipeline
+        self._loras: dict[str, LoraAdapterCache] = {}
+        self._lora_prefix = 0
+        # Measured memory and speed of each cached pipeline
+        self._quantization: dict[str, QuantizationReport] = {}
+        # torch.compile warm-up state per cached pipeline (gpu.compile)
+        self._compile_artifacts: CompileArtifactCache | None = None
+        self._compiled: dict[str, CompileState] = {}
+        self._background: set[asyncio.Task] = set()
+        # Held by jobs, loads and unloads, which all mutate the resident
+        # modules (LoRA layers, attention processors, offload hooks, wrapped
+        # forwards); compile warm-up takes it for each bucket so it never
+        # traces a module mid-change or competes with a job for memory
+        self._modules_lock = threading.Lock()
+        self._jobs_run = 0
+        self._cpu_profile: CPUProfile | None = None
+        # Each cached pipeline's own scheduler config, and the scheduler
+        # built for each (model, sampler) pair used with it
+        self._scheduler_configs: dict[str, Any] = {}
+        self._schedulers: dict[tuple[str, str], Any] = {}
+        # What the memory planner needs to know about each cached pipeline
+        self._memory_profiles: dict[str, ModelMemory] = {}
+        # Mode-specific pipelines built on each cached pipeline's components
+        self._derived: dict[tuple[str, GenerationMode], Any] = {}
+        self._latents: LatentCache | None = None
+        # The last upscaler model used, as (id, spandrel descriptor)
+        self._upscaler: tuple[str, Any] | None = None
 
     async def initialize(self, settings: Settings) -> None:
         self._settings = settings
         self._device = settings.gpu.device
         self._models_dir = settings.paths.resolved_models / "checkpoints"
+        self._conversions = ConversionCache(
+            settings.paths.resolved_cache / "conversions",
+            settings.models.conversion_cache_max_mb * 1024 * 1024,
+        )
 
+        mb = 1024 * 1024
+        self._latents = LatentCache(
+            settings.gpu.latent_cache_ram_mb * mb,
+            settings.paths.resolved_cache / "latents",
+            settings.gpu.latent_cache_disk_mb * mb,
+            size_of=lambda t: t.numel() * t.element_size(),
+            save=torch.save,
+            load=lambda path: torch.load(path, weights_only=True),
+        )
         if torch.cuda.is_available() and "cuda" in self._device:
             self._dtype = torch.float16 if settings.gpu.half_precision else torch.float32
+            total_vram = torch.cuda.get_device_properties(0).total_memory
             logger.info(
                 "CUDA available: %s, VRAM: %dMB",
                 torch.cuda.get_device_name(0),
-                torch.cuda.get_device_properties(0).total_mem // (1024 * 1024),
+                total_vram // mb,
             )
+            device_budget = settings.gpu.model_cache_vram_mb * mb or int(total_vram * 0.8)
+            cpu_budget = settings.gpu.model_cache_ram_mb * mb
         else:
             self._device = "cpu"
+            # Weights stay fp32; bf16 is applied per op by autocast where it pays off
             self._dtype = torch.float32
-            logger.info("Running on CPU")
+            self._cpu_profile = resolve_cpu_profile(settings.cpu)
+            self._apply_cpu_profile()
+            logger.info("Running on CPU: %s", self._cpu_profile.to_dict())
+            # The device is RAM, so there is no second tier to demote into
+            device_budget, cpu_budget = settings.gpu.model_cache_ram_mb * mb, 0
+
+        if settings.gpu.cpu_offload:
+            # Offload hooks manage placement themselves; keep one pipeline only
+            device_budget = cpu_budget = 0
+        if settings.gpu.compile:
+            if settings.gpu.cpu_offload:
+                # Offload hooks are installed on the eager modules
+                logger.warning("gpu.compile has no effect with cpu_offload enabled")
+            else:
+                self._init_compile_cache()
+
+        self._cache = PipelineCache(
+            device_budget,
+            cpu_budget,
+            to_device=lambda pipe: pipe.to(self._device),
+            to_cpu=self._demote_pipeline,
+            on_evict=self._on_pipeline_evicted,
+        )
 
     async def shutdown(self) -> None:
         await self.unload_model()
@@ -84,80 +319,375 @@ class DiffusersBackend(BaseBackend):
             "status": "healthy" if gpu_ok else "degraded",
             "device": self._device,
             "model_loaded": self._current_model or None,
+            "cached_models": self._cache.stats() if self._cache else [],
             "cuda_available": torch.cuda.is_available(),
         }
 
     async def generate(
         self, params: GenerateRequest, job_id: str
     ) -> AsyncIterator[dict[str, Any]]:
-        if not self._pipe:
-            if not params.model_id:
-                models = self.list_available_models()
-                if not models:
-                    raise RuntimeError(
-                        "No models found. Place .safetensors files in "
-                        f"{self._models_dir}"
-                    )
-                params.model_id = models[0]["id"]
-            await self.load_model(params.model_id)
+        async with self._exclusive():
+            if params.mode == GenerationMode.UPSCALE:
+                generation = self._upscale(params, job_id)
+            else:
+                generation = self._generate(params, job_id)
+            try:
+                # Closed before the lock is released, so its pipeline thread has ended
+                async with contextlib.aclosing(generation):
+                    async for update in generation:
+                        yield update
+            finally:
+                self._jobs_run += 1
+
+    @contextlib.asynccontextmanager
+    async def _exclusive(self) -> AsyncIterator[None]:
+        """Hold ``_modules_lock``, waiting off the event loop for a warm-up bucket to end."""
+        acquire = asyncio.ensure_future(asyncio.to_thread(self._modules_lock.acquire))
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            # The thread still gets the lock eventually; hand it straight back
+            acquire.add_done_callback(lambda _: self._modules_lock.release())
+            raise
+        try:
+            yield
+        finally:
+            self._modules_lock.release()
+
+    async def _generate(
+        self, params: GenerateRequest, job_id: str
+    ) -> AsyncIterator[dict[str, Any]]:
+        if not params.model_id and not self._pipe:
+            models = self.list_available_models()
+            if not models:
+                raise RuntimeError(
+                    "No models found. Place .safetensors files in "
+                    f"{self._models_dir}"
+                )
+            params.model_id = models[0]["id"]
+        if params.model_id:
+            await self._load_model(params.model_id)
 
         seed = params.seed if params.seed >= 0 else random.randint(0, MAX_SEED)
-        generator = torch.Generator(device=self._device).manual_seed(seed)
+        # One generator per image, so image i reproduces alone with seed + i
+        # however the batch is split
+        generators = [
+            torch.Generator(device=self._device).manual_seed(seed + i)
+            for i in range(params.batch_size)
+        ]
 
         # Set scheduler
         self._set_scheduler(params.sampler)
+        self._apply_vae(params.vae)
+        await asyncio.to_thread(self._apply_loras, params.loras)
+        sources = None
+        if params.mode in SOURCE_MODES:
+            sources = await asyncio.to_thread(
+                prepare_sources, params, self._settings.paths.resolved_uploads
+            )
+        # Masks are inpainted in a crop around them, small ones at native size.
+        # The cropped sources are crop.size, which _edit passes on as the
+        # pipeline's width/height so the crop keeps its aspect ratio.
+        full_sources, crop = sources, None
+        if (
+            sources is not None
+            and params.mode == GenerationMode.INPAINT
+            and params.inpaint_area == "masked"
+        ):
+            crop = plan_crop(sources.mask, self._native_size(), params.mask_padding)
+            if crop is not None:
+                sources = await asyncio.to_thread(crop_sources, sources, crop)
+        target = crop.size if crop else (params.width, params.height)
+        # Hires jobs run the first pass at about the model's native size
+        size = target
+        if params.hires is not None and sources is None:
+            size = first_pass_size(*target, self._native_size())
+        hires = params.hires if size != target else None
+        refine = refine_steps(hires, params.steps) if hires else 0
+        steps = edit_steps(params) if sources is not None else params.steps
+        plan = self._plan_memory(params, target)
+        vae_id = self._vae_identity(params)
+        # Latents of the images this job outputs, for later img2img on them;
+        # inpainted images only exist as pixels once pasted together
+        keep_latents = self._latents.enabled and (sources is None or not sources.inpaint)
+        final_latents: list[Any] = []
+        source_latents: str | None = None
+        compile_state = self._compiled.get(self._current_model)
+        compiled = self._use_compiled(params, plan, size)
+        feature_cache = None
+        # Opt-in; only UNet denoisers have the down/mid/up blocks it skips
+        unet = getattr(self._pipe, "unet", None)
+        if params.feature_cache is not None and hasattr(unet, "down_blocks"):
+            feature_cache = FeatureCache(params.feature_cache.interval, params.feature_cache.guard)
 
-        step_count = 0
+        # Progress is reported from the executor thread through a queue
+        loop = asyncio.get_running_loop()
+        updates: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        total_steps = len(plan.batches) * (steps + refine)
+        done = 0
 
-        def callback(pipe, step, timestep, callback_kwargs):
-            nonlocal step_count
-            step_count = step + 1
-            return callback_kwargs
+        last: dict[str, Any] = {}
+        stop = threading.Event()
 
-        # Run generation
-        import asyncio
+        def progress(pass_index: int) -> Callable[..., dict[str, Any]]:
+            def callback(pipe, step, timestep, callback_kwargs):
+                nonlocal done
+                if stop.is_set():
+                    raise GenerationStoppedError
+                done += 1
+                last["latents"] = callback_kwargs.get("latents")
+                update = {
+                    "type": "progress",
+                    "step": done,
+                    "total_steps": total_steps,
+                    "percentage": round(done / total_steps * 100, 1),
+                    "pass_index": pass_index,
+                    "total_passes": 2 if hires else 1,
+                }
+                loop.call_soon_threadsafe(updates.put_nowait, update)
+                return callback_kwargs
 
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            lambda: self._pipe(
-                prompt=params.prompt,
-                negative_prompt=params.negative_prompt or None,
-                width=params.width,
-                height=params.height,
-                num_inference_steps=params.steps,
-                guidance_scale=params.cfg_scale,
-                generator=generator,
-                num_images_per_prompt=params.batch_size,
-                callback_on_step_end=callback,
-            ),
-        )
+            return callback
+
+        def run() -> list[Any]:
+            nonlocal source_latents
+            images: list[Any] = []
+            restore = self._apply_memory_plan(plan)
+            detach = feature_cache.attach(self._pipe.unet) if feature_cache else None
+            try:
+                # Autocast state is per thread, so it's entered on the executor thread
+                with self._autocast():
+                    encoded = None
+                    if sources is not None and not sources.inpaint:
+                        encoded, hit = self._source_latents(sources.image, vae_id)
+                        source_latents = "cached" if hit else "encoded"
+                    for batch_size in plan.batches:
+                        batch = generators[len(images) : len(images) + batch_size]
+                        if compile_state is not None:
+                            compile_state.use((*size, batch_size), set(compiled))
+                        if feature_cache is not None:
+                            feature_cache.start(steps)
+                        if sources is not None:
+                            result = self._edit(params, sources, batch, progress(1), encoded)
+                        else:
+                            result = self._pipe(
+                                prompt=params.prompt,
+                                negative_prompt=params.negative_prompt or None,
+                                width=size[0],
+                                height=size[1],
+                                num_inference_steps=params.steps,
+                                guidance_scale=params.cfg_scale,
+                                generator=batch,
+                                num_images_per_prompt=batch_size,
+                                output_type=LATENT if hires and hires.upscaler == LATENT else "pil",
+                                callback_on_step_end=progress(1),
+                            )
+                        if hires:
+                            # The target size isn't a warmed-up bucket
+                            if compile_state is not None:
+                                compile_state.restore()
+                            if feature_cache is not None:
+                                feature_cache.start(refine)
+                            result = self._refine(params, result.images, batch, progress(2))
+                        images.extend(result.images)
+                        if keep_latents and last.get("latents") is not None:
+                            final_latents.extend(last.pop("latents").cpu())
+            finally:
+                if detach is not None:
+                    detach()
+                restore()
+                if compile_state is not None:
+                    compile_state.restore()
+            return images
+
+        # Run generation
+        started = time.perf_counter()
+        future = loop.run_in_executor(None, run)
+        try:
+            async for update in self._drain(future, updates):
+                yield update
+        finally:
+            await self._stop(future, stop)
+        images = await future
+        if crop is not None:
+            images = await asyncio.to_thread(
+                lambda: [paste_crop(full_sources, image, crop) for image in images]
+            )
+        report = self._quantization.get(self._current_model)
+        if report is not None:
+            report.record((steps + refine) * params.batch_size, time.perf_counter() - started)
+        if len(final_latents) == len(images):
+            await asyncio.to_thread(self._keep_latents, images, final_latents, vae_id)
 
         # Save images
         from forge.storage.images import save_generation_images
 
         images_info = await save_generation_images(
-            images=result.images,
+            images=images,
             job_id=job_id,
             seed=seed,
             outputs_dir=self._settings.paths.resolved_outputs,
+            similarity_index=self._settings.gallery.similarity_index,
+            embeddings=self._settings.gallery.embeddings,
+            params=params.model_dump(mode="json"),
+        )
+
+        yield {
+            "type": "result",
+            "images": images_info,
+            "stats": {
+                "compiled": bool(compiled),
+                "compiled_modules": compiled,
+                "memory_plan": plan.to_dict(),
+                **({"inpaint_crop": crop.to_dict()} if crop else {}),
+                **({"source_latents": source_latents} if source_latents else {}),
+                **({"feature_cache": feature_cache.to_dict()} if feature_cache else {}),
+            },
+        }
+
+    async def _upscale(
+        self, params: GenerateRequest, job_id: str
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Upscale mode: an upscaler model run tile by tile, no diffusion pipeline."""
+        upscaler, scale = None, 1
+        if params.upscale.upscaler:
+            descriptor = await asyncio.to_thread(self._load_upscaler, params.upscale.upscaler)
+            upscaler, scale = functools.partial(self._run_upscaler, descriptor), descriptor.scale
+        workers = 1 if "cuda" in self._device else max(1, self._settings.cpu.upscale_workers)
+
+        loop = asyncio.get_running_loop()
+        updates: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        stop = threading.Event()
+
+        def progress(done: int, total: int) -> None:
+            if stop.is_set():
+                raise GenerationStoppedError
+            update = {
+                "type": "progress",
+                "step": done,
+                "total_steps": total,
+                "percentage": round(done / total * 100, 1),
+            }
+            loop.call_soon_threadsafe(updates.put_nowait, update)
+
+        started = time.perf_counter()
+        future = loop.run_in_executor(
+            None,
+            run_upscale,
+            params,
+            self._settings.paths.resolved_uploads,
+            upscaler,
+            scale,
+            workers,
+            progress,
         )
+        try:
+            async for update in self._drain(future, updates):
+                yield update
+        finally:
+            await self._stop(future, stop)
+        image = await future
+        elapsed = time.perf_counter() - started
+
+        from forge.storage.images import save_generation_images
 
-        # Yield progress at 100%
+        images_info = await save_generation_images(
+            images=[image],
+            job_id=job_id,
+            seed=max(params.seed, 0),
+            outputs_dir=self._settings.paths.resolved_outputs,
+            similarity_index=self._settings.gallery.similarity_index,
+            embeddings=self._settings.gallery.embeddings,
+            params=params.model_dump(mode="json"),
+        )
         yield {
-            "type": "progress",
-            "step": params.steps,
-            "total_steps": params.steps,
-            "percentage": 100.0,
+            "type": "result",
+            "images": images_info,
+            "stats": {
+                "upscaler": params.upscale.upscaler or "lanczos",
+                "model_scale": scale,
+                "workers": workers,
+                "seconds": round(elapsed, 3),
+            },
         }
 
-        yield {"type": "result", "images": images_info}
+    @staticmethod
+    async def _drain(
+        future: asyncio.Future, updates: asyncio.Queue
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield progress updates from an executor job until it's done and all are out."""
+        while not future.done() or not updates.empty():
+            getter = asyncio.ensure_future(updates.get())
+            await asyncio.wait({future, getter}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                yield getter.result()
+            else:
+                getter.cancel()
+
+    @staticmethod
+    async def _stop(future: asyncio.Future, stop: threading.Event) -> None:
+        """End an executor job whose updates are no longer read, and wait for its thread.
+
+        The job raises ``GenerationStoppedError`` from its next progress callback.
+        """
+        if future.done():
+            return
+        stop.set()
+        await asyncio.wait({future})
+        if not future.cancelled():
+            future.exception()  # retrieved, so it isn't logged as unhandled
+
+    def _load_upscaler(self, upscaler_id: str) -> Any:
+        if self._upscaler is not None and self._upscaler[0] == upscaler_id:
+            return self._upscaler[1]
+        try:
+            from spandrel import ModelLoader
+        except ImportError as exc:
+            raise RuntimeError("Upscaler models need spandrel: pip install spandrel") from exc
+        path = self.model_manager.resolve(upscaler_id, "upscaler") if self.model_manager else None
+        if path is None:
+            path = self._settings.paths.resolved_models / "upscalers" / upscaler_id
+        if not path.exists():
+            raise ValueError(f"Unknown upscaler: {upscaler_id}")
+        # Drop the previous model before loading the next
+        self._upscaler = None
+        descriptor = ModelLoader().load_from_file(path).to(self._device).eval()
+        half = "cuda" in self._device and self._settings.gpu.half_precision
+        if half and descriptor.supports_half:
+            descriptor.half()
+        self._upscaler = (upscaler_id, descriptor)
+        return descriptor
+
+    def _run_upscaler(self, descriptor: Any, tiles: np.ndarray) -> np.ndarray:
+        """Upscale a batch of NHWC float tiles with a spandrel model."""
+        batch = torch.from_numpy(tiles).permute(0, 3, 1, 2).to(self._device, descriptor.dtype)
+        with torch.inference_mode():
+            output = descriptor(batch)
+        return output.clamp(0, 1).permute(0, 2, 3, 1).float().cpu().numpy()
 
     async def load_model(self, model_id: str) -> None:
+        async with self._exclusive():
+            await self._load_model(model_id)
+
+    async def _load_model(self, model_id: str) -> None:
         if model_id == self._current_model and self._pipe is not None:
             return
+        # Disk reads, conversion and device transfer all block; keep them off the loop
+        await asyncio.to_thread(self._load_model_sync, model_id)
+        if self._compile_artifacts is not None and model_id not in self._compiled:
+            self._start_warm_up(model_id)
+
+    def _load_model_sync(self, model_id: str) -> None:
+        # Drop our reference so an eviction below can actually free memory
+        self._pipe = None
+        self._current_model = ""
+        cached = self._cache.get(model_id)
+        if cached is not None:
+            self._pipe = cached
+            self._current_model = model_id
+            logger.info("Model loaded from cache: %s", model_id)
+            return
 
-        await self.unload_model()
         logger.info("Loading model: %s", model_id)
 
         model_path = self._resolve_model_path(model_id)
@@ -167,53 +697,789 @@ class DiffusersBackend(BaseBackend):
             "use_safetensors": True,
         }
 
-        if model_path.suffix in (".safetensors", ".ckpt"):
-            # Try SDXL first, fall back to SD 1.5
-            try:
-                self._pipe = StableDiffusionXLPipeline.from_single_file(
-                    str(model_path), **pipe_kwargs
-                )
-            except Exception:
-                self._pipe = StableDiffusionPipeline.from_single_file(
+        prequantized: list[str] = []
+        with self._pause_hashing():
+            if model_path.suffix == ".gguf":
+                self._pipe = self._load_gguf(model_id, model_path)
+                prequantized = list(DENOISER_COMPONENTS)
+            elif model_path.suffix in (".safetensors", ".ckpt"):
+                architecture = self._detect_architecture(model_id, model_path)
+                if architecture in (LORA, VAE):
+                    raise ValueError(f"{model_id} is a {architecture}, not a checkpoint")
+                cache_key = self._conversion_key(model_id)
+                converted = self._conversions.lookup(cache_key) if cache_key else None
+                if converted is not None:
+                    # Fast path: pre-laid-out, memory-mapped diffusers weights
+                    logger.info("Using converted pipeline cache for %s", model_id)
+                    self._pipe = DiffusionPipeline.from_pretrained(
+                        str(converted), torch_dtype=self._dtype
+                    )
+                else:
+                    self._pipe = self._load_single_file(model_path, architecture, pipe_kwargs)
+                    if cache_key:
+                        self._conversions.store(
+                            cache_key,
+                            lambda d: self._pipe.save_pretrained(
+                                d, safe_serialization=True, max_shard_size="2GB"
+                            ),
+                            source=model_path.name,
+                        )
+            else:
+                # HuggingFace model ID or directory
+                self._pipe = AutoPipelineForText2Image.from_pretrained(
                     str(model_path), **pipe_kwargs
                 )
-        else:
-            # HuggingFace model ID or directory
-            self._pipe = AutoPipelineForText2Image.from_pretrained(
-                str(model_path), **pipe_kwargs
-            )
 
-        self._pipe = self._pipe.to(self._device)
+        # Reuse identical text encoders / VAE from other resident pipelines
+        shared = self._components.dedupe(self._pipe)
+        self._default_vaes[model_id] = getattr(self._pipe, "vae", None)
+        self._scheduler_configs[model_id] = self._pipe.scheduler.config
+        self._quantization[model_id] = self._quantize_pipeline(self._pipe, shared, prequantized)
 
-        # VRAM optimizations
-        if self._settings.gpu.cpu_offload:
-            self._pipe.enable_model_cpu_offload()
+        if self._cpu_profile is not None:
+            self._optimize_for_cpu(self._pipe)
 
-        if self._settings.gpu.attention_slicing:
+        # VRAM optimizations
+        if self._settings.gpu.attention_slicing and not (
+            self._cpu_profile is not None and self._cpu_profile.sdpa
+        ):
             self._pipe.enable_attention_slicing()
 
         if self._settings.gpu.vae_tiling:
             self._pipe.enable_vae_tiling()
 
+        # Moves the pipeline to the device, demoting older ones to make room
+        self._pipe = self._cache.put(model_id, self._pipe, _pipeline_bytes(self._pipe, shared))
+        self._memory_profiles[model_id] = self._model_memory(self._pipe)
+
+        if self._settings.gpu.cpu_offload:
+            self._pipe.enable_model_cpu_offload()
+
         self._current_model = model_id
         logger.info("Model loaded: %s", model_id)
 
     async def unload_model(self) -> None:
-        if self._pipe is not None:
-            del self._pipe
+        """Unload every resident pipeline, freeing VRAM and RAM."""
+        async with self._exclusive():
+            self._unload_all()
+
+    def _unload_all(self) -> None:
+        if self._pipe is not None or (self._cache and self._cache.stats()):
             self._pipe = None
             self._current_model = ""
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-            gc.collect()
+            if self._cache:
+                self._cache.clear()
+            self._reclaim_memory()
             logger.info("Model unloaded")
 
+    def _demote_pipeline(self, pipe: Any) -> Any:
+        """Move a pipeline to CPU RAM, leaving components shared with device-resident ones."""
+        # self._pipe is the pipeline being loaded, about to take the device
+        keep = [*self._cache.pipelines(DEVICE), *([self._pipe] if self._pipe else [])]
+        in_use = {id(component) for other in keep for component in other.components.values()}
+        for component in pipe.components.values():
+            if isinstance(component, torch.nn.Module) and id(component) not in in_use:
+                component.to("cpu")
+        return pipe
+
+    def _on_pipeline_evicted(self, model_id: str) -> None:
+        self._default_vaes.pop(model_id, None)
+        self._loras.pop(model_id, None)
+        self._quantization.pop(model_id, None)
+        self._scheduler_configs.pop(model_id, None)
+        self._memory_profiles.pop(model_id, None)
+        for key in [key for key in self._schedulers if key[0] == model_id]:
+            del self._schedulers[key]
+        for key in [key for key in self._derived if key[0] == model_id]:
+            del self._derived[key]
+        state = self._compiled.pop(model_id, None)
+        if state is not None:
+            state.cancelled.set()
+        self._reclaim_memory()
+
+    def _apply_cpu_profile(self) -> None:
+        """Set thread counts and core pinning for CPU inference."""
+        profile = self._cpu_profile
+        if profile.affinity:
+            # Threads inherit the mask they're created with; re-pin the ones already running
+            for tid in os.listdir("/proc/self/task"):
+                with contextlib.suppress(OSError):
+                    os.sched_setaffinity(int(tid), profile.affinity)
+        torch.set_num_threads(profile.intra_op_threads)
+        if profile.inter_op_threads:
+            try:
+                torch.set_num_interop_threads(profile.inter_op_threads)
+            except RuntimeError as exc:
+                # Only settable before any inter-op parallel work has started
+                logger.warning("Could not set inter-op threads: %s", exc)
+
+    def _optimize_for_cpu(self, pipe: Any) -> None:
+        """Channels-last layout and SDPA attention for the UNet and VAE."""
+        for name in ("unet", "vae"):
+            module = getattr(pipe, name, None)
+            if not isinstance(module, torch.nn.Module):
+                continue
+            if self._cpu_profile.channels_last:
+                module.to(memory_format=torch.channels_last)
+            if self._cpu_profile.sdpa and hasattr(module, "set_attn_processor"):
+                module.set_attn_processor(AttnProcessor2_0())
+
+    def _autocast(self) -> contextlib.AbstractContextManager:
+        if self._cpu_profile is not None and self._cpu_profile.bf16:
+            return torch.autocast("cpu", dtype=torch.bfloat16)
+        return contextlib.nullcontext()
+
+    def _init_compile_cache(self) -> None:
+        import torch._inductor.config as inductor_config
+
+        compile_dir = self._settings.paths.resolved_cache / "compile"
+        compile_dir /= f"torch-{torch.__version__}"
+        # Inductor's own on-disk caches; the per-bucket artifacts re-fill them after a restart
+        os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", str(compile_dir / "inductor"))
+        inductor_config.fx_graph_cache = True
+        self._compile_artifacts = CompileArtifactCache(compile_dir / "artifacts")
+
+    def _start_warm_up(self, model_id: str) -> None:
+        """Wrap the active pipeline's UNet and VAE decoder and compile them in the background."""
+        pipe = self._pipe
+        unet = getattr(pipe, "unet", None)
+        if not isinstance(unet, torch.nn.Module):
+            return
+        mode = self._settings.gpu.compile_mode
+        native = unet.config.sample_size * getattr(pipe, "vae_scale_factor", 8)
+        state = CompileState(
+            model_key=self._model_key(model_id),
+            buckets=warmup_buckets(self._settings.gpu.compile_sizes, native),
+        )
+        state.targets[UNET] = CompileTarget(
+            pipe, "unet", unet, torch.compile(unet, mode=mode, dynamic=False)
+        )
+        vae = getattr(pipe, "vae", None)
+        if vae is not None and not self._vae_upcasts(pipe):
+            state.targets[VAE_DECODER] = CompileTarget(
+                vae, "decoder", vae.decoder, torch.compile(vae.decoder, mode=mode, dynamic=False)
+            )
+        self._compiled[model_id] = state
+        task = asyncio.create_task(
+            asyncio.to_thread(self._warm_up, model_id, state, pipe, self._jobs_run)
+        )
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _warm_up(self, model_id: str, state: CompileState, pipe: Any, jobs_run: int) -> None:
+        """Compile each warm-up bucket between jobs, loading and saving compiler artifacts."""
+        for bucket in state.buckets:
+            with self._modules_lock:
+                if state.cancelled.is_set() or self._cache.tier_of(model_id) != DEVICE:
+                    return
+                # Jobs leave per-pipeline state behind (loaded LoRA adapters, a
+                # swapped VAE), so a graph traced after one may not be the clean
+                # model's; it's used in memory but not saved as its artifacts
+                persist = self._jobs_run == jobs_run
+                if not self._warm_up_bucket(model_id, state, pipe, bucket, persist):
+                    return
+
+    def _warm_up_bucket(
+        self,
+        model_id: str,
+        state: CompileState,
+        pipe: Any,
+        bucket: tuple[int, int, int],
+        persist: bool,
+    ) -> bool:
+        """Compile one bucket; False if compiling failed and warm-up should stop."""
+        # Mega-cache artifacts need torch 2.7+; older versions rely on inductor's cache alone
+        artifacts_api = hasattr(torch.compiler, "save_cache_artifacts")
+        key = artifact_key(state.model_key, str(self._dtype), bucket, torch.__version__)
+        cached = self._compile_artifacts.load(key) if artifacts_api else None
+        if cached is not None:
+            torch.compiler.load_cache_artifacts(cached)
+            state.from_cache += 1
+        started = time.perf_counter()
+        try:
+            names = self._run_warm_up(state, pipe, bucket)
+        except Exception as exc:
+            logger.warning("Compile warm-up of %s failed, running eager: %s", model_id, exc)
+            state.fail(str(exc))
+            return False
+        state.mark_warm(bucket, names)
+        logger.info(
+            "Compiled %s for %dx%d (batch %d) in %.1fs%s",
+            model_id,
+            *bucket,
+            time.perf_counter() - started,
+            " from cached artifacts" if cached is not None else "",
+        )
+        if artifacts_api and cached is None and persist:
+            saved = torch.compiler.save_cache_artifacts()
+            if saved is not None:
+                self._compile_artifacts.store(key, saved[0])
+        return True
+
+    def _run_warm_up(
+        self, state: CompileState, pipe: Any, bucket: tuple[int, int, int]
+    ) -> set[str]:
+        """Call the compiled modules on dummy inputs shaped like a job in ``bucket``."""
+        width, height, batch = bucket
+        unet = state.targets[UNET].eager
+        config = unet.config
+        param = next(unet.parameters())
+        device, dtype = param.device, param.dtype
+        scale = getattr(pipe, "vae_scale_factor", 8)
+        latent_h, latent_w = height // scale, width // scale
+        # Same timestep type the default sampler feeds the UNet
+        scheduler = copy.deepcopy(pipe.scheduler)
+        scheduler.set_timesteps(2, device=device)
+
+        # Classifier-free guidance runs the UNet on conditional and unconditional halves
+        rows = batch * 2
+        added_cond_kwargs = None
+        if config.addition_embed_type == "text_time":
+            encoder_2 = getattr(pipe, "text_encoder_2", None)
+            text_dim = encoder_2.config.projection_dim if encoder_2 is not None else 1280
+            n_ids = (config.projection_class_embeddings_input_dim - text_dim) // (
+                config.addition_time_embed_dim
+            )
+            added_cond_kwargs = {
+                "text_embeds": torch.zeros(rows, text_dim, device=device, dtype=dtype),
+                "time_ids": torch.zeros(rows, n_ids, device=device, dtype=dtype),
+            }
+
+        latents = torch.zeros(
+            rows, config.in_channels, latent_h, latent_w, device=device, dtype=dtype
+        )
+        names = {UNET}
+        with torch.inference_mode(), self._autocast():
+            state.targets[UNET].compiled(
+                latents,
+                scheduler.timesteps[0],
+                encoder_hidden_states=torch.zeros(
+                    rows, 77, config.cross_attention_dim, device=device, dtype=dtype
+                ),
+                timestep_cond=None,
+                cross_attention_kwargs=None,
+                added_cond_kwargs=added_cond_kwargs,
+                return_dict=False,
+            )
+            decoder = state.targets.get(VAE_DECODER)
+            if decoder is not None and not self._vae_tiles(decoder.owner, latent_h, latent_w):
+                vae = decoder.owner
+                decoder.compiled(
+                    torch.zeros(
+                        batch,
+                        vae.config.latent_channels,
+                        latent_h,
+                        latent_w,
+                        device=device,
+                        dtype=vae.dtype,
+                    )
+                )
+                names.add(VAE_DECODER)
+        return names
+
+    def _use_compiled(
+        self, params: GenerateRequest, plan: MemoryPlan, size: tuple[int, int]
+    ) -> list[str]:
+        """Switch the active pipeline to compiled modules warm for this job's size."""
+        state = self._compiled.get(self._current_model)
+        if state is None:
+            return []
+        allowed = {UNET, VAE_DECODER}
+        loras = self._loras.get(self._current_model)
+        if (
+            params.cfg_scale <= 1
+            or (loras is not None and loras.loaded)
+            or plan.attention_slicing
+            or plan.cpu_offload
+            or params.feature_cache is not None
+        ):
+            # Warmed with guidance and fused attention; adapter layers, sliced
+            # attention, offload hooks and feature caching all change the traced graph
+            allowed.discard(UNET)
+        decoder = state.targets.get(VAE_DECODER)
+        latent_size = max(size) // 8
+        tiled = plan.vae_tiling and latent_size > getattr(self._pipe.vae, "tile_latent_min_size", 0)
+        if (
+            decoder is None
+            or self._pipe.vae is not decoder.owner
+            or plan.vae_slicing
+            or tiled
+            or plan.cpu_offload
+        ):
+            # Sliced and tiled decodes run at other shapes than the warmed ones
+            allowed.discard(VAE_DECODER)
+        if len(set(plan.batches)) > 1:
+            # A split batch runs at two sizes; the last one would stall on a recompile
+            return state.use((*size, 0), set())
+        return state.use((*size, plan.batches[0]), allowed)
+
+    @staticmethod
+    def _vae_upcasts(pipe: Any) -> bool:
+        """SDXL pipelines decode fp16 VAEs in fp32, which a compiled graph can't follow."""
+        vae = pipe.vae
+        return (
+            hasattr(pipe, "upcast_vae")
+            and vae.dtype == torch.float16
+            and getattr(vae.config, "force_upcast", False)
+        )
+
+    @staticmethod
+    def _vae_tiles(vae: Any, latent_h: int, latent_w: int) -> bool:
+        """Whether tiled decoding would split these latents into variable-size tiles."""
+        tile = getattr(vae, "tile_latent_min_size", 0)
+        return bool(getattr(vae, "use_tiling", False)) and max(latent_h, latent_w) > tile
+
+    def _model_key(self, model_id: str) -> str:
+        """Stable identity for a model's compiled artifacts: its content hash if known."""
+        entry = self.model_manager.get(model_id) if self.model_manager else None
+        return entry.sha256[:16] if entry is not None and entry.sha256 else model_id
+
+    def _native_size(self) -> int:
+        """Side length the active pipeline's model was trained at."""
+        unet = getattr(self._pipe, "unet", None)
+        sample_size = getattr(getattr(unet, "config", None), "sample_size", 64)
+        return sample_size * getattr(self._pipe, "vae_scale_factor", 8)
+
+    def _derived_pipeline(self, mode: GenerationMode) -> Any:
+        """A pipeline for ``mode`` built on the active pipeline's components.
+
+        ``from_pipe`` shares the modules themselves, so this costs no load
+        and no copy of the weights. Per-job swaps on the active pipeline
+        (scheduler, VAE override, compiled modules) are mirrored before use.
+        """
+        key = (self._current_model, mode)
+        derived = self._derived.get(key)
+        if derived is None:
+            derived = DERIVED_PIPELINES[mode].from_pipe(self._pipe)
+            self._derived[key] = derived
+        for name, component in self._pipe.components.items():
+            if name in derived.components and getattr(derived, name) is not component:
+                setattr(derived, name, component)
+        return derived
+
+    def _refine(
+        self, params: GenerateRequest, images: Any, generators: list[Any], callback: Any
+    ) -> Any:
+        """Hires second pass: upscale the first pass and re-denoise it at the target size."""
+        hires = params.hires
+        if hires.upscaler == LATENT:
+            scale = getattr(self._pipe, "vae_scale_factor", 8)
+            image = torch.nn.functional.interpolate(
+                images, size=(params.height // scale, params.width // scale), mode="bicubic"
+            )
+        else:
+            size = (params.width, params.height)
+            image = [img.resize(size, Image.Resampling.LANCZOS) for img in images]
+        return self._derived_pipeline(GenerationMode.IMG2IMG)(
+            prompt=params.prompt,
+            negative_prompt=params.negative_prompt or None,
+            image=image,
+            strength=hires.denoise,
+            num_inference_steps=refine_schedule(hires, params.steps),
+            guidance_scale=params.cfg_scale,
+            generator=generators,
+            num_images_per_prompt=len(generators),
+            callback_on_step_end=callback,
+        )
+
+    def _edit(
+        self,
+        params: GenerateRequest,
+        sources: SourceImages,
+        generators: list[Any],
+        callback: Any,
+        latents: Any = None,
+    ) -> Any:
+        """img2img, inpaint or outpaint from a job's prepared source images.
+
+        img2img takes the source's ``latents`` when given, skipping the VAE
+        encoder; inpainting always encodes, as it also needs the masked pixels.
+        """
+        mode = GenerationMode.INPAINT if sources.inpaint else GenerationMode.IMG2IMG
+        return self._derived_pipeline(mode)(
+            prompt=params.prompt,
+            negative_prompt=params.negative_prompt or None,
+            image=sources.image if latents is None else latents,
+            strength=edit_strength(params),
+            num_inference_steps=params.steps,
+            guidance_scale=params.cfg_scale,
+            generator=generators,
+            num_images_per_prompt=len(generators),
+            callback_on_step_end=callback,
+            **sources.inpaint_kwargs(),
+        )
+
+    def _vae_identity(self, params: GenerateRequest) -> str:
+        """The VAE a job encodes and decodes with, as part of its latents' cache key."""
+        vae = self._model_key(params.vae) if params.vae else self._model_key(self._current_model)
+        return f"{vae}|{self._pipe.vae.dtype}"
+
+    def _source_latents(self, image: Image.Image, vae_id: str) -> tuple[Any, bool]:
+        """Scaled VAE latents of an img2img source, and whether they came from the cache.
+
+        The latent distribution's mode is used rather than a sample, so an
+        uploaded source always encodes to the same latents and a cache hit
+        matches a fresh encode. Images this backend generated are the
+        exception: they reuse the latents they were decoded from (see
+        ``_keep_latents``), which a VAE round trip of their pixels wouldn't
+        reproduce exactly.
+        """
+        key = latent_key(image_digest(image), vae_id)
+        cached = self._latents.get(key)
+        if cached is not None:
+            return cached.unsqueeze(0).to(self._device), True
+        pipe, vae = self._pipe, self._pipe.vae
+        upcast = self._vae_upcasts(pipe)
+        dtype = torch.float32 if upcast else vae.dtype
+        if upcast:
+            vae.to(dtype=torch.float32)
+        try:
+            pixels = pipe.image_processor.preprocess(image)
+            device = getattr(pipe, "_execution_device", self._device)
+            with torch.no_grad():
+                latents = vae.encode(pixels.to(device, dtype)).latent_dist.mode()
+        finally:
+            if upcast:
+                vae.to(dtype=torch.float16)
+        latents = latents * vae.config.scaling_factor
+        self._latents.put(key, latents[0].cpu())
+        return latents, False
+
+    def _keep_latents(self, images: list[Any], latents: list[Any], vae_id: str) -> None:
+        """Cache the latents each output image was decoded from, keyed by its pixels."""
+        for image, image_latents in zip(images, latents, strict=True):
+            self._latents.put(latent_key(image_digest(image), vae_id), image_latents)
+
+    def _model_memory(self, pipe: Any) -> ModelMemory:
+        """What the memory planner needs to know about a newly loaded pipeline."""
+        unet = getattr(pipe, "unet", None)
+        config = getattr(unet, "config", None)
+        cross_attention_dim = getattr(config, "cross_attention_dim", 768)
+        if getattr(config, "addition_embed_type", None) == "text_time":
+            architecture = SDXL_REFINER if cross_attention_dim == 1280 else SDXL
+        else:
+            architecture = SD2 if cross_attention_dim == 1024 else SD15
+        if self._cpu_profile is not None and self._cpu_profile.bf16:
+            dtype_bytes = 2  # autocast computes activations in bf16
+        else:
+            dtype_bytes = torch.finfo(self._dtype).bits // 8
+        offloadable = 0
+        if isinstance(unet, torch.nn.Module):
+            # Offload keeps only the running component on the device, the UNet at peak
+            offloadable = _pipeline_bytes(pipe) - _module_bytes(unet)
+        return ModelMemory(
+            architecture=architecture,
+            dtype_bytes=dtype_bytes,
+            vae_dtype_bytes=dtype_bytes,
+            sdpa=hasattr(torch.nn.functional, "scaled_dot_product_attention"),
+            offloadable_bytes=offloadable,
+            can_offload=self._device != "cpu",
+        )
+
+    def _available_memory(self) -> int | None:
+        """Device bytes free for a job, less gpu.memory_reserve_mb; None if unknown."""
+        if self._device == "cpu":
+            free = available_memory()
+            if not free:
+                return None
+        else:
+            free, _ = torch.cuda.mem_get_info(self._device)
+            # Blocks the caching allocator holds but isn't using are free to PyTorch
+            free += torch.cuda.memory_reserved(self._device)
+            free -= torch.cuda.memory_allocated(self._device)
+        return max(free - self._settings.gpu.memory_reserve_mb * 1024 * 1024, 0)
+
+    def _forced_memory_plan(self) -> MemoryPlan:
+        """The savers config keeps on for every job."""
+        gpu = self._settings.gpu
+        return MemoryPlan(
+            attention_slicing=gpu.attention_slicing,
+            vae_tiling=gpu.vae_tiling,
+            cpu_offload=gpu.cpu_offload,
+        )
+
+    def _plan_memory(self, params: GenerateRequest, size: tuple[int, int]) -> MemoryPlan:
+        """Pick the memory savers and batch split for denoising at ``size``."""
+        forced = replace(self._forced_memory_plan(), batches=[params.batch_size])
+        profile = self._memory_profiles.get(self._current_model)
+        available = self._available_memory() if self._settings.gpu.memory_planner else None
+        if profile is None or available is None:
+            return forced
+        vae = getattr(self._pipe, "vae", None)
+        others = [
+            entry["size_bytes"]
+            for entry in self._cache.stats()
+            if entry["tier"] == DEVICE and entry["model_id"] != self._current_model
+        ]
+        upcast = vae is not None and self._vae_upcasts(self._pipe)
+        profile = replace(
+            profile,
+            vae_dtype_bytes=4 if upcast else profile.vae_dtype_bytes,
+            vae_tile_size=getattr(vae, "tile_sample_min_size", profile.vae_tile_size),
+            reclaimable_bytes=sum(others),
+        )
+        plan = plan_job(
+            profile,
+            *size,
+            params.batch_size,
+            available,
+            guided=params.cfg_scale > 1,
+            forced=forced,
+        )
+        mb = 1024 * 1024
+        if not plan.fits:
+            logger.warning(
+                "%dx%d x%d needs about %dMB with every memory saver, %dMB available",
+                *size,
+                params.batch_size,
+                plan.estimated_bytes // mb,
+                plan.available_bytes // mb,
+            )
+        elif plan.optimizations != forced.optimizations or len(plan.batches) > 1:
+            logger.info(
+                "Memory plan for %dx%d x%d: %s, batches %s",
+                *size,
+                params.batch_size,
+                ", ".join(plan.optimizations),
+                plan.batches,
+            )
+        return plan
+
+    def _apply_memory_plan(self, plan: MemoryPlan) -> Callable[[], None]:
+        """Enable the plan's per-job savers on the active pipeline; returns their undo.
+
+        Savers that config keeps on are left alone. Attention processors are
+        put back as the exact objects they were, so compiled graphs that
+        guard on them stay valid.
+        """
+        forced = self._forced_memory_plan()
+        pipe = self._pipe
+        vae = getattr(pipe, "vae", None)
+        undo: list[Callable[[], None]] = []
+        if plan.attention_slicing and not forced.attention_slicing:
+            for module in (getattr(pipe, "unet", None), vae):
+                if hasattr(module, "attn_processors"):
+                    saved = module.attn_processors
+                    undo.append(functools.partial(module.set_attn_processor, saved))
+            pipe.enable_attention_slicing()
+        if plan.vae_slicing:
+            vae.enable_slicing()
+            undo.append(vae.disable_slicing)
+        if plan.vae_tiling and not forced.vae_tiling:
+            vae.enable_tiling()
+            undo.append(vae.disable_tiling)
+        if plan.demote_others:
+            self._cache.demote_others(self._current_model)
+            self._reclaim_memory()
+        if plan.cpu_offload and not forced.cpu_offload:
+            pipe.enable_model_cpu_offload()
+
+            def reload() -> None:
+                pipe.remove_all_hooks()
+                pipe.to(self._device)
+
+            undo.append(reload)
+
+        def restore() -> None:
+            for step in reversed(undo):
+                step()
+
+        return restore
+
+    def _quantize_pipeline(
+        self, pipe: Any, shared: list[str], prequantized: list[str]
+    ) -> QuantizationReport:
+        """Apply the configured weight quantization and measure what it saved.
+
+        Quantized modules are withdrawn from the dedup registry: their
+        contents no longer match a freshly loaded copy, and another
+        pipeline must not be handed a module it would quantize again.
+        """
+        mode, names = quantization_targets(
+            self._settings.gpu.quantization,
+            self._device,
+            text_encoders=self._settings.gpu.quantize_text_encoders,
+            skip=[*shared, *prequantized],
+        )
+        modules = {
+            name: module
+            for name in names
+            if isinstance(module := getattr(pipe, name, None), torch.nn.Module)
+        }
+        before = _pipeline_bytes(pipe, shared)
+        started = time.perf_counter()
+        for name, module in modules.items():
+            logger.info("Quantizing %s to %s", name, mode)
+            setattr(pipe, name, _quantize_module(module, mode))
+            self._components.forget(module)
+        report = QuantizationReport(
+            mode=mode,
+            components=[*prequantized, *modules],
+            weight_bytes_before=before,
+            weight_bytes_after=_pipeline_bytes(pipe, shared),
+            quantize_seconds=time.perf_counter() - started,
+        )
+        if modules:
+            mb = 1024 * 1024
+            logger.info(
+                "Quantized weights: %dMB -> %dMB in %.1fs",
+                report.weight_bytes_before // mb,
+                report.weight_bytes_after // mb,
+                report.quantize_seconds,
+            )
+        return report
+
+    def _apply_vae(self, vae_id: str) -> None:
+        """Swap the active pipeline's VAE for an override, or restore its own."""
+        if not hasattr(self._pipe, "vae"):
+            return
+        vae = self._load_vae(vae_id) if vae_id else self._default_vaes.get(self._current_model)
+        if vae is None or self._pipe.vae is vae:
+            return
+        self._pipe.vae = vae.to(self._device, dtype=self._dtype)
+        if self._settings.gpu.vae_tiling:
+            self._pipe.vae.enable_tiling()
+        if self._settings.gpu.cpu_offload:
+            # Offload hooks are per-module; re-install them for the new VAE
+            self._pipe.enable_model_cpu_offload()
+
+    def _load_vae(self, vae_id: str) -> Any:
+        if vae_id in self._vae_overrides:
+            self._vae_overrides.move_to_end(vae_id)
+            return self._vae_overrides[vae_id]
+
+        path = self.model_manager.resolve(vae_id, "vae") if self.model_manager else None
+        if path is None:
+            path = self._settings.paths.resolved_models / "vaes" / vae_id
+        if not path.exists():
+            raise ValueError(f"Unknown VAE: {vae_id}")
+        logger.info("Loading VAE: %s", vae_id)
+        with self._pause_hashing():
+            if path.is_dir():
+                vae = AutoencoderKL.from_pretrained(str(path), torch_dtype=self._dtype)
+            else:
+                vae = AutoencoderKL.from_single_file(str(path), torch_dtype=self._dtype)
+        # A checkpoint may already carry this exact VAE
+        vae = self._components.intern(vae)
+
+        self._vae_overrides[vae_id] = vae
+        while len(self._vae_overrides) > MAX_VAE_OVERRIDES:
+            self._vae_overrides.popitem(last=False)
+        return vae
+
+    def _apply_loras(self, loras: list[LoraSpec]) -> None:
+        """Activate the requested LoRA adapters on the active pipeline."""
+        state = self._loras.get(self._current_model)
+        if state is None:
+            if not loras:
+                return
+            report = self._quantization.get(self._current_model)
+            if report is not None and report.components:
+                raise ValueError(
+                    f"LoRAs can't be applied to quantized model {self._current_model} "
+                    f"({', '.join(report.components)} quantized as {report.mode})"
+                )
+            self._unshare_text_encoders()
+            self._lora_prefix += 1
+            state = LoraAdapterCache(
+                f"p{self._lora_prefix}",
+                max_adapters=self._settings.gpu.lora_max_loaded,
+                fuse_after=self._settings.gpu.lora_fuse_after,
+            )
+            self._loras[self._current_model] = state
+
+        requested = [(spec.id, self._resolve_lora(spec.id), spec.weight) for spec in loras]
+        plan = state.plan(requested)
+        try:
+            self._execute_lora_plan(plan)
+        except Exception:
+            # Start this pipeline's adapters from a clean slate rather than guess
+            if state.fused:
+                self._pipe.unfuse_lora()
+            self._pipe.unload_lora_weights()
+            state.reset()
+            raise
+        state.commit(plan)
+
+    def _unshare_text_encoders(self) -> None:
+        """Give the active pipeline private text encoders before LoRAs modify them.
+
+        Adapters are injected into the modules themselves, so a text encoder
+        shared with another pipeline is copied first, and the pipeline's
+        encoders are withdrawn from the dedup registry.
+        """
+        others = [
+            pipe
+            for tier in (DEVICE, CPU)
+            for pipe in self._cache.pipelines(tier)
+            if pipe is not self._pipe
+        ]
+        in_use = {id(c) for pipe in others for c in pipe.components.values()}
+        for name in ("text_encoder", "text_encoder_2"):
+            module = getattr(self._pipe, name, None)
+            if module is None:
+                continue
+            if id(module) in in_use:
+                module = copy.deepcopy(module)
+                setattr(self._pipe, name, module)
+            self._components.forget(module)
+
+    def _execute_lora_plan(self, plan: LoraPlan) -> None:
+        pipe = self._pipe
+        if plan.unfuse:
+            pipe.unfuse_lora()
+        if plan.delete:
+            pipe.delete_adapters(plan.delete)
+        if plan.load:
+            with self._pause_hashing():
+                for name, path in plan.load:
+                    logger.info("Loading LoRA adapter %s from %s", name, path.name)
+                    pipe.load_lora_weights(str(path), adapter_name=name)
+        if plan.activate is not None:
+            pipe.enable_lora()
+            pipe.set_adapters(
+                [name for name, _ in plan.activate],
+                adapter_weights=[weight for _, weight in plan.activate],
+            )
+        elif plan.disable:
+            pipe.disable_lora()
+        if plan.fuse:
+            logger.info("Fusing LoRA combination %s", plan.combo)
+            pipe.fuse_lora(adapter_names=[name for name, _ in plan.combo])
+
+    def _resolve_lora(self, lora_id: str) -> Path:
+        path = self.model_manager.resolve(lora_id, "lora") if self.model_manager else None
+        if path is None:
+            path = self._settings.paths.resolved_models / "loras" / lora_id
+        if not path.exists():
+            raise ValueError(f"Unknown LoRA: {lora_id}")
+        return path
+
+    def _pause_hashing(self) -> contextlib.AbstractContextManager:
+        """Keep the background model hasher off the disk while we read weights."""
+        if self.model_manager is not None:
+            return self.model_manager.pause_hashing()
+        return contextlib.nullcontext()
+
+    @staticmethod
+    def _reclaim_memory() -> None:
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
     def list_available_models(self) -> list[dict[str, Any]]:
+        if self.model_manager is not None:
+            return [
+                m
+                for m in self.model_manager.scan_type("checkpoint")
+                if Path(m["filename"]).suffix in (".safetensors", ".ckpt", ".gguf")
+            ]
+
         if not self._models_dir or not self._models_dir.exists():
             return []
 
         models = []
-        for ext in ("*.safetensors", "*.ckpt"):
+        for ext in ("*.safetensors", "*.ckpt", "*.gguf"):
             for path in self._models_dir.glob(ext):
                 models.append(
                     {
@@ -227,7 +1493,7 @@ class DiffusersBackend(BaseBackend):
         return sorted(models, key=lambda m: m["name"].lower())
 
     def get_supported_modes(self) -> list[GenerationMode]:
-        return [GenerationMode.TXT2IMG]
+        return [GenerationMode.TXT2IMG, *SOURCE_MODES, GenerationMode.UPSCALE]
 
     async def get_system_info(self) -> dict[str, Any]:
         info: dict[str, Any] = {
@@ -243,6 +1509,19 @@ class DiffusersBackend(BaseBackend):
             info["vram_used_mb"] = torch.cuda.memory_allocated(0) // mb
             info["vram_free_mb"] = (props.total_mem - torch.cuda.memory_allocated(0)) // mb
             info["cuda_version"] = torch.version.cuda or ""
+        if self._cpu_profile is not None:
+            info["cpu_profile"] = self._cpu_profile.to_dict()
+        info["compile"] = {
+            model_id: state.to_dict() for model_id, state in self._compiled.items()
+        }
+        if self._latents is not None:
+            info["latent_cache"] = self._latents.stats()
+        info["quantization"] = {
+            "mode": self._settings.gpu.quantization if self._settings else NONE,
+            "models": {
+                model_id: report.to_dict() for model_id, report in self._quantization.items()
+            },
+        }
         return info
 
     def _resolve_model_path(self, model_id: str) -> Path:
@@ -260,20 +1539,79 @@ class DiffusersBackend(BaseBackend):
         # Maybe it's a HuggingFace model ID
         return p
 
-    def _set_scheduler(self, sampler: str) -> None:
-        """Set the diffusion scheduler/sampler."""
-        if not self._pipe:
-            return
+    def _load_single_file(self, model_path: Path, architecture: str, pipe_kwargs: dict) -> Any:
+        pipeline_cls = ARCHITECTURE_PIPELINES.get(architecture)
+        if pipeline_cls is not None:
+            return pipeline_cls.from_single_file(str(model_path), **pipe_kwargs)
+        # Unrecognized header: try SDXL first, fall back to SD 1.5
+        try:
+            return StableDiffusionXLPipeline.from_single_file(str(model_path), **pipe_kwargs)
+        except Exception:
+            return StableDiffusionPipeline.from_single_file(str(model_path), **pipe_kwargs)
 
-        scheduler_config = self._pipe.scheduler.config
+    def _load_gguf(self, model_id: str, model_path: Path) -> Any:
+        """Load a GGUF denoiser into its base pipeline.
 
-        if sampler in ("euler_a", "euler_ancestral"):
-            self._pipe.scheduler = EulerAncestralDiscreteScheduler.from_config(
-                scheduler_config
-            )
-        elif sampler == "euler":
-            self._pipe.scheduler = EulerDiscreteScheduler.from_config(scheduler_config)
-        elif sampler in ("dpm++_2m", "dpm++_2m_karras"):
-            self._pipe.scheduler = DPMSolverMultistepScheduler.from_config(
-                scheduler_config, use_karras_sigmas="karras" in sampler
-            )
+        The weights stay in their GGUF quantization and are dequantized per
+        layer at compute time; text encoders and VAE come from the base
+        pipeline the file's architecture maps to.
+        """
+        from diffusers import GGUFQuantizationConfig
+
+        architecture = self._detect_architecture(model_id, model_path)
+        base = GGUF_BASE_PIPELINES.get(architecture)
+        if base is None:
+            raise ValueError(f"{model_id}: unsupported GGUF architecture {architecture}")
+        unet = UNet2DConditionModel.from_single_file(
+            str(model_path),
+            quantization_config=GGUFQuantizationConfig(compute_dtype=self._dtype),
+            config=base,
+            subfolder="unet",
+            torch_dtype=self._dtype,
+        )
+        return DiffusionPipeline.from_pretrained(base, unet=unet, torch_dtype=self._dtype)
+
+    def _conversion_key(self, model_id: str) -> str:
+        """Conversion cache key, once the catalog has hashed the checkpoint."""
+        if not self._conversions.enabled or self.model_manager is None:
+            return ""
+        entry = self.model_manager.get(model_id)
+        if entry is None or not entry.sha256:
+            return ""
+        return conversion_key(entry.sha256, str(self._dtype))
+
+    def _detect_architecture(self, model_id: str, model_path: Path) -> str:
+        """Architecture from the catalog, or from the file header if uncatalogued."""
+        if self.model_manager is not None:
+            entry = self.model_manager.get(model_id)
+            if entry is not None and "architecture" in entry.metadata:
+                return entry.metadata["architecture"]
+        inspect = {".safetensors": inspect_safetensors, ".gguf": inspect_gguf}.get(
+            model_path.suffix
+        )
+        if inspect is not None:
+            try:
+                return inspect(model_path).architecture
+            except (OSError, ValueError):
+                pass
+        return UNKNOWN
+
+    def _set_scheduler(self, sampler_name: str) -> None:
+        """Switch the active pipeline to the scheduler for ``sampler_name``.
+
+        Schedulers are built once per (model, sampler) from the model's own
+        scheduler config, so settings of one sampler never leak into
+        another. Reusing an instance is safe: the pipeline's
+        ``set_timesteps`` call resets all per-run state.
+        """
+        if not self._pipe:
+            return
+        sampler = resolve_sampler(sampler_name)
+        key = (self._current_model, sampler.name)
+        scheduler = self._schedulers.get(key)
+        if scheduler is None:
+            base = self._scheduler_configs.get(self._current_model, self._pipe.scheduler.config)
+            scheduler_cls = getattr(diffusers, sampler.scheduler)
+            scheduler = scheduler_cls.from_config(base, **sampler.config)
+            self._schedulers[key] = scheduler
+        self._pipe.scheduler = scheduler
@@ -0,0 +1,136 @@
+"""Bookkeeping for ``torch.compile`` warm-up and its on-disk artifact cache.
+
+Compiled graphs are specialized to input shapes, so compiling on a job's
+first step would stall that job for as long as compilation takes — and
+again for every new size. Instead, after a model loads, its UNet and VAE
+decoder are compiled in the background for a few resolution buckets. A job
+runs the compiled modules only when its bucket is already warm and falls
+back to the eager ones otherwise, so it never waits on the compiler.
+
+Compiler output for each bucket is saved as an artifact keyed by model,
+dtype, bucket and torch version; after a restart the artifact pre-fills the
+compiler caches, so warm-up only has to re-trace the model.
+
+Everything here is torch-free; the backend supplies the modules and the
+warm-up and serialization calls.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger("forge.backends.diffusers.compile")
+
+# Width, height and images per batch
+Bucket = tuple[int, int, int]
+
+UNET = "unet"
+VAE_DECODER = "vae_decoder"
+ARTIFACT_SUFFIX = ".bin"
+TMP_PREFIX = ".tmp-"
+
+
+def warmup_buckets(sizes: list[tuple[int, int]], native: int) -> list[Bucket]:
+    """Buckets to warm up: the configured sizes, or the model's native resolution."""
+    sizes = sizes or [(native, native)]
+    # Single images are the common case
+    return [(width, height, 1) for width, height in dict.fromkeys(tuple(s) for s in sizes)]
+
+
+def artifact_key(model_key: str, dtype: str, bucket: Bucket, torch_version: str) -> str:
+    width, height, batch = bucket
+    raw = f"{model_key}|{dtype}|{width}x{height}x{batch}|{torch_version}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+class CompileArtifactCache:
+    """Directory of serialized compiler artifacts, one file per key."""
+
+    def __init__(self, cache_dir: Path) -> None:
+        self._dir = cache_dir
+
+    @property
+    def directory(self) -> Path:
+        return self._dir
+
+    def load(self, key: str) -> bytes | None:
+        try:
+            return (self._dir / f"{key}{ARTIFACT_SUFFIX}").read_bytes()
+        except OSError:
+            return None
+
+    def store(self, key: str, data: bytes) -> None:
+        """Write an artifact atomically, so a crash never leaves a partial one."""
+        self._dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._dir / f"{TMP_PREFIX}{key}-{uuid.uuid4().hex[:8]}"
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, self._dir / f"{key}{ARTIFACT_SUFFIX}")
+        except OSError as exc:
+            logger.warning("Could not cache compiled artifact %s: %s", key, exc)
+            tmp.unlink(missing_ok=True)
+
+
+@dataclass
+class CompileTarget:
+    """A module attribute that can be switched between eager and compiled."""
+
+    owner: Any
+    attr: str
+    eager: Any
+    compiled: Any
+
+    def install(self, compiled: bool) -> None:
+        setattr(self.owner, self.attr, self.compiled if compiled else self.eager)
+
+
+@dataclass
+class CompileState:
+    """Warm-up progress of one loaded model."""
+
+    model_key: str
+    buckets: list[Bucket]
+    targets: dict[str, CompileTarget] = field(default_factory=dict)
+    # Bucket -> names of the targets whose compiled graph is ready for it
+    warm: dict[Bucket, set[str]] = field(default_factory=dict)
+    from_cache: int = 0
+    error: str = ""
+    cancelled: threading.Event = field(default_factory=threading.Event)
+
+    def mark_warm(self, bucket: Bucket, names: set[str]) -> None:
+        self.warm[bucket] = set(names)
+
+    def fail(self, error: str) -> None:
+        """Stop using compiled graphs for this model."""
+        self.error = error
+        self.warm.clear()
+        self.cancelled.set()
+
+    def use(self, bucket: Bucket, allowed: set[str] | None = None) -> list[str]:
+        """Install compiled or eager modules for a job; returns the compiled ones."""
+        ready = self.warm.get(bucket, set())
+        if allowed is not None:
+            ready = ready & allowed
+        for name, target in self.targets.items():
+            target.install(name in ready)
+        return sorted(ready)
+
+    def restore(self) -> None:
+        """Put the eager modules back after a job."""
+        for target in self.targets.values():
+            target.install(False)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "buckets": [f"{w}x{h}x{b}" for w, h, b in self.buckets],
+            "warm": {f"{w}x{h}x{b}": sorted(names) for (w, h, b), names in self.warm.items()},
+            "from_cache": self.from_cache,
+            "error": self.error,
+        }
@@ -0,0 +1,93 @@
+"""Deduplication of identical pipeline components.
+
+Fine-tuned checkpoints often ship byte-identical text encoders and VAEs. The
+registry lets a newly loaded pipeline reuse a module that is already
+resident instead of keeping a second copy — over a gigabyte per pipeline
+for SDXL's two text encoders.
+
+Matching is two-level so the common case stays cheap: a quick signature
+(tensor names, shapes, dtypes and a few sampled values) finds candidates,
+and only then are full content fingerprints compared. Modules are held
+weakly, so a component disappears from the registry when the last
+pipeline using it is evicted.
+
+The registry is torch-free; signature and fingerprint functions are
+injected by the backend.
+"""
+
+from __future__ import annotations
+
+import logging
+import weakref
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger("forge.backends.diffusers.components")
+
+# Pipeline attributes worth deduplicating
+SHARED_COMPONENTS = ("text_encoder", "text_encoder_2", "vae")
+
+
+class ComponentRegistry:
+    """Interns modules by content so identical copies are shared."""
+
+    def __init__(
+        self,
+        signature: Callable[[Any], str],
+        fingerprint: Callable[[Any], str],
+    ) -> None:
+        self._signature = signature
+        self._fingerprint = fingerprint
+        self._by_signature: dict[str, list[weakref.ref]] = {}
+        self._fingerprints: weakref.WeakKeyDictionary[Any, str] = weakref.WeakKeyDictionary()
+        self.hits = 0
+
+    def intern(self, module: Any) -> Any:
+        """Return an already-registered module identical to ``module``, or register it."""
+        sig = self._signature(module)
+        refs = [r for r in self._by_signature.get(sig, []) if r() is not None]
+        self._by_signature[sig] = refs
+        candidates = [r() for r in refs]
+        if any(c is module for c in candidates):
+            return module
+
+        if candidates:
+            fingerprint = self._fingerprint_of(module)
+            for candidate in candidates:
+                if self._fingerprint_of(candidate) == fingerprint:
+                    self.hits += 1
+                    return candidate
+
+        refs.append(weakref.ref(module))
+        return module
+
+    def forget(self, module: Any) -> None:
+        """Stop offering ``module`` for sharing (e.g. once adapters modify it)."""
+        for sig, refs in list(self._by_signature.items()):
+            self._by_signature[sig] = [r for r in refs if r() is not None and r() is not module]
+        self._fingerprints.pop(module, None)
+
+    def dedupe(self, pipe: Any) -> list[str]:
+        """Swap ``pipe``'s shareable components for resident copies.
+
+        Returns the names of the components that were replaced.
+        """
+        shared = []
+        for name in SHARED_COMPONENTS:
+            module = getattr(pipe, name, None)
+            if module is None:
+                continue
+            resident = self.intern(module)
+            if resident is not module:
+                setattr(pipe, name, resident)
+                shared.append(name)
+        if shared:
+            logger.info("Reusing resident components: %s", ", ".join(shared))
+        return shared
+
+    def _fingerprint_of(self, module: Any) -> str:
+        fingerprint = self._fingerprints.get(module)
+        if fingerprint is None:
+            fingerprint = self._fingerprint(module)
+            self._fingerprints[module] = fingerprint
+        return fingerprint
@@ -0,0 +1,130 @@
+"""On-disk cache of single-file checkpoints converted to diffusers layout.
+
+``from_single_file`` re-maps every original checkpoint key onto diffusers
+components on each load. The first time a checkpoint is loaded we save the
+converted pipeline (in the dtype it was loaded with) as sharded safetensors;
+later loads use ``from_pretrained`` on that directory, whose weights are
+memory-mapped straight into the right modules.
+
+Entries are keyed by the model's content hash and dtype, written to a
+temporary directory and renamed into place only once complete, and evicted
+least-recently-used first when the cache exceeds its size limit.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger("forge.backends.diffusers.conversions")
+
+MANIFEST = "forge_conversion.json"
+TMP_PREFIX = ".tmp-"
+
+
+def conversion_key(sha256: str, dtype: str) -> str:
+    """Cache key for a checkpoint (by content hash) loaded in ``dtype``."""
+    return f"{sha256[:16]}-{dtype.removeprefix('torch.')}"
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+class ConversionCache:
+    """Directory of converted pipelines with an LRU size limit."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int) -> None:
+        self._dir = cache_dir
+        self._max_bytes = max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_bytes > 0
+
+    def lookup(self, key: str) -> Path | None:
+        """Return the converted pipeline directory for ``key``, if cached."""
+        path = self._dir / key
+        manifest = path / MANIFEST
+        if not manifest.exists():
+            return None
+        # The manifest's mtime is the entry's last use, for LRU eviction
+        os.utime(manifest)
+        return path
+
+    def store(self, key: str, save: Callable[[Path], None], source: str = "") -> Path | None:
+        """Save a converted pipeline with ``save(directory)`` and cache it.
+
+        Returns the cached directory, or ``None`` if saving failed.
+        """
+        self._dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._dir / f"{TMP_PREFIX}{key}-{uuid.uuid4().hex[:8]}"
+        started = time.monotonic()
+        try:
+            save(tmp)
+            size = _dir_size(tmp)
+            (tmp / MANIFEST).write_text(
+                json.dumps({"key": key, "source": source, "size_bytes": size}), encoding="utf-8"
+            )
+            final = self._dir / key
+            if final.exists():
+                shutil.rmtree(final)
+            os.replace(tmp, final)
+        except Exception as exc:
+            logger.warning("Could not cache converted pipeline %s: %s", key, exc)
+            shutil.rmtree(tmp, ignore_errors=True)
+            return None
+
+        logger.info(
+            "Cached converted pipeline %s (%d MB) in %.1fs",
+            key,
+            size // (1024 * 1024),
+            time.monotonic() - started,
+        )
+        self.evict(keep=key)
+        return final
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Cached conversions, most recently used first."""
+        found = []
+        if not self._dir.exists():
+            return found
+        for path in self._dir.iterdir():
+            manifest = path / MANIFEST
+            if path.name.startswith(TMP_PREFIX) or not manifest.exists():
+                continue
+            try:
+                info = json.loads(manifest.read_text(encoding="utf-8"))
+                last_used = manifest.stat().st_mtime
+            except (OSError, ValueError):
+                continue
+            found.append({**info, "key": path.name, "last_used": last_used})
+        return sorted(found, key=lambda e: e["last_used"], reverse=True)
+
+    def evict(self, keep: str = "") -> list[str]:
+        """Remove least recently used entries until under the size limit."""
+        # Leftovers from a save interrupted by a crash are never valid
+        if self._dir.exists():
+            for path in self._dir.glob(f"{TMP_PREFIX}*"):
+                shutil.rmtree(path, ignore_errors=True)
+
+        entries = self.entries()
+        total = sum(e.get("size_bytes", 0) for e in entries)
+        removed = []
+        for entry in reversed(entries):
+            if total <= self._max_bytes:
+                break
+            if entry["key"] == keep:
+                continue
+            shutil.rmtree(self._dir / entry["key"], ignore_errors=True)
+            total -= entry.get("size_bytes", 0)
+            removed.append(entry["key"])
+            logger.info("Evicted converted pipeline %s", entry["key"])
+        return removed
@@ -0,0 +1,133 @@
+"""Tuning profile for running the diffusers backend on CPU.
+
+Untuned, PyTorch on CPU computes in fp32, uses as many threads as logical
+CPUs (hyper-threads included, which mostly contend for the same execution
+units) and lets the scheduler move those threads across sockets. The
+profile resolves ``cpu:`` settings against the actual machine:
+
+- bf16 autocast when the CPU has native bf16 instructions (AVX512-BF16 or
+  AMX), where oneDNN runs bf16 convolutions and matmuls at up to twice the
+  fp32 rate;
+- channels-last memory layout for the UNet and VAE, the layout oneDNN's
+  convolution kernels prefer;
+- scaled-dot-product attention instead of sliced attention;
+- intra-op threads defaulting to the number of physical cores, and
+  optional pinning of the process to a core list, so several workers on
+  one machine don't fight over the same cores.
+
+Resolution is torch-free; the backend applies the result.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from forge.config import CPUConfig
+
+CPUINFO = Path("/proc/cpuinfo")
+MEMINFO = Path("/proc/meminfo")
+# cpuinfo flags for native bf16 arithmetic
+BF16_FLAGS = {"avx512_bf16", "amx_bf16"}
+
+
+@dataclass
+class CPUProfile:
+    """CPU settings resolved for this machine."""
+
+    bf16: bool
+    channels_last: bool
+    sdpa: bool
+    intra_op_threads: int
+    inter_op_threads: int
+    affinity: list[int] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def parse_cpu_list(spec: str) -> list[int]:
+    """Parse a Linux-style CPU list such as ``"0-3,8,10-11"``."""
+    cpus: list[int] = []
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        first, last = int(start), int(end or start)
+        if last < first:
+            raise ValueError(f"Invalid CPU range: {part}")
+        cpus.extend(range(first, last + 1))
+    return sorted(set(cpus))
+
+
+def read_cpuinfo() -> str:
+    try:
+        return CPUINFO.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return ""
+
+
+def cpu_flags(cpuinfo: str) -> set[str]:
+    for line in cpuinfo.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip() == "flags":
+            return set(value.split())
+    return set()
+
+
+def physical_cores(cpuinfo: str, cpus: list[int] | None = None) -> int:
+    """Physical cores among ``cpus`` (all CPUs if None), from /proc/cpuinfo."""
+    cores = set()
+    processor = package = None
+    for line in [*cpuinfo.splitlines(), ""]:
+        key, _, value = line.partition(":")
+        key, value = key.strip(), value.strip()
+        if key == "processor":
+            processor = int(value)
+        elif key == "physical id":
+            package = value
+        elif key == "core id" and processor is not None and (cpus is None or processor in cpus):
+            cores.add((package, value))
+    if cores:
+        return len(cores)
+    # No topology information (non-x86, some VMs): count logical CPUs
+    return len(cpus) if cpus else os.cpu_count() or 1
+
+
+def available_cpus() -> list[int]:
+    """CPUs this process may run on (a container's cpuset, an existing pin)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def available_memory(meminfo: str | None = None) -> int:
+    """Bytes of RAM available for new allocations (``MemAvailable``), 0 if unknown."""
+    if meminfo is None:
+        try:
+            meminfo = MEMINFO.read_text(encoding="utf-8")
+        except OSError:
+            return 0
+    for line in meminfo.splitlines():
+        key, _, value = line.partition(":")
+        if key == "MemAvailable":
+            return int(value.split()[0]) * 1024
+    return 0
+
+
+def resolve_cpu_profile(config: CPUConfig, cpuinfo: str | None = None) -> CPUProfile:
+    """Resolve ``auto`` and ``0`` settings against this machine."""
+    cpuinfo = read_cpuinfo() if cpuinfo is None else cpuinfo
+    affinity = parse_cpu_list(config.affinity) if config.affinity else []
+    bf16 = bool(cpu_flags(cpuinfo) & BF16_FLAGS) if config.bf16 == "auto" else config.bf16 == "on"
+    return CPUProfile(
+        bf16=bf16,
+        channels_last=config.channels_last,
+        sdpa=config.sdpa,
+        intra_op_threads=config.intra_op_threads
+        or physical_cores(cpuinfo, affinity or available_cpus()),
+        inter_op_threads=config.inter_op_threads,
+        affinity=affinity,
+    )
@@ -0,0 +1,148 @@
+"""Reuse of the UNet's deep features across denoising steps (DeepCache).
+
+Consecutive denoising steps change the UNet's high-level features very
+little. On a full step every block runs and the outputs of the deep ones
+(all down blocks but the first, the mid block, all up blocks but the last)
+are kept. On the steps in between, only the shallow path runs: conv_in,
+the first down block, the last up block and conv_out. The deep blocks hand
+back their kept outputs, so the last up block combines fresh shallow
+features with cached deep ones. That skips most of the UNet's compute.
+
+A full step runs every ``interval`` steps, and also:
+
+- for the first ``WARMUP_FRACTION`` of the steps, where the image's layout
+  is still forming and features change fastest;
+- on the last step, so the final details see the whole network;
+- whenever the guard trips: the first down block's output has drifted from
+  its value at the last full step by more than ``guard`` (relative mean
+  absolute change), meaning the cached deep features are stale.
+
+Blocks are wrapped by replacing their ``forward``; nothing here needs
+torch, the outputs are only stored and compared.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+from typing import Any
+
+WARMUP_FRACTION = 0.15
+
+
+def relative_change(current: Any, reference: Any) -> float:
+    """Mean absolute change of ``current`` relative to the mean magnitude of ``reference``."""
+    return float(abs(current - reference).mean() / (abs(reference).mean() + 1e-8))
+
+
+class FeatureCache:
+    """Skips the UNet's deep blocks on steps between full ones; see the module docstring."""
+
+    def __init__(self, interval: int, guard: float) -> None:
+        self.interval = interval
+        self.guard = guard
+        self.full_steps = 0
+        self.reused_steps = 0
+        self._outputs: dict[int, Any] = {}
+        self.start(0)
+
+    def start(self, total_steps: int) -> None:
+        """Begin a pipeline call of ``total_steps`` UNet steps; nothing carries over."""
+        self._total = total_steps
+        self._warmup = math.ceil(total_steps * WARMUP_FRACTION)
+        self._step = 0
+        self._last_full = -self.interval
+        self._outputs.clear()
+        self._shallow = self._shallow_at_full = None
+        self._full: bool | None = None
+
+    def attach(self, unet: Any) -> Callable[[], None]:
+        """Wrap ``unet``'s blocks; returns a function that unwraps them."""
+        restores = [
+            self._wrap(unet, self._unet_forward),
+            self._wrap(unet.down_blocks[0], self._shallow_forward),
+        ]
+        deep = [*unet.down_blocks[1:], unet.mid_block, *unet.up_blocks[:-1]]
+        for index, block in enumerate(deep):
+            if block is not None:
+                restores.append(self._wrap(block, self._deep_forward(index)))
+
+        def detach() -> None:
+            for restore in reversed(restores):
+                restore()
+
+        return detach
+
+    @staticmethod
+    def _wrap(module: Any, make: Callable[[Callable], Callable]) -> Callable[[], None]:
+        # An instance-level forward (e.g. an offload hook) is wrapped and put back
+        previous = module.__dict__.get("forward")
+        module.forward = make(module.forward)
+
+        def restore() -> None:
+            if previous is None:
+                del module.forward
+            else:
+                module.forward = previous
+
+        return restore
+
+    def _unet_forward(self, forward: Callable) -> Callable:
+        def wrapper(*args, **kwargs):
+            self._full = None
+            try:
+                return forward(*args, **kwargs)
+            finally:
+                if self._full is not None:
+                    if self._full:
+                        self.full_steps += 1
+                    else:
+                        self.reused_steps += 1
+                self._step += 1
+
+        return wrapper
+
+    def _shallow_forward(self, forward: Callable) -> Callable:
+        def wrapper(*args, **kwargs):
+            output = forward(*args, **kwargs)
+            self._shallow = output[0] if isinstance(output, tuple) else output
+            return output
+
+        return wrapper
+
+    def _deep_forward(self, index: int) -> Callable[[Callable], Callable]:
+        def make(forward: Callable) -> Callable:
+            def wrapper(*args, **kwargs):
+                if self._full is None:
+                    self._full = self._decide()
+                if self._full or index not in self._outputs:
+                    self._outputs[index] = forward(*args, **kwargs)
+                return self._outputs[index]
+
+            return wrapper
+
+        return make
+
+    def _decide(self) -> bool:
+        """Whether the current step runs the full UNet."""
+        step = self._step
+        full = (
+            not self._outputs
+            or step < self._warmup
+            or step >= self._total - 1
+            or step - self._last_full >= self.interval
+        )
+        if not full and self.guard > 0 and self._shallow is not None:
+            full = relative_change(self._shallow, self._shallow_at_full) > self.guard
+        if full:
+            self._last_full = step
+            self._shallow_at_full = self._shallow
+        return full
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "guard": self.guard,
+            "full_steps": self.full_steps,
+            "reused_steps": self.reused_steps,
+        }
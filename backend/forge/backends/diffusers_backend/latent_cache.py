@@ -0,0 +1,154 @@
+"""Cache of VAE latents for img2img sources.
+
+Every img2img job starts by running the VAE encoder over its source, which
+at high resolution costs about as much as a couple of denoising steps.
+Iterative editing reuses one source across many strengths, prompts and
+seeds, and "send to img2img" starts from an image this backend just
+decoded. Latents are therefore cached by the content of the source pixels
+and the VAE that encoded them. Generated images are entered with the
+latents they were decoded from, so editing one never needs the encoder.
+
+Recently used latents stay in memory. Entries pushed out of the memory
+budget spill to disk, which is trimmed least-recently-used first. The
+cache is torch-free; the backend supplies size, save and load functions.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+
+logger = logging.getLogger("forge.backends.diffusers.latents")
+
+SUFFIX = ".pt"
+TMP_PREFIX = ".tmp-"
+
+
+def image_digest(image: Image.Image) -> str:
+    """Hash of an image's pixels and size; how it was stored on disk doesn't matter."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode}:{image.width}x{image.height};".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def latent_key(image_digest: str, vae_id: str) -> str:
+    return hashlib.blake2b(f"{image_digest}|{vae_id}".encode(), digest_size=16).hexdigest()
+
+
+class LatentCache:
+    """Memory LRU of latents that spills to a size-limited directory."""
+
+    def __init__(
+        self,
+        memory_bytes: int,
+        disk_dir: Path,
+        disk_bytes: int,
+        size_of: Callable[[Any], int],
+        save: Callable[[Any, Path], None],
+        load: Callable[[Path], Any],
+    ) -> None:
+        self._memory: OrderedDict[str, Any] = OrderedDict()
+        self._memory_bytes = memory_bytes
+        self._memory_used = 0
+        self._dir = disk_dir
+        self._disk_bytes = disk_bytes
+        self._size_of = size_of
+        self._save = save
+        self._load = load
+        self._hits = {"memory": 0, "disk": 0, "miss": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self._memory_bytes > 0 or self._disk_bytes > 0
+
+    def get(self, key: str) -> Any | None:
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+            self._hits["memory"] += 1
+            return value
+        path = self._dir / f"{key}{SUFFIX}"
+        if self._disk_bytes > 0 and path.exists():
+            try:
+                value = self._load(path)
+                # The file's mtime is its last use, for LRU trimming
+                os.utime(path)
+            except Exception as exc:
+                logger.warning("Dropping unreadable cached latents %s: %s", key, exc)
+                path.unlink(missing_ok=True)
+            else:
+                self._hits["disk"] += 1
+                self._remember(key, value)
+                return value
+        self._hits["miss"] += 1
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        if self.enabled:
+            self._remember(key, value)
+
+    def _remember(self, key: str, value: Any) -> None:
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_used -= self._size_of(old)
+        size = self._size_of(value)
+        if size > self._memory_bytes:
+            self._spill(key, value)
+            return
+        self._memory[key] = value
+        self._memory_used += size
+        while self._memory_used > self._memory_bytes:
+            evicted_key, evicted = self._memory.popitem(last=False)
+            self._memory_used -= self._size_of(evicted)
+            self._spill(evicted_key, evicted)
+
+    def _spill(self, key: str, value: Any) -> None:
+        if self._disk_bytes <= 0:
+            return
+        path = self._dir / f"{key}{SUFFIX}"
+        if path.exists():
+            os.utime(path)
+            return
+        self._dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._dir / f"{TMP_PREFIX}{key}-{uuid.uuid4().hex[:8]}"
+        try:
+            self._save(value, tmp)
+            os.replace(tmp, path)
+        except Exception as exc:
+            logger.warning("Could not spill latents %s to disk: %s", key, exc)
+            tmp.unlink(missing_ok=True)
+            return
+        self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        files = []
+        for path in self._dir.glob(f"*{SUFFIX}"):
+            with contextlib.suppress(OSError):
+                stat = path.stat()
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self._disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def stats(self) -> dict[str, Any]:
+        mb = 1024 * 1024
+        return {
+            "memory_entries": len(self._memory),
+            "memory_mb": self._memory_used // mb,
+            "hits": self._hits["memory"],
+            "disk_hits": self._hits["disk"],
+            "misses": self._hits["miss"],
+        }
@@ -0,0 +1,123 @@
+"""Per-pipeline LoRA adapter bookkeeping.
+
+LoRA files are loaded into a resident pipeline once, as named adapters, and
+each job only changes which adapters are active and at what weight — a
+``set_adapters`` call instead of a checkpoint reload. A combination used
+often enough can optionally be fused into the base weights, which removes
+the per-step adapter overhead until a different combination is requested.
+
+``LoraAdapterCache`` decides what has to happen for a requested combination
+and returns it as a ``LoraPlan``; the backend executes the plan against the
+pipeline and then commits it. Keeping the policy torch-free lets it be
+tested without diffusers.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+Combo = tuple[tuple[str, float], ...]
+
+
+@dataclass
+class LoraPlan:
+    """Steps to bring a pipeline's adapters to a requested combination."""
+
+    unfuse: bool = False
+    delete: list[str] = field(default_factory=list)
+    load: list[tuple[str, Path]] = field(default_factory=list)
+    # Adapters to activate with their weights; None leaves activation unchanged
+    activate: list[tuple[str, float]] | None = None
+    disable: bool = False
+    fuse: bool = False
+    combo: Combo = ()
+
+
+class LoraAdapterCache:
+    """Tracks the adapters loaded into one pipeline."""
+
+    def __init__(self, prefix: str, max_adapters: int = 8, fuse_after: int = 0) -> None:
+        self._prefix = prefix
+        self._max_adapters = max_adapters
+        self._fuse_after = fuse_after
+        self._loaded: OrderedDict[str, Path] = OrderedDict()  # adapter name -> file
+        self._active: Combo = ()
+        self._fused: Combo = ()
+        self._uses: dict[Combo, int] = {}
+
+    @property
+    def loaded(self) -> list[str]:
+        return list(self._loaded)
+
+    @property
+    def fused(self) -> Combo:
+        return self._fused
+
+    def adapter_name(self, lora_id: str) -> str:
+        # Adapter names are module attribute keys: no dots, unique per pipeline
+        # (text encoders can be shared between pipelines)
+        stem = Path(lora_id).stem
+        return f"{self._prefix}_{re.sub(r'[^0-9A-Za-z_]', '_', stem)}"
+
+    def plan(self, loras: list[tuple[str, Path, float]]) -> LoraPlan:
+        """Plan the changes needed to run a job with ``loras`` as (id, path, weight)."""
+        combo: Combo = tuple((self.adapter_name(lora_id), weight) for lora_id, _, weight in loras)
+        plan = LoraPlan(combo=combo)
+
+        if self._fused and self._fused != combo:
+            plan.unfuse = True
+        if self._fused == combo and combo:
+            return plan  # already baked into the weights
+
+        wanted = {name for name, _ in combo}
+        if len(wanted) != len(combo):
+            raise ValueError("Each LoRA can only be applied once per job")
+        for (_, path, _), (name, _) in zip(loras, combo, strict=True):
+            loaded_from = self._loaded.get(name)
+            if loaded_from != path:
+                if loaded_from is not None:
+                    plan.delete.append(name)  # same name, different file
+                plan.load.append((name, path))
+
+        # Make room, dropping least recently used adapters this job doesn't need
+        excess = len(set(self._loaded) | wanted) - self._max_adapters
+        for name in self._loaded:
+            if excess <= 0:
+                break
+            if name not in wanted:
+                plan.delete.append(name)
+                excess -= 1
+
+        if combo:
+            if combo != self._active or plan.unfuse or plan.load:
+                plan.activate = list(combo)
+            uses = self._uses.get(combo, 0) + 1
+            plan.fuse = self._fuse_after > 0 and uses >= self._fuse_after
+        elif self._active or plan.unfuse:
+            plan.disable = True
+        return plan
+
+    def reset(self) -> None:
+        """Forget everything, after the pipeline's adapters were all unloaded."""
+        self._loaded.clear()
+        self._active = ()
+        self._fused = ()
+
+    def commit(self, plan: LoraPlan) -> None:
+        """Record that ``plan`` was applied to the pipeline."""
+        if plan.unfuse:
+            self._fused = ()
+        for name in plan.delete:
+            self._loaded.pop(name, None)
+        for name, path in plan.load:
+            self._loaded[name] = path
+        for name, _ in plan.combo:
+            self._loaded.move_to_end(name)
+        self._active = plan.combo
+        if plan.combo:
+            self._uses[plan.combo] = self._uses.get(plan.combo, 0) + 1
+        if plan.fuse:
+            self._fused = plan.combo
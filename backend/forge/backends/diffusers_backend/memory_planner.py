@@ -0,0 +1,181 @@
+"""Per-job memory planning for the diffusers backend.
+
+Attention slicing, VAE slicing/tiling and CPU offload trade speed for
+memory. Applying them globally makes small jobs pay for what only large
+ones need, while large jobs can still run out of memory. The planner
+estimates a job's peak activation memory from its size, batch and the
+model architecture, compares it with what the device has free, and picks
+the cheapest set of measures that fits:
+
+1. VAE slicing — decode one image at a time (nearly free)
+2. VAE tiling — decode in fixed-size tiles
+3. attention slicing — only helps without fused SDPA attention
+4. demoting other resident pipelines to CPU RAM
+5. splitting the batch into smaller sequential batches
+6. model CPU offload — only the running component stays on the device
+
+The estimates are deliberately simple (activation elements per latent or
+output pixel, calibrated on SD1.5/SDXL at fp16, plus the attention matrix
+when it is materialized) and err on the high side. The planner is pure and
+torch-free; the backend measures free memory and applies the plan.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+
+from forge.models.safetensors_header import SD2, SD15, SDXL, SDXL_REFINER
+
+
+@dataclass(frozen=True)
+class ArchitectureCost:
+    # UNet activation elements alive at peak, per latent pixel per batch row
+    unet_per_latent_pixel: int
+    attention_heads: int
+    # Downscale of the highest-resolution attention relative to the latents
+    attention_downscale: int
+
+
+ARCHITECTURE_COSTS = {
+    SD15: ArchitectureCost(30_000, 8, 1),
+    SD2: ArchitectureCost(30_000, 5, 1),
+    SDXL: ArchitectureCost(40_000, 10, 2),
+    SDXL_REFINER: ArchitectureCost(40_000, 12, 2),
+}
+DEFAULT_COST = ARCHITECTURE_COSTS[SD15]
+
+# VAE decoder activation elements alive at peak, per output pixel
+VAE_PER_PIXEL = 1000
+LATENT_SCALE = 8
+
+
+@dataclass(frozen=True)
+class ModelMemory:
+    """What the planner needs to know about the loaded pipeline."""
+
+    architecture: str
+    dtype_bytes: int = 2
+    vae_dtype_bytes: int = 2
+    vae_tile_size: int = 512  # output pixels per tile side when tiling
+    sdpa: bool = True  # fused attention: no materialized attention matrix
+    # Bytes that could be freed on the device by demoting other pipelines,
+    # and by offloading this pipeline's idle components
+    reclaimable_bytes: int = 0
+    offloadable_bytes: int = 0
+    can_offload: bool = True
+
+
+@dataclass
+class MemoryPlan:
+    attention_slicing: bool = False
+    vae_slicing: bool = False
+    vae_tiling: bool = False
+    demote_others: bool = False
+    cpu_offload: bool = False
+    batches: list[int] = field(default_factory=lambda: [1])
+    estimated_bytes: int = 0
+    available_bytes: int = 0
+    fits: bool = True
+
+    @property
+    def optimizations(self) -> list[str]:
+        names = ("attention_slicing", "vae_slicing", "vae_tiling", "demote_others", "cpu_offload")
+        return [name for name in names if getattr(self, name)]
+
+    def to_dict(self) -> dict:
+        mb = 1024 * 1024
+        return {
+            "optimizations": self.optimizations,
+            "batches": list(self.batches),
+            "estimated_mb": self.estimated_bytes // mb,
+            "available_mb": self.available_bytes // mb,
+            "fits": self.fits,
+        }
+
+
+def _split(batch_size: int, per_batch: int) -> list[int]:
+    full, rest = divmod(batch_size, per_batch)
+    return [per_batch] * full + ([rest] if rest else [])
+
+
+def estimate_peak_bytes(
+    model: ModelMemory, width: int, height: int, plan: MemoryPlan, guided: bool = True
+) -> int:
+    """Peak activation bytes of the UNet loop or the VAE decode, whichever is larger."""
+    cost = ARCHITECTURE_COSTS.get(model.architecture, DEFAULT_COST)
+    batch = max(plan.batches)
+    rows = batch * (2 if guided else 1)
+    latent_pixels = (width // LATENT_SCALE) * (height // LATENT_SCALE)
+
+    unet = rows * latent_pixels * cost.unet_per_latent_pixel
+    if not model.sdpa:
+        tokens = latent_pixels // cost.attention_downscale**2
+        # Sliced attention computes half the heads of one row at a time
+        matrices = rows * cost.attention_heads
+        if plan.attention_slicing:
+            matrices = max(cost.attention_heads // 2, 1)
+        unet += matrices * tokens * tokens
+    unet_bytes = unet * model.dtype_bytes
+
+    images = 1 if plan.vae_slicing else batch
+    pixels = width * height
+    if plan.vae_tiling:
+        pixels = min(pixels, model.vae_tile_size**2)
+    vae = images * pixels * VAE_PER_PIXEL
+    if not model.sdpa:
+        # Single-head attention in the VAE's mid block, at latent resolution
+        tokens = pixels // LATENT_SCALE**2
+        vae += images * tokens * tokens
+    vae_bytes = vae * model.vae_dtype_bytes
+
+    return max(unet_bytes, vae_bytes)
+
+
+def _candidates(pixels: int, batch_size: int, model: ModelMemory, base: MemoryPlan):
+    """Plans in order of increasing cost to speed, skipping measures that can't help."""
+    plan = replace(base, batches=[batch_size])
+    yield plan
+    if batch_size > 1:
+        plan = replace(plan, vae_slicing=True)
+        yield plan
+    if pixels > model.vae_tile_size**2:
+        plan = replace(plan, vae_tiling=True)
+        yield plan
+    if not model.sdpa:
+        plan = replace(plan, attention_slicing=True)
+        yield plan
+    if model.reclaimable_bytes > 0:
+        plan = replace(plan, demote_others=True)
+        yield plan
+    for per_batch in range(batch_size - 1, 0, -1):
+        plan = replace(plan, batches=_split(batch_size, per_batch))
+        yield plan
+    if model.can_offload:
+        yield replace(plan, cpu_offload=True)
+
+
+def plan_job(
+    model: ModelMemory,
+    width: int,
+    height: int,
+    batch_size: int,
+    available_bytes: int,
+    guided: bool = True,
+    forced: MemoryPlan | None = None,
+) -> MemoryPlan:
+    """Cheapest plan whose estimated peak fits in ``available_bytes``.
+
+    ``forced`` carries optimizations that are always on (from config). If
+    nothing fits, the most conservative plan is returned with ``fits=False``.
+    """
+    for plan in _candidates(width * height, batch_size, model, forced or MemoryPlan()):
+        available = available_bytes
+        if plan.demote_others:
+            available += model.reclaimable_bytes
+        if plan.cpu_offload:
+            available += model.offloadable_bytes
+        estimated = estimate_peak_bytes(model, width, height, plan, guided)
+        plan = replace(plan, estimated_bytes=estimated, available_bytes=available)
+        if estimated <= available:
+            return plan
+    return replace(plan, fits=False)
@@ -0,0 +1,165 @@
+"""Resident pipeline cache for the diffusers backend.
+
+Keeps several loaded pipelines alive across two tiers — the accelerator
+("device") and CPU RAM — each with its own byte budget and LRU order. When
+the device tier is over budget its least-recently-used pipeline is demoted
+to CPU RAM rather than dropped; when the CPU tier is over budget its LRU
+pipeline is evicted for good. Switching back to a cached model is then a
+device transfer instead of a disk load.
+
+The cache knows nothing about torch: moving a pipeline between tiers and
+reclaiming memory after an eviction are injected callables, so the policy
+can be tested on its own.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger("forge.backends.diffusers.cache")
+
+DEVICE = "device"
+CPU = "cpu"
+
+
+@dataclass
+class CachedPipeline:
+    key: str
+    pipe: Any
+    size_bytes: int
+    tier: str
+
+
+class PipelineCache:
+    """LRU cache of pipelines over a device tier and a CPU RAM tier."""
+
+    def __init__(
+        self,
+        device_budget_bytes: int,
+        cpu_budget_bytes: int,
+        to_device: Callable[[Any], Any],
+        to_cpu: Callable[[Any], Any],
+        on_evict: Callable[[str], None] | None = None,
+    ) -> None:
+        self._budgets = {DEVICE: device_budget_bytes, CPU: cpu_budget_bytes}
+        self._to_device = to_device
+        self._to_cpu = to_cpu
+        self._on_evict = on_evict
+        # Most recently used last
+        self._tiers: dict[str, OrderedDict[str, CachedPipeline]] = {
+            DEVICE: OrderedDict(),
+            CPU: OrderedDict(),
+        }
+        # Loads mutate the cache in a worker thread; health checks read this
+        # snapshot from the event loop instead of iterating the live tiers.
+        self._stats: list[dict[str, Any]] = []
+
+    def __contains__(self, key: str) -> bool:
+        return any(key in entries for entries in self._tiers.values())
+
+    def used_bytes(self, tier: str) -> int:
+        return sum(e.size_bytes for e in self._tiers[tier].values())
+
+    def pipelines(self, tier: str) -> list[Any]:
+        return [e.pipe for e in self._tiers[tier].values()]
+
+    def tier_of(self, key: str) -> str | None:
+        for tier, entries in self._tiers.items():
+            if key in entries:
+                return tier
+        return None
+
+    def get(self, key: str) -> Any | None:
+        """Return the pipeline on the device, promoting it from CPU RAM if needed."""
+        device = self._tiers[DEVICE]
+        if key in device:
+            device.move_to_end(key)
+            self._snapshot()
+            return device[key].pipe
+        entry = self._tiers[CPU].pop(key, None)
+        if entry is None:
+            return None
+        self._make_room(entry.size_bytes)
+        logger.info("Promoting cached pipeline %s to the device", key)
+        entry.pipe = self._to_device(entry.pipe)
+        entry.tier = DEVICE
+        device[key] = entry
+        self._snapshot()
+        return entry.pipe
+
+    def put(self, key: str, pipe: Any, size_bytes: int) -> Any:
+        """Cache a freshly loaded (CPU-resident) pipeline and move it to the device."""
+        self.remove(key)
+        self._make_room(size_bytes)
+        pipe = self._to_device(pipe)
+        self._tiers[DEVICE][key] = CachedPipeline(key, pipe, size_bytes, DEVICE)
+        self._snapshot()
+        return pipe
+
+    def demote_others(self, key: str) -> int:
+        """Demote every device-resident pipeline except ``key``; returns the bytes moved."""
+        device = self._tiers[DEVICE]
+        moved = 0
+        for other in [k for k in device if k != key]:
+            entry = device.pop(other)
+            moved += entry.size_bytes
+            self._demote(entry)
+        self._snapshot()
+        return moved
+
+    def remove(self, key: str) -> None:
+        for entries in self._tiers.values():
+            entry = entries.pop(key, None)
+            if entry is not None:
+                self._drop(entry)
+        self._snapshot()
+
+    def clear(self) -> None:
+        for entries in self._tiers.values():
+            while entries:
+                _, entry = entries.popitem(last=False)
+                self._drop(entry)
+        self._snapshot()
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Cached pipelines, most recently used first within each tier."""
+        return list(self._stats)
+
+    def _snapshot(self) -> None:
+        self._stats = [
+            {"model_id": e.key, "tier": e.tier, "size_bytes": e.size_bytes}
+            for tier in (DEVICE, CPU)
+            for e in reversed(self._tiers[tier].values())
+        ]
+
+    def _make_room(self, size_bytes: int) -> None:
+        device = self._tiers[DEVICE]
+        # The incoming pipeline always gets the device, even if it alone
+        # exceeds the budget — everything else is demoted first.
+        while device and self.used_bytes(DEVICE) + size_bytes > self._budgets[DEVICE]:
+            _, entry = device.popitem(last=False)
+            self._demote(entry)
+
+    def _demote(self, entry: CachedPipeline) -> None:
+        cpu = self._tiers[CPU]
+        if entry.size_bytes > self._budgets[CPU]:
+            self._drop(entry)
+            return
+        while cpu and self.used_bytes(CPU) + entry.size_bytes > self._budgets[CPU]:
+            _, evicted = cpu.popitem(last=False)
+            self._drop(evicted)
+        logger.info("Demoting cached pipeline %s to CPU RAM", entry.key)
+        entry.pipe = self._to_cpu(entry.pipe)
+        entry.tier = CPU
+        cpu[entry.key] = entry
+
+    def _drop(self, entry: CachedPipeline) -> None:
+        logger.info("Evicting cached pipeline %s", entry.key)
+        entry.pipe = None
+        # Called once the cache holds no reference, so memory can be reclaimed
+        if self._on_evict:
+            self._on_evict(entry.key)
@@ -0,0 +1,90 @@
+"""Weight quantization modes and their measured effect.
+
+``gpu.quantization`` selects how the denoiser (and, unless disabled, the
+text encoders) are stored once loaded:
+
+- ``int8_dynamic``: PyTorch dynamic quantization of ``Linear`` layers —
+  int8 weights, activations quantized on the fly. CPU only.
+- ``int8`` / ``int4``: weight-only quantization with optimum-quanto; weights
+  are dequantized per layer at compute time, on any device.
+
+GGUF checkpoints carry their own quantization; only their text encoders
+are subject to the configured mode.
+
+Every loaded pipeline gets a ``QuantizationReport`` with the weight bytes
+before and after quantization and the denoising speed measured on real
+jobs, so the modes can be compared on the actual hardware.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger("forge.backends.diffusers.quantization")
+
+NONE = "none"
+INT8_DYNAMIC = "int8_dynamic"
+INT8 = "int8"
+INT4 = "int4"
+QUANTIZATION_MODES = (NONE, INT8_DYNAMIC, INT8, INT4)
+
+DENOISER_COMPONENTS = ("unet", "transformer")
+TEXT_ENCODER_COMPONENTS = ("text_encoder", "text_encoder_2")
+
+
+def quantization_targets(
+    mode: str,
+    device: str,
+    text_encoders: bool = True,
+    skip: tuple[str, ...] | list[str] = (),
+) -> tuple[str, list[str]]:
+    """The effective mode on ``device`` and the pipeline components it applies to.
+
+    Components in ``skip`` (already quantized, e.g. a GGUF denoiser) are left
+    alone.
+    """
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization mode: {mode}")
+    if mode == INT8_DYNAMIC and device != "cpu":
+        logger.warning("int8_dynamic quantization only runs on CPU; not quantizing on %s", device)
+        mode = NONE
+    if mode == NONE:
+        return NONE, []
+    names = [*DENOISER_COMPONENTS, *(TEXT_ENCODER_COMPONENTS if text_encoders else ())]
+    return mode, [name for name in names if name not in skip]
+
+
+@dataclass
+class QuantizationReport:
+    """Measured memory and speed of one loaded pipeline."""
+
+    mode: str
+    components: list[str] = field(default_factory=list)
+    weight_bytes_before: int = 0
+    weight_bytes_after: int = 0
+    quantize_seconds: float = 0.0
+    steps: int = 0
+    denoise_seconds: float = 0.0
+
+    def record(self, steps: int, seconds: float) -> None:
+        """Add a finished denoising run to the speed measurement."""
+        self.steps += steps
+        self.denoise_seconds += seconds
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.steps / self.denoise_seconds if self.denoise_seconds > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        mb = 1024 * 1024
+        return {
+            "mode": self.mode,
+            "components": list(self.components),
+            "weights_mb_before": round(self.weight_bytes_before / mb, 1),
+            "weights_mb": round(self.weight_bytes_after / mb, 1),
+            "quantize_seconds": round(self.quantize_seconds, 2),
+            "steps_per_second": round(self.steps_per_second, 3),
+            "measured_steps": self.steps,
+        }
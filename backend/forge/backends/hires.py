@@ -0,0 +1,41 @@
+"""Two-pass high-resolution generation ("hires fix").
+
+Generating far above a model's training resolution is slow, since
+attention cost grows with the square of the pixel count, and it breaks
+composition: the model repeats subjects it never saw at that scale. A
+hires job instead generates at about the model's native pixel count,
+upscales the result (in latent space, or in pixel space with Lanczos) and
+runs a short img2img pass at the requested size that adds detail without
+changing the composition.
+
+The sizing rules are plain arithmetic shared by the backends.
+"""
+
+from __future__ import annotations
+
+import math
+
+from forge.schemas.generation import HiresFix
+
+LATENT = "latent"
+LANCZOS = "lanczos"
+
+
+def first_pass_size(width: int, height: int, native: int) -> tuple[int, int]:
+    """The target's aspect ratio at no more than ``native``² pixels, in multiples of 8."""
+    scale = min(1.0, math.sqrt(native * native / (width * height)))
+    return (max(64, int(width * scale) // 8 * 8), max(64, int(height * scale) // 8 * 8))
+
+
+def refine_steps(hires: HiresFix, steps: int) -> int:
+    """Denoising steps the second pass runs."""
+    return hires.steps or max(1, int(steps * hires.denoise))
+
+
+def refine_schedule(hires: HiresFix, steps: int) -> int:
+    """Schedule length whose last ``denoise`` fraction is ``refine_steps`` long.
+
+    img2img skips the first ``1 - strength`` of the schedule, so it has to
+    be stretched for the requested number of steps to actually run.
+    """
+    return math.ceil(refine_steps(hires, steps) / hires.denoise)
@@ -0,0 +1,101 @@
+"""Mask-bounded inpainting: denoise only the region around the mask.
+
+Inpainting a small area of a large image through the full canvas spends
+nearly all of the UNet's work on pixels that are thrown away. Instead, the
+mask's bounding box, padded for context, is cropped out. Boxes smaller than
+the model's native pixel count are scaled up to about it, which also adds
+detail; larger ones are denoised at their own size, never below it. The
+crop is inpainted, scaled back, and pasted through a feathered mask, so
+only the masked pixels change. Only inpaint jobs are cropped: outpainting
+needs the whole canvas for context.
+
+Plain Pillow and NumPy; backends run the inpainting itself.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+from forge.backends.sources import SourceImages
+
+# Mask values above this count as masked (ignores faint antialiasing)
+MASK_THRESHOLD = 16
+# Crops denoised at more than this share of the canvas' pixels aren't worth it
+MAX_CROP_FRACTION = 0.75
+FEATHER = 8  # blur radius of the paste-back mask, in canvas pixels
+
+
+@dataclass(frozen=True)
+class InpaintCrop:
+    box: tuple[int, int, int, int]  # left, top, right, bottom on the canvas
+    size: tuple[int, int]  # size the crop is denoised at
+    canvas: tuple[int, int]
+
+    @property
+    def pixel_fraction(self) -> float:
+        """Denoised pixels relative to inpainting the whole canvas."""
+        return self.size[0] * self.size[1] / (self.canvas[0] * self.canvas[1])
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "box": list(self.box),
+            "size": list(self.size),
+            "pixel_fraction": round(self.pixel_fraction, 4),
+            "compute_saved": round(1 - self.pixel_fraction, 4),
+        }
+
+
+def mask_box(mask: Image.Image, padding: int) -> tuple[int, int, int, int] | None:
+    """Bounding box of the masked pixels plus ``padding``, clamped to the canvas."""
+    masked = np.asarray(mask.convert("L")) > MASK_THRESHOLD
+    rows = np.flatnonzero(masked.any(axis=1))
+    cols = np.flatnonzero(masked.any(axis=0))
+    if not rows.size:
+        return None
+    return (
+        max(int(cols[0]) - padding, 0),
+        max(int(rows[0]) - padding, 0),
+        min(int(cols[-1]) + 1 + padding, mask.width),
+        min(int(rows[-1]) + 1 + padding, mask.height),
+    )
+
+
+def native_size(width: int, height: int, native: int) -> tuple[int, int]:
+    """``width`` x ``height`` scaled, up or down, to about ``native``² pixels in multiples of 8."""
+    scale = math.sqrt(native * native / (width * height))
+    return (max(64, int(width * scale) // 8 * 8), max(64, int(height * scale) // 8 * 8))
+
+
+def plan_crop(mask: Image.Image, native: int, padding: int) -> InpaintCrop | None:
+    """The crop to inpaint, or None when the whole canvas is as cheap."""
+    box = mask_box(mask, padding)
+    if box is None:
+        return None
+    width, height = box[2] - box[0], box[3] - box[1]
+    if width * height < native * native:
+        size = native_size(width, height, native)
+    else:
+        size = (-(-width // 8) * 8, -(-height // 8) * 8)
+    crop = InpaintCrop(box, size, mask.size)
+    return crop if crop.pixel_fraction <= MAX_CROP_FRACTION else None
+
+
+def crop_sources(sources: SourceImages, crop: InpaintCrop) -> SourceImages:
+    image = sources.image.crop(crop.box).resize(crop.size, Image.Resampling.LANCZOS)
+    mask = sources.mask.crop(crop.box).resize(crop.size, Image.Resampling.BILINEAR)
+    return SourceImages(image, mask)
+
+
+def paste_crop(sources: SourceImages, patch: Image.Image, crop: InpaintCrop) -> Image.Image:
+    """Scale an inpainted crop back and blend it into the full source."""
+    left, top, right, bottom = crop.box
+    patch = patch.convert("RGB").resize((right - left, bottom - top), Image.Resampling.LANCZOS)
+    alpha = sources.mask.crop(crop.box).filter(ImageFilter.GaussianBlur(FEATHER))
+    result = sources.image.copy()
+    result.paste(patch, (left, top), alpha)
+    return result
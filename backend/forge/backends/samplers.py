@@ -0,0 +1,122 @@
+"""Sampler registry shared by the API and the backends.
+
+Each sampler names the diffusers scheduler class that implements it, the
+config overrides that distinguish it from its siblings (Karras sigmas, SDE
+noise, solver order) and the step/CFG ranges where it reaches full quality.
+Multistep solvers such as UniPC and DPM++ converge in 8–20 steps where
+Euler needs 25–30; LCM and TCD get down to 4–8 steps but only on distilled
+models (or with an LCM/TCD LoRA), at low guidance.
+
+The registry is plain data, so request validation and ``GET /samplers``
+don't need diffusers installed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class Sampler:
+    name: str
+    label: str
+    scheduler: str  # diffusers scheduler class name
+    steps: tuple[int, int]  # recommended step range
+    cfg: tuple[float, float] = (5.0, 8.0)  # recommended CFG scale range
+    config: dict[str, Any] = field(default_factory=dict)
+    distilled: bool = False  # only for LCM/TCD-distilled models or LoRAs
+    description: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "label": self.label,
+            "recommended_steps": list(self.steps),
+            "recommended_cfg": list(self.cfg),
+            "distilled": self.distilled,
+            "description": self.description,
+        }
+
+
+SAMPLERS: dict[str, Sampler] = {
+    s.name: s
+    for s in (
+        Sampler(
+            "euler_a",
+            "Euler Ancestral",
+            "EulerAncestralDiscreteScheduler",
+            (20, 30),
+            description="Adds fresh noise every step; varied results, doesn't converge.",
+        ),
+        Sampler("euler", "Euler", "EulerDiscreteScheduler", (20, 30)),
+        Sampler("ddim", "DDIM", "DDIMScheduler", (20, 50), config={"set_alpha_to_one": False}),
+        Sampler("dpm++_2m", "DPM++ 2M", "DPMSolverMultistepScheduler", (15, 25)),
+        Sampler(
+            "dpm++_2m_karras",
+            "DPM++ 2M Karras",
+            "DPMSolverMultistepScheduler",
+            (12, 20),
+            config={"use_karras_sigmas": True},
+            description="Good default for quality in few steps.",
+        ),
+        Sampler(
+            "dpm++_2m_sde_karras",
+            "DPM++ 2M SDE Karras",
+            "DPMSolverMultistepScheduler",
+            (15, 25),
+            config={"algorithm_type": "sde-dpmsolver++", "use_karras_sigmas": True},
+        ),
+        Sampler(
+            "dpm++_3m_karras",
+            "DPM++ 3M Karras",
+            "DPMSolverMultistepScheduler",
+            (12, 20),
+            config={"solver_order": 3, "use_karras_sigmas": True},
+        ),
+        Sampler(
+            "dpm++_sde_karras",
+            "DPM++ SDE Karras",
+            "DPMSolverSDEScheduler",
+            (10, 20),
+            config={"use_karras_sigmas": True},
+            description="Two model evaluations per step; needs the torchsde package.",
+        ),
+        Sampler(
+            "unipc",
+            "UniPC",
+            "UniPCMultistepScheduler",
+            (8, 15),
+            description="Fastest convergence for regular models.",
+        ),
+        Sampler(
+            "lcm",
+            "LCM",
+            "LCMScheduler",
+            (4, 8),
+            cfg=(1.0, 2.0),
+            distilled=True,
+            description="For LCM-distilled models or with an LCM LoRA.",
+        ),
+        Sampler(
+            "tcd",
+            "TCD",
+            "TCDScheduler",
+            (4, 8),
+            cfg=(1.0, 2.0),
+            distilled=True,
+            description="For TCD-distilled models or with a TCD LoRA.",
+        ),
+    )
+}
+
+# Names accepted for compatibility
+ALIASES = {"euler_ancestral": "euler_a"}
+
+
+def resolve_sampler(name: str) -> Sampler:
+    """Look up a sampler by name or alias; raises ``ValueError`` if unknown."""
+    sampler = SAMPLERS.get(ALIASES.get(name, name))
+    if sampler is None:
+        raise ValueError(f"Unknown sampler {name!r}; available: {', '.join(SAMPLERS)}")
+    return sampler
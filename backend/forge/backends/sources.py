@@ -0,0 +1,95 @@
+"""Source images for img2img, inpaint and outpaint jobs.
+
+Turns a job's uploaded source (and mask) into the image and mask a
+pipeline takes at the job's size. img2img and inpaint resize the source to
+``width`` x ``height``. Outpaint fits the source inside that canvas,
+centered, and masks the border around it for the model to fill; the mask
+reaches a few pixels into the source so the seam gets repainted too.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from forge.schemas.generation import GenerateRequest, GenerationMode
+from forge.storage.uploads import load_upload
+
+OUTPAINT_OVERLAP = 8
+
+
+@dataclass
+class SourceImages:
+    image: Image.Image
+    mask: Image.Image | None = None  # "L"; white = repaint
+
+    @property
+    def inpaint(self) -> bool:
+        return self.mask is not None
+
+    def inpaint_kwargs(self) -> dict[str, Any]:
+        """The mask and size an inpainting pipeline call takes; empty for img2img.
+
+        The size is passed explicitly: inpainting pipelines otherwise resize
+        image and mask to the model's default square.
+        """
+        if not self.inpaint:
+            return {}
+        return {"mask_image": self.mask, "width": self.image.width, "height": self.image.height}
+
+
+def edit_strength(params: GenerateRequest) -> float:
+    # The outpaint border has nothing worth keeping
+    return 1.0 if params.mode == GenerationMode.OUTPAINT else params.strength
+
+
+def edit_steps(params: GenerateRequest) -> int:
+    """Denoising steps an img2img-style pass runs: the tail ``strength`` of the schedule."""
+    return max(1, int(params.steps * edit_strength(params)))
+
+
+def prepare_sources(params: GenerateRequest, uploads_dir: Path) -> SourceImages:
+    size = (params.width, params.height)
+    source = load_upload(uploads_dir, params.source_image)
+    if params.mode == GenerationMode.OUTPAINT:
+        return outpaint_canvas(source, size)
+    if source.size != size:
+        source = source.resize(size, Image.Resampling.LANCZOS)
+    if params.mode != GenerationMode.INPAINT:
+        return SourceImages(source)
+    mask = load_upload(uploads_dir, params.mask_image, "L")
+    if mask.size != size:
+        mask = mask.resize(size, Image.Resampling.BILINEAR)
+    return SourceImages(source, mask)
+
+
+def outpaint_canvas(source: Image.Image, size: tuple[int, int]) -> SourceImages:
+    """Center ``source`` on a ``size`` canvas, shrinking it if it doesn't fit."""
+    width, height = size
+    scale = min(1.0, width / source.width, height / source.height)
+    if scale < 1:
+        source = source.resize(
+            (max(1, int(source.width * scale)), max(1, int(source.height * scale))),
+            Image.Resampling.LANCZOS,
+        )
+    left, top = (width - source.width) // 2, (height - source.height) // 2
+    # The source stretched and blurred over the border is a better start than flat grey
+    canvas = source.resize(size, Image.Resampling.BILINEAR).filter(
+        ImageFilter.GaussianBlur(max(size) // 32)
+    )
+    canvas.paste(source, (left, top))
+
+    mask = Image.new("L", size, 255)
+    # Overlap only the edges that border new canvas
+    keep = (
+        left + (OUTPAINT_OVERLAP if left else 0),
+        top + (OUTPAINT_OVERLAP if top else 0),
+        left + source.width - (OUTPAINT_OVERLAP if left + source.width < width else 0),
+        top + source.height - (OUTPAINT_OVERLAP if top + source.height < height else 0),
+    )
+    if keep[0] < keep[2] and keep[1] < keep[3]:
+        ImageDraw.Draw(mask).rectangle((keep[0], keep[1], keep[2] - 1, keep[3] - 1), fill=0)
+    return SourceImages(canvas, mask)
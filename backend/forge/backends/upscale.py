@@ -0,0 +1,166 @@
+"""Tiled upscaling: run an upscaler model over overlapping tiles of an image.
+
+Upscaler models (ESRGAN and the like) are fully convolutional, so a large
+image can go through them a tile at a time. Tiles overlap, and each is
+blended in with weights that ramp linearly across its overlaps, which hides
+the seams where a tile's border pixels saw less context than its middle.
+
+Tiles are processed a row at a time, in batches, with the batches of a row
+running concurrently on a thread pool. Output rows are accumulated in
+float only while a later tile row can still reach them; finished rows go
+straight into the 8-bit output image. Working memory so depends on the
+tile size and image width, not on the output's height.
+
+Plain NumPy and Pillow; backends supply the model as a function from a
+batch of tiles to the upscaled batch.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from forge.schemas.generation import GenerateRequest
+from forge.storage.uploads import load_upload
+
+# (n, h, w, 3) float32 in [0, 1] -> (n, h * scale, w * scale, 3)
+UpscaleFn = Callable[[np.ndarray], np.ndarray]
+
+TILE_BATCH = 4  # tiles per model call
+MAX_OUTPUT_SIDE = 8192
+
+
+def output_size(size: tuple[int, int], scale: float) -> tuple[int, int]:
+    width, height = round(size[0] * scale), round(size[1] * scale)
+    if max(width, height) > MAX_OUTPUT_SIDE:
+        raise ValueError(
+            f"Upscaling {size[0]}x{size[1]} by {scale:g} exceeds {MAX_OUTPUT_SIDE}px per side"
+        )
+    return width, height
+
+
+def tile_starts(length: int, tile: int, overlap: int) -> list[int]:
+    """Evenly spaced tile offsets along an axis, overlapping by at least ``overlap``."""
+    if length <= tile:
+        return [0]
+    count = math.ceil((length - overlap) / (tile - overlap))
+    return [round(i * (length - tile) / (count - 1)) for i in range(count)]
+
+
+def axis_weights(starts: list[int], tile: int, scale: int) -> list[np.ndarray]:
+    """Each tile's blend weights along one axis, in output pixels.
+
+    Weights ramp from 0 to 1 across the overlap with the previous tile and
+    back down across the overlap with the next; outer image edges stay 1.
+    """
+    weights = []
+    for i, start in enumerate(starts):
+        weight = np.ones(tile * scale, np.float32)
+        if i > 0 and (ramp := (starts[i - 1] + tile - start) * scale) > 0:
+            weight[:ramp] = (np.arange(ramp) + 0.5) / ramp
+        if i < len(starts) - 1 and (ramp := (start + tile - starts[i + 1]) * scale) > 0:
+            weight[-ramp:] = np.minimum(weight[-ramp:], (np.arange(ramp)[::-1] + 0.5) / ramp)
+        weights.append(weight)
+    return weights
+
+
+def upscale_tiled(
+    image: Image.Image,
+    upscale: UpscaleFn,
+    scale: int,
+    tile: int = 512,
+    overlap: int = 32,
+    batch: int = TILE_BATCH,
+    workers: int = 1,
+    progress: Callable[[int, int], None] | None = None,
+) -> Image.Image:
+    """Upscale ``image`` by the model's ``scale``, one overlapping tile at a time."""
+    src = np.asarray(image.convert("RGB"))
+    height, width = src.shape[:2]
+    tile_w, tile_h = min(tile, width), min(tile, height)
+    overlap = min(overlap, tile // 2)
+    xs, ys = tile_starts(width, tile_w, overlap), tile_starts(height, tile_h, overlap)
+    col_weights, row_weights = axis_weights(xs, tile_w, scale), axis_weights(ys, tile_h, scale)
+    out_w, out_tile_w, out_tile_h = width * scale, tile_w * scale, tile_h * scale
+
+    out = np.empty((height * scale, out_w, 3), np.uint8)
+    # Weighted sums for output rows [top, top + len(acc)) that tiles may still add to
+    top = 0
+    acc = np.zeros((0, out_w, 3), np.float32)
+    norm = np.zeros((0, out_w, 1), np.float32)
+    done, total = 0, len(xs) * len(ys)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for row, y in enumerate(ys):
+            tiles = np.stack([src[y : y + tile_h, x : x + tile_w] for x in xs])
+            tiles = tiles.astype(np.float32) / 255
+            batches = [tiles[i : i + batch] for i in range(0, len(xs), batch)]
+            upscaled: list[np.ndarray] = []
+            for result in pool.map(upscale, batches):
+                if result.shape[1:3] != (out_tile_h, out_tile_w):
+                    raise ValueError(
+                        f"Upscaler returned {result.shape[2]}x{result.shape[1]} tiles, "
+                        f"expected {out_tile_w}x{out_tile_h} (x{scale})"
+                    )
+                upscaled.extend(result)
+                done += len(result)
+                if progress is not None:
+                    progress(done, total)
+
+            bottom = (y + tile_h) * scale
+            if bottom > top + len(acc):
+                grow = bottom - top - len(acc)
+                acc = np.concatenate([acc, np.zeros((grow, out_w, 3), np.float32)])
+                norm = np.concatenate([norm, np.zeros((grow, out_w, 1), np.float32)])
+            y0 = y * scale - top
+            for x, col_weight, tile_out in zip(xs, col_weights, upscaled, strict=True):
+                weight = (row_weights[row][:, None] * col_weight[None, :])[..., None]
+                region = np.s_[y0 : y0 + out_tile_h, x * scale : x * scale + out_tile_w]
+                acc[region] += tile_out * weight
+                norm[region] += weight
+
+            # Rows above the next tile row are complete
+            final = (ys[row + 1] * scale if row + 1 < len(ys) else bottom) - top
+            blended = acc[:final] / norm[:final]
+            out[top : top + final] = np.clip(np.rint(blended * 255), 0, 255).astype(np.uint8)
+            acc, norm = acc[final:], norm[final:]
+            top += final
+
+    return Image.fromarray(out)
+
+
+def run_upscale(
+    params: GenerateRequest,
+    uploads_dir: Path,
+    upscale: UpscaleFn | None,
+    model_scale: int = 1,
+    workers: int = 1,
+    progress: Callable[[int, int], None] | None = None,
+) -> Image.Image:
+    """Upscale a job's source with ``upscale``, or with Lanczos when there's no model.
+
+    Models upscale by a fixed factor; other factors are reached by
+    resampling their output.
+    """
+    options = params.upscale
+    source = load_upload(uploads_dir, params.source_image)
+    target = output_size(source.size, options.scale)
+    if upscale is None:
+        return source.resize(target, Image.Resampling.LANCZOS)
+    image = upscale_tiled(
+        source,
+        upscale,
+        model_scale,
+        tile=options.tile_size,
+        overlap=options.tile_overlap,
+        workers=workers,
+        progress=progress,
+    )
+    if image.size != target:
+        image = image.resize(target, Image.Resampling.LANCZOS)
+    return image
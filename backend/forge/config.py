@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import yaml
 from pydantic import BaseModel, Field
@@ -23,6 +23,7 @@ def _find_config_file() -> Path | None:
 class ServerConfig(BaseModel):
     host: str = "0.0.0.0"
     port: int = 7860
+    max_upload_mb: int = 64  # largest source/mask image accepted by POST /api/uploads
 
 
 class PathsConfig(BaseModel):
@@ -30,6 +31,8 @@ class PathsConfig(BaseModel):
     models_dir: Path | None = None
     outputs_dir: Path | None = None
     db_path: Path | None = None
+    cache_dir: Path | None = None
+    uploads_dir: Path | None = None
 
     @property
     def resolved_base(self) -> Path:
@@ -53,13 +56,91 @@ class PathsConfig(BaseModel):
             return self.db_path
         return self.resolved_base / (self.db_path or "forge.db")
 
+    @property
+    def resolved_cache(self) -> Path:
+        if self.cache_dir and self.cache_dir.is_absolute():
+            return self.cache_dir
+        return self.resolved_base / (self.cache_dir or "cache")
+
+    @property
+    def resolved_uploads(self) -> Path:
+        if self.uploads_dir and self.uploads_dir.is_absolute():
+            return self.uploads_dir
+        return self.resolved_base / (self.uploads_dir or "uploads")
+
+
+class DatabaseConfig(BaseModel):
+    journal_mode: str = "wal"
+    synchronous: str = "normal"
+    mmap_size_mb: int = 256
+    cache_size_mb: int = 64
+    busy_timeout_ms: int = 5000
+    read_pool_size: int = 4
+    write_flush_interval_ms: int = 50
+    write_batch_size: int = 64
+
+
+class ModelsConfig(BaseModel):
+    watch: str = "auto"  # auto | watch | poll | off
+    poll_interval_seconds: float = 10.0
+    hashing: bool = True
+    hash_max_mb_per_sec: float = 256.0  # 0 = unthrottled
+    # Read checkpoints of upcoming queued jobs into the page cache while the
+    # current job runs. Either set to 0 disables prefetching.
+    prefetch_lookahead: int = 3
+    prefetch_max_mb: int = 16384
+    # Single-file checkpoints are saved in diffusers layout after their first
+    # load so later loads skip conversion. 0 disables the cache.
+    conversion_cache_max_mb: int = 32768
+
 
 class GPUConfig(BaseModel):
     device: str = "cuda"
     half_precision: bool = True
+    # Always-on memory savers. With memory_planner on, each job also gets
+    # whichever of these (plus VAE slicing, demoting other cached models and
+    # batch splitting) its estimated peak memory needs, and only for that job.
     cpu_offload: bool = False
     attention_slicing: bool = False
-    vae_tiling: bool = True
+    vae_tiling: bool = False
+    memory_planner: bool = True
+    memory_reserve_mb: int = 512  # kept free for the allocator and other processes
+    # Loaded pipelines are kept resident: over the VRAM budget the least
+    # recently used one is moved to RAM, over the RAM budget it's dropped.
+    model_cache_vram_mb: int = 0  # 0 = 80% of device memory
+    model_cache_ram_mb: int = 16384
+    # LoRA adapters stay loaded per pipeline and are switched per job; a
+    # combination used this many times is fused into the weights (0 = never).
+    lora_max_loaded: int = 8
+    lora_fuse_after: int = 0
+    # Weight quantization of the denoiser and text encoders: int8_dynamic is
+    # CPU only; int8/int4 are weight-only (needs optimum-quanto).
+    quantization: Literal["none", "int8_dynamic", "int8", "int4"] = "none"
+    quantize_text_encoders: bool = True
+    # torch.compile the UNet and VAE decoder, warmed up in the background after
+    # each load for these [width, height] sizes ([] = the model's native size).
+    # Compiled artifacts are cached under paths.cache_dir across restarts.
+    compile: bool = False
+    compile_mode: str = "default"
+    compile_sizes: list[tuple[int, int]] = Field(default_factory=list)
+    # VAE latents of img2img sources and generated images, cached by pixel
+    # content in RAM and spilled to paths.cache_dir (0 = tier off).
+    latent_cache_ram_mb: int = 256
+    latent_cache_disk_mb: int = 2048
+
+
+class CPUConfig(BaseModel):
+    # Tuning applied when the diffusers backend runs on CPU.
+    # bf16 autocast: "auto" enables it when the CPU has native bf16 (AVX512-BF16/AMX)
+    bf16: Literal["auto", "on", "off"] = "auto"
+    channels_last: bool = True
+    sdpa: bool = True
+    intra_op_threads: int = 0  # 0 = physical cores available to this process
+    inter_op_threads: int = 0  # 0 = PyTorch default
+    # Pin this worker to a CPU list like "0-15" or "0-7,32-39" ("" = no pinning)
+    affinity: str = ""
+    # Tile batches an upscale job runs at once (the GPU always runs one)
+    upscale_workers: int = 2
 
 
 class GenerationConfig(BaseModel):
@@ -73,6 +154,11 @@ class GenerationConfig(BaseModel):
     max_batch_size: int = 4
 
 
+class GalleryConfig(BaseModel):
+    similarity_index: bool = True
+    embeddings: bool = False
+
+
 class ComfyUIConfig(BaseModel):
     url: str = "http://localhost:8188"
 
@@ -85,8 +171,12 @@ class BackendConfig(BaseModel):
 class Settings(BaseSettings):
     server: ServerConfig = Field(default_factory=ServerConfig)
     paths: PathsConfig = Field(default_factory=PathsConfig)
+    database: DatabaseConfig = Field(default_factory=DatabaseConfig)
+    models: ModelsConfig = Field(default_factory=ModelsConfig)
     gpu: GPUConfig = Field(default_factory=GPUConfig)
+    cpu: CPUConfig = Field(default_factory=CPUConfig)
     generation: GenerationConfig = Field(default_factory=GenerationConfig)
+    gallery: GalleryConfig = Field(default_factory=GalleryConfig)
     backend: BackendConfig = Field(default_factory=BackendConfig)
 
     model_config = {"env_prefix": "FORGE_", "env_nested_delimiter": "__"}
@@ -0,0 +1,237 @@
+"""Write-behind persistence for job state and generated images.
+
+The worker used to open a session per state transition and re-``SELECT`` the
+job row each time. ``JobStateWriter`` instead queues transitions in memory
+and applies them in submission order as primary-key ``UPDATE``s and bulk
+``INSERT``s, grouping everything pending into a single transaction. A batch
+is flushed when ``max_batch`` writes are pending or ``flush_interval``
+seconds after the first one arrived, whichever comes first.
+
+Every write returns a future that resolves once its transaction has been
+committed, so callers that need durability (e.g. before announcing a job as
+completed) can await it while fire-and-forget transitions stay cheap.
+
+A failed batch is retried once, then committed one write per transaction so
+a single bad write (say, a duplicate image row) fails only its own future.
+A failed non-terminal write is folded into the same job's next write in the
+batch, or requeued for the next flush, so a transient error doesn't lose a
+``running`` transition.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from forge.db.tables import GeneratedImage, Job
+
+logger = logging.getLogger("forge.persistence")
+
+TERMINAL_STATUSES = {"completed", "cancelled", "failed"}
+RETRY_DELAY = 0.1  # seconds before a failed batch is retried
+MAX_ATTEMPTS = 3  # flushes a requeued non-terminal write gets before it fails
+
+
+@dataclass
+class _PendingWrite:
+    """A queued job update, optionally with image rows to insert."""
+
+    job_id: str
+    values: dict[str, Any]
+    images: list[dict[str, Any]] = field(default_factory=list)
+    done: asyncio.Future[None] | None = None
+    attempts: int = 0
+
+    @property
+    def terminal(self) -> bool:
+        return self.values.get("status") in TERMINAL_STATUSES
+
+
+class JobStateWriter:
+    """Batches job state transitions from many jobs into grouped transactions."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        flush_interval: float = 0.05,
+        max_batch: int = 64,
+    ) -> None:
+        self._session_factory = session_factory
+        self._flush_interval = flush_interval
+        self._max_batch = max_batch
+        self._pending: list[_PendingWrite] = []
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the background flush loop."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and persist anything still pending."""
+        if self._task:
+            # Hold the flush lock so the loop is never cancelled mid-commit
+            async with self._flush_lock:
+                self._task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await self._task
+            self._task = None
+        for _ in range(MAX_ATTEMPTS):
+            await self.flush()
+            if not self._pending:
+                return
+        for write in self._pending:
+            self._fail(write, RuntimeError(f"Could not persist update of job {write.job_id}"))
+        self._pending = []
+
+    def mark_running(self, job_id: str) -> asyncio.Future[None]:
+        """Queue the queued -> running transition."""
+        return self._submit(
+            job_id, {"status": "running", "started_at": datetime.now(UTC)}
+        )
+
+    def mark_finished(
+        self,
+        job_id: str,
+        status: str,
+        images: list[dict[str, Any]],
+        image_fields: dict[str, Any],
+    ) -> asyncio.Future[None]:
+        """Queue a terminal completed/cancelled transition plus its images.
+
+        ``image_fields`` carries the job-level columns copied onto every image
+        row (prompt, model, params), so the job row never has to be re-read.
+        """
+        rows = [
+            {
+                "id": img["id"],
+                "job_id": job_id,
+                "file_path": img["file_path"],
+                "thumbnail_path": img.get("thumbnail_path", ""),
+                "width": img["width"],
+                "height": img["height"],
+                "seed": img.get("seed", -1),
+                **image_fields,
+            }
+            for img in images
+        ]
+        return self._submit(
+            job_id, {"status": status, "completed_at": datetime.now(UTC)}, rows
+        )
+
+    def mark_failed(self, job_id: str, error: str) -> asyncio.Future[None]:
+        """Queue the failed transition with its error message."""
+        return self._submit(
+            job_id,
+            {"status": "failed", "error_message": error, "completed_at": datetime.now(UTC)},
+        )
+
+    async def flush(self) -> None:
+        """Commit every pending write in one transaction, isolating bad writes on failure."""
+        async with self._flush_lock:
+            batch, self._pending = self._pending, []
+            self._full.clear()
+            if not batch:
+                return
+
+            for attempt in range(2):
+                try:
+                    await self._commit(batch)
+                except Exception:
+                    logger.warning(
+                        "Failed to persist %d job updates (attempt %d)",
+                        len(batch),
+                        attempt + 1,
+                        exc_info=True,
+                    )
+                    if attempt == 0:
+                        await asyncio.sleep(RETRY_DELAY)
+                else:
+                    for write in batch:
+                        self._resolve(write)
+                    return
+
+            # Isolate the offending writes: one transaction each, in order
+            requeue: list[_PendingWrite] = []
+            for index, write in enumerate(batch):
+                try:
+                    await self._commit([write])
+                except Exception as exc:
+                    later = next((w for w in batch[index + 1 :] if w.job_id == write.job_id), None)
+                    if write.terminal:
+                        logger.error("Failed to persist job %s: %s", write.job_id, exc)
+                        self._fail(write, exc)
+                    elif later is not None:
+                        # The job's next write carries these values along
+                        later.values = {**write.values, **later.values}
+                        self._resolve(write)
+                    else:
+                        write.attempts += 1
+                        if write.attempts < MAX_ATTEMPTS:
+                            requeue.append(write)
+                        else:
+                            logger.error("Giving up on update of job %s: %s", write.job_id, exc)
+                            self._fail(write, exc)
+                else:
+                    self._resolve(write)
+            if requeue:
+                # Ahead of anything submitted since, so the job's writes stay in order
+                self._pending[:0] = requeue
+                self._wakeup.set()
+
+    async def _commit(self, writes: list[_PendingWrite]) -> None:
+        async with self._session_factory() as session:
+            for write in writes:
+                result = await session.execute(
+                    update(Job).where(Job.id == write.job_id).values(**write.values)
+                )
+                if result.rowcount == 0:
+                    logger.error("Job %s not found in DB", write.job_id)
+                if write.images:
+                    await session.execute(insert(GeneratedImage), write.images)
+            await session.commit()
+
+    @staticmethod
+    def _resolve(write: _PendingWrite) -> None:
+        if write.done and not write.done.done():
+            write.done.set_result(None)
+
+    @staticmethod
+    def _fail(write: _PendingWrite, exc: BaseException) -> None:
+        if write.done and not write.done.done():
+            write.done.set_exception(exc)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _submit(
+        self,
+        job_id: str,
+        values: dict[str, Any],
+        images: list[dict[str, Any]] | None = None,
+    ) -> asyncio.Future[None]:
+        done: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._pending.append(_PendingWrite(job_id, values, images or [], done))
+        self._wakeup.set()
+        if len(self._pending) >= self._max_batch:
+            self._full.set()
+        return done
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # Give other jobs a chance to join the batch, unless it's already full
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._full.wait(), timeout=self._flush_interval)
+            await self.flush()
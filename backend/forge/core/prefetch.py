@@ -0,0 +1,122 @@
+"""Predictive model prefetch from the job queue.
+
+While a job is generating, the checkpoints needed by the next few queued
+jobs are read into the OS page cache on a background thread. When the
+worker reaches one of those jobs, the backend's model load (``safetensors``
+maps the file) is served from memory instead of disk, so the I/O overlaps
+with the current inference rather than following it.
+
+Prefetching is bounded by a lookahead (how many queued jobs to inspect) and
+a byte budget for the files warmed in one window.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from forge.config import ModelsConfig
+from forge.core.queue import JobQueue
+from forge.models.manager import ModelManager
+
+logger = logging.getLogger("forge.prefetch")
+
+READ_CHUNK_BYTES = 16 * 1024 * 1024
+
+
+class ModelPrefetcher:
+    """Warms the page cache with checkpoints of upcoming queued jobs."""
+
+    def __init__(self, queue: JobQueue, model_manager: ModelManager, config: ModelsConfig) -> None:
+        self._queue = queue
+        self._model_manager = model_manager
+        self._lookahead = config.prefetch_lookahead
+        self._max_bytes = config.prefetch_max_mb * 1024 * 1024
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="forge-prefetch")
+        self._stopping = threading.Event()
+        self._pending: dict[Path, asyncio.Future] = {}
+        # Files we've read, most recent last: path -> (size, mtime)
+        self._warm: OrderedDict[Path, tuple[int, int]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._lookahead > 0 and self._max_bytes > 0
+
+    @property
+    def warm_paths(self) -> list[Path]:
+        return list(self._warm)
+
+    def schedule(self, current_model_id: str = "") -> None:
+        """Start warming checkpoints for the next queued jobs.
+
+        Cheap and idempotent: files already warm or being read are skipped,
+        so the worker can call this whenever it likes.
+        """
+        if not self.enabled:
+            return
+        loop = asyncio.get_running_loop()
+        budget = self._max_bytes
+        seen = {current_model_id}
+        for job in self._queue.peek(self._lookahead):
+            model_id = job.params.get("model_id") or ""
+            if model_id in seen:
+                continue
+            seen.add(model_id)
+            entry = self._model_manager.get(model_id, "checkpoint")
+            if entry is None:
+                continue
+            if entry.size_bytes > budget:
+                break  # nearer jobs keep priority over the memory budget
+            budget -= entry.size_bytes
+
+            path = entry.path
+            if self._warm.get(path) == (entry.size_bytes, entry.mtime_ns):
+                self._warm.move_to_end(path)
+                continue
+            if path in self._pending:
+                continue
+            logger.info("Prefetching %s for job %s", path.name, job.job_id)
+            future = loop.run_in_executor(self._executor, self._read_file, path)
+            self._pending[path] = future
+            future.add_done_callback(
+                lambda f, p=path, key=(entry.size_bytes, entry.mtime_ns): self._done(p, key, f)
+            )
+
+    async def wait_idle(self) -> None:
+        """Wait for in-flight prefetches to finish."""
+        if self._pending:
+            await asyncio.gather(*self._pending.values(), return_exceptions=True)
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with contextlib.suppress(Exception):
+            await self.wait_idle()
+
+    def _done(self, path: Path, key: tuple[int, int], future: asyncio.Future) -> None:
+        self._pending.pop(path, None)
+        if future.cancelled() or future.exception() is not None:
+            if not future.cancelled():
+                logger.warning("Prefetch of %s failed: %s", path, future.exception())
+            return
+        self._warm[path] = key
+        # Bookkeeping only — the kernel decides what stays cached — but it
+        # keeps us from assuming more is warm than the budget allows.
+        while sum(size for size, _ in self._warm.values()) > self._max_bytes:
+            self._warm.popitem(last=False)
+
+    def _read_file(self, path: Path) -> int:
+        total = 0
+        buf = bytearray(READ_CHUNK_BYTES)
+        with self._model_manager.pause_hashing(), open(path, "rb", buffering=0) as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            while not self._stopping.is_set() and (n := f.readinto(buf)):
+                total += n
+        return total
@@ -3,8 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 from dataclasses import dataclass, field
 
+# Kinds of work the GPU worker runs, serialized through one queue
+KIND_GENERATE = "generate"
+KIND_LOAD_MODEL = "load_model"
+KIND_UNLOAD_MODEL = "unload_model"
+
 
 @dataclass
 class QueuedJob:
@@ -13,6 +19,9 @@ class QueuedJob:
     job_id: str
     priority: int = 0  # lower = higher priority
     params: dict = field(default_factory=dict)
+    kind: str = KIND_GENERATE
+    # Resolved by the worker when a model operation finishes, for callers that wait
+    done: asyncio.Future | None = field(default=None, repr=False, compare=False)
 
 
 class JobQueue:
@@ -34,6 +43,12 @@ class JobQueue:
                 return job
             self._cancelled.discard(job.job_id)
 
+    def peek(self, n: int) -> list[QueuedJob]:
+        """Return up to ``n`` upcoming jobs in order, without dequeuing them."""
+        # asyncio.Queue keeps its items in a deque; reading it is safe on the loop thread
+        pending = (j for j in self._queue._queue if j.job_id not in self._cancelled)
+        return list(itertools.islice(pending, n))
+
     def cancel(self, job_id: str) -> None:
         """Mark a job for cancellation."""
         self._cancelled.add(job_id)
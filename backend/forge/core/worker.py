@@ -4,18 +4,42 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import functools
+import json
 import logging
 import time
-from datetime import UTC, datetime
+from pathlib import Path
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from forge.config import Settings
 from forge.core.events import EventBus
-from forge.core.queue import JobQueue
+from forge.core.persistence import JobStateWriter
+from forge.core.prefetch import ModelPrefetcher
+from forge.core.queue import KIND_GENERATE, KIND_LOAD_MODEL, JobQueue, QueuedJob
+from forge.models.manager import ModelManager
 
 logger = logging.getLogger("forge.worker")
 
+LOAD_PROGRESS_INTERVAL = 0.5  # seconds between model:loading events
+
+
+def _process_read_bytes() -> int | None:
+    """Bytes this process has caused to be read from storage (Linux only)."""
+    try:
+        for line in Path("/proc/self/io").read_text().splitlines():
+            if line.startswith("read_bytes:"):
+                return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _log_failed_write(job_id: str, transition: str, done: asyncio.Future[None]) -> None:
+    """Done-callback for a state write nobody awaits, so its failure isn't lost."""
+    if not done.cancelled() and done.exception() is not None:
+        logger.error("Could not record job %s as %s: %s", job_id, transition, done.exception())
+
 
 class GPUWorker:
     """Pulls jobs from the queue and executes them serially on the GPU."""
@@ -26,11 +50,21 @@ class GPUWorker:
         event_bus: EventBus,
         settings: Settings,
         session_factory: async_sessionmaker[AsyncSession],
+        model_manager: ModelManager | None = None,
     ) -> None:
         self._queue = queue
         self._event_bus = event_bus
         self._settings = settings
         self._session_factory = session_factory
+        self._model_manager = model_manager
+        self._state = JobStateWriter(
+            session_factory,
+            flush_interval=settings.database.write_flush_interval_ms / 1000,
+            max_batch=settings.database.write_batch_size,
+        )
+        self._prefetcher = (
+            ModelPrefetcher(queue, model_manager, settings.models) if model_manager else None
+        )
         self._task: asyncio.Task | None = None
         self._running = False
         self._backend = None
@@ -38,6 +72,7 @@ class GPUWorker:
     def start(self) -> None:
         """Start the worker loop."""
         self._running = True
+        self._state.start()
         self._task = asyncio.create_task(self._run())
 
     async def stop(self) -> None:
@@ -47,6 +82,9 @@ class GPUWorker:
             self._task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await self._task
+        await self._state.stop()
+        if self._prefetcher:
+            await self._prefetcher.stop()
         if self._backend:
             await self._backend.shutdown()
 
@@ -62,6 +100,7 @@ class GPUWorker:
         self._backend = registry.get(active)
 
         if self._backend:
+            self._backend.model_manager = self._model_manager
             await self._backend.initialize(self._settings)
             logger.info("Backend '%s' initialized", active)
             return
@@ -76,6 +115,7 @@ class GPUWorker:
             )
             self._backend = registry.get("demo")
             if self._backend:
+                self._backend.model_manager = self._model_manager
                 await self._backend.initialize(self._settings)
                 logger.info("Demo backend initialized as fallback")
                 return
@@ -93,33 +133,92 @@ class GPUWorker:
             except asyncio.CancelledError:
                 break
 
-            await self._process_job(job)
+            try:
+                if job.kind == KIND_GENERATE:
+                    await self._process_job(job)
+                else:
+                    await self._process_model_op(job)
+            except Exception:
+                # Keep draining the queue whatever one job did
+                logger.exception("Unhandled error processing %s", job.job_id)
+
+    async def _process_model_op(self, op: QueuedJob) -> None:
+        """Load or unload a model, serialized with generation jobs."""
+        model_id = op.params.get("model_id", "")
+        action = "loading" if op.kind == KIND_LOAD_MODEL else "unloading"
+        logger.info("Model op %s: %s %s", op.job_id, action, model_id or "all models")
+        start_time = time.monotonic()
+        base = {"op_id": op.job_id, "model_id": model_id}
+        reporter: asyncio.Task | None = None
+
+        try:
+            await self._ensure_backend()
+            if not self._backend:
+                raise RuntimeError("No backend available")
+
+            if op.kind == KIND_LOAD_MODEL:
+                reporter = asyncio.create_task(self._report_load_progress(base))
+                await asyncio.sleep(0)  # let the first progress event go out
+                await self._backend.load_model(model_id)
+                event_type = "model:loaded"
+            else:
+                await self._backend.unload_model()
+                event_type = "model:unloaded"
+        except Exception as exc:
+            logger.exception("Model op %s failed: %s", op.job_id, exc)
+            await self._event_bus.publish({"type": "model:failed", **base, "error": str(exc)})
+            if op.done and not op.done.done():
+                op.done.set_exception(exc)
+            return
+        finally:
+            if reporter:
+                reporter.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await reporter
+
+        elapsed = time.monotonic() - start_time
+        await self._event_bus.publish(
+            {"type": event_type, **base, "elapsed_seconds": round(elapsed, 2)}
+        )
+        if op.done and not op.done.done():
+            op.done.set_result(elapsed)
+
+    async def _report_load_progress(self, base: dict) -> None:
+        """Publish ``model:loading`` events with storage bytes read so far."""
+        entry = self._model_manager.get(base["model_id"]) if self._model_manager else None
+        total = entry.size_bytes if entry else None
+        start = _process_read_bytes()
+        while True:
+            current = _process_read_bytes()
+            bytes_read = current - start if current is not None and start is not None else None
+            event = {
+                "type": "model:loading",
+                **base,
+                "bytes_read": bytes_read,
+                "total_bytes": total,
+            }
+            if bytes_read is not None and total:
+                # Reads served from the page cache don't count, so cap below 100
+                event["percentage"] = round(min(99.0, 100.0 * bytes_read / total), 1)
+            await self._event_bus.publish(event)
+            await asyncio.sleep(LOAD_PROGRESS_INTERVAL)
 
     async def _process_job(self, queued_job) -> None:
         """Process a single generation job."""
-        from forge.db.tables import GeneratedImage, Job
         from forge.schemas.generation import GenerateRequest
 
         job_id = queued_job.job_id
         logger.info("Processing job %s", job_id)
         start_time = time.monotonic()
 
-        # Update status to running
-        async with self._session_factory() as session:
-            from sqlalchemy import select
-
-            stmt = select(Job).where(Job.id == job_id)
-            result = await session.execute(stmt)
-            job = result.scalar_one_or_none()
-            if not job:
-                logger.error("Job %s not found in DB", job_id)
-                return
-
-            job.status = "running"
-            job.started_at = datetime.now(UTC)
-            await session.commit()
-
+        # Status writes are batched by the state writer; only terminal
+        # transitions are awaited so clients never see a stale final state.
+        # A failed running write is retried ahead of the job's terminal one,
+        # or folded into it, so the final status always lands last.
+        running = self._state.mark_running(job_id)
+        running.add_done_callback(functools.partial(_log_failed_write, job_id, "running"))
         await self._event_bus.publish({"type": "job:started", "job_id": job_id})
+        current_model = queued_job.params.get("model_id") or ""
 
         try:
             await self._ensure_backend()
@@ -127,58 +226,57 @@ class GPUWorker:
                 raise RuntimeError("No backend available")
 
             params = GenerateRequest(**queued_job.params)
+            if params.mode not in self._backend.get_supported_modes():
+                raise RuntimeError(
+                    f"The {self._backend.name} backend doesn't support {params.mode}"
+                )
             image_paths: list[dict] = []
+            # Backend-specific facts about how the job ran (e.g. compiled graphs)
+            stats: dict = {}
 
-            async for update in self._backend.generate(params, job_id):
-                if self._queue.is_cancelled(job_id):
-                    logger.info("Job %s cancelled", job_id)
-                    break
-
-                if update.get("type") == "progress":
-                    await self._event_bus.publish(
-                        {
-                            "type": "job:progress",
-                            "job_id": job_id,
-                            "step": update["step"],
-                            "total_steps": update["total_steps"],
-                            "percentage": update["percentage"],
-                            "preview_image": update.get("preview_image"),
-                        }
-                    )
-                elif update.get("type") == "result":
-                    image_paths = update["images"]
-
-            elapsed = time.monotonic() - start_time
-
-            # Save images to DB
-            async with self._session_factory() as session:
-                stmt = select(Job).where(Job.id == job_id)
-                result = await session.execute(stmt)
-                job = result.scalar_one_or_none()
-                if job:
+            # Closed on cancel, so the backend's pipeline has stopped before the next job
+            generation = self._backend.generate(params, job_id)
+            async with contextlib.aclosing(generation):
+                async for update in generation:
                     if self._queue.is_cancelled(job_id):
-                        job.status = "cancelled"
-                    else:
-                        job.status = "completed"
-                    job.completed_at = datetime.now(UTC)
-
-                    for img_info in image_paths:
-                        img = GeneratedImage(
-                            id=img_info["id"],
-                            job_id=job_id,
-                            file_path=img_info["file_path"],
-                            thumbnail_path=img_info.get("thumbnail_path", ""),
-                            width=img_info["width"],
-                            height=img_info["height"],
-                            seed=img_info.get("seed", -1),
-                            prompt=job.prompt,
-                            negative_prompt=job.negative_prompt,
-                            model_id=job.model_id,
-                            params_json=job.params_json,
+                        logger.info("Job %s cancelled", job_id)
+                        break
+
+                    if update.get("type") == "progress":
+                        if self._prefetcher:
+                            # The job's own model is loaded by now, so prefetching
+                            # upcoming checkpoints doesn't compete with its read
+                            self._prefetcher.schedule(current_model)
+                        await self._event_bus.publish(
+                            {
+                                "type": "job:progress",
+                                "job_id": job_id,
+                                "step": update["step"],
+                                "total_steps": update["total_steps"],
+                                "percentage": update["percentage"],
+                                "preview_image": update.get("preview_image"),
+                                "pass_index": update.get("pass_index", 1),
+                                "total_passes": update.get("total_passes", 1),
+                            }
                         )
-                        session.add(img)
+                    elif update.get("type") == "result":
+                        image_paths = update["images"]
+                        stats = update.get("stats", {})
+
+            elapsed = time.monotonic() - start_time
 
-                    await session.commit()
+            status = "cancelled" if self._queue.is_cancelled(job_id) else "completed"
+            await self._state.mark_finished(
+                job_id,
+                status,
+                image_paths,
+                {
+                    "prompt": params.prompt,
+                    "negative_prompt": params.negative_prompt,
+                    "model_id": params.model_id,
+                    "params_json": json.dumps(queued_job.params),
+                },
+            )
 
             await self._event_bus.publish(
                 {
@@ -186,23 +284,17 @@ class GPUWorker:
                     "job_id": job_id,
                     "images": image_paths,
                     "elapsed_seconds": round(elapsed, 2),
+                    **({"stats": stats} if stats else {}),
                 }
             )
             logger.info("Job %s completed in %.2fs", job_id, elapsed)
 
         except Exception as exc:
             logger.exception("Job %s failed: %s", job_id, exc)
-            async with self._session_factory() as session:
-                from sqlalchemy import select
-
-                stmt = select(Job).where(Job.id == job_id)
-                result = await session.execute(stmt)
-                job = result.scalar_one_or_none()
-                if job:
-                    job.status = "failed"
-                    job.error_message = str(exc)
-                    job.completed_at = datetime.now(UTC)
-                    await session.commit()
+            try:
+                await self._state.mark_failed(job_id, str(exc))
+            except Exception:
+                logger.exception("Could not record the failure of job %s", job_id)
 
             await self._event_bus.publish(
                 {
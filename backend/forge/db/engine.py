@@ -1,9 +1,17 @@
-"""SQLAlchemy async engine and session factory."""
+"""SQLAlchemy async engines and session factories.
+
+SQLite allows many concurrent readers but only one writer. We run it in WAL
+mode with a single-connection writer engine (so writes queue up in the pool
+instead of fighting over the database lock) and a separate pool of
+``query_only`` reader connections that never block on the writer.
+"""
 
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -11,15 +19,70 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
+from forge.config import DatabaseConfig
 from forge.db.tables import Base
 
 
+def sqlite_pragmas(config: DatabaseConfig, read_only: bool = False) -> list[str]:
+    """Build the PRAGMA statements applied to every new connection."""
+    pragmas = [
+        f"PRAGMA journal_mode = {config.journal_mode.upper()}",
+        f"PRAGMA synchronous = {config.synchronous.upper()}",
+        f"PRAGMA mmap_size = {config.mmap_size_mb * 1024 * 1024}",
+        # Negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size = {-config.cache_size_mb * 1024}",
+        f"PRAGMA busy_timeout = {config.busy_timeout_ms}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only = ON")
+    return pragmas
+
+
+def _install_pragmas(engine: AsyncEngine, pragmas: list[str]) -> None:
+    """Run ``pragmas`` on each DBAPI connection as the pool creates it."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection: Any, _connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
 def create_engine_and_session(
     db_path: Path,
+    config: DatabaseConfig | None = None,
 ) -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
-    """Create async engine and session factory for SQLite."""
+    """Create the writer engine and session factory for SQLite.
+
+    The pool holds exactly one connection, so concurrent writers are
+    serialized in-process rather than spinning on ``SQLITE_BUSY``.
+    """
+    config = config or DatabaseConfig()
+    url = f"sqlite+aiosqlite:///{db_path}"
+    engine = create_async_engine(url, echo=False, pool_size=1, max_overflow=0)
+    _install_pragmas(engine, sqlite_pragmas(config))
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    return engine, session_factory
+
+
+def create_read_engine_and_session(
+    db_path: Path,
+    config: DatabaseConfig | None = None,
+) -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
+    """Create a pooled read-only engine and session factory for SQLite.
+
+    In WAL mode readers see the last committed snapshot and are never blocked
+    by the writer, so gallery and job queries keep flowing while the worker
+    commits job state.
+    """
+    config = config or DatabaseConfig()
     url = f"sqlite+aiosqlite:///{db_path}"
-    engine = create_async_engine(url, echo=False)
+    engine = create_async_engine(
+        url, echo=False, pool_size=config.read_pool_size, max_overflow=0
+    )
+    _install_pragmas(engine, sqlite_pragmas(config, read_only=True))
     session_factory = async_sessionmaker(engine, expire_on_commit=False)
     return engine, session_factory
 
@@ -67,3 +67,29 @@ class GeneratedImage(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=_utcnow
     )
+
+
+class ImportedFile(Base):
+    """Output files already indexed by the gallery importer, keyed by path + mtime."""
+
+    __tablename__ = "imported_files"
+
+    file_path: Mapped[str] = mapped_column(String(500), primary_key=True)
+    mtime_ns: Mapped[int] = mapped_column(Integer)
+    size_bytes: Mapped[int] = mapped_column(Integer)
+    image_id: Mapped[str] = mapped_column(String(12), index=True)
+
+
+class ModelHash(Base):
+    """Content hashes of model files, valid while path, size and mtime match."""
+
+    __tablename__ = "model_hashes"
+
+    file_path: Mapped[str] = mapped_column(String(1000), primary_key=True)
+    size_bytes: Mapped[int] = mapped_column(Integer, primary_key=True)
+    mtime_ns: Mapped[int] = mapped_column(Integer, primary_key=True)
+    sha256: Mapped[str] = mapped_column(String(64))
+    autov2: Mapped[str] = mapped_column(String(10))
+    hashed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=_utcnow
+    )
@@ -15,7 +15,13 @@ from forge.config import Settings, load_settings
 from forge.core.events import EventBus
 from forge.core.queue import JobQueue
 from forge.core.worker import GPUWorker
-from forge.db.engine import create_engine_and_session, run_migrations
+from forge.db.engine import (
+    create_engine_and_session,
+    create_read_engine_and_session,
+    run_migrations,
+)
+from forge.models.manager import ModelManager
+from forge.storage.file_tasks import FileTaskRunner
 
 logger = logging.getLogger("forge")
 
@@ -32,27 +38,43 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     for subdir in ["checkpoints", "loras", "vaes", "controlnet", "upscalers"]:
         (settings.paths.resolved_models / subdir).mkdir(exist_ok=True)
 
-    # Database
-    engine, session_factory = create_engine_and_session(settings.paths.resolved_db)
+    # Database — one serialized writer plus a pool of WAL readers
+    engine, session_factory = create_engine_and_session(
+        settings.paths.resolved_db, settings.database
+    )
     await run_migrations(engine)
+    read_engine, read_session_factory = create_read_engine_and_session(
+        settings.paths.resolved_db, settings.database
+    )
     app.state.db_engine = engine
     app.state.session_factory = session_factory
+    app.state.read_db_engine = read_engine
+    app.state.read_session_factory = read_session_factory
 
     # Core services
     event_bus = EventBus()
     job_queue = JobQueue()
+    model_manager = ModelManager(
+        settings.paths.resolved_models, event_bus, settings.models, session_factory
+    )
     worker = GPUWorker(
         queue=job_queue,
         event_bus=event_bus,
         settings=settings,
         session_factory=session_factory,
+        model_manager=model_manager,
     )
 
+    file_tasks = FileTaskRunner(event_bus)
+
     app.state.event_bus = event_bus
+    app.state.file_tasks = file_tasks
     app.state.job_queue = job_queue
+    app.state.model_manager = model_manager
     app.state.worker = worker
 
-    # Start worker
+    # Build the model catalog in the background, then start the worker
+    await model_manager.start()
     worker.start()
     logger.info("Forge started on %s:%s", settings.server.host, settings.server.port)
 
@@ -60,6 +82,9 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     # Shutdown
     await worker.stop()
+    await model_manager.stop()
+    await file_tasks.stop()
+    await read_engine.dispose()
     await engine.dispose()
     logger.info("Forge shut down")
 
@@ -93,6 +118,7 @@ def create_app(settings: Settings | None = None) -> FastAPI:
     from forge.api.models import router as models_router
     from forge.api.settings import router as settings_router
     from forge.api.system import router as system_router
+    from forge.api.uploads import router as uploads_router
     from forge.api.ws import router as ws_router
 
     app.include_router(generation_router, prefix="/api")
@@ -100,6 +126,7 @@ def create_app(settings: Settings | None = None) -> FastAPI:
     app.include_router(gallery_router, prefix="/api")
     app.include_router(settings_router, prefix="/api")
     app.include_router(system_router, prefix="/api")
+    app.include_router(uploads_router, prefix="/api")
     app.include_router(ws_router)
 
     # Serve frontend static files in production
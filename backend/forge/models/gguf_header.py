@@ -0,0 +1,201 @@
+"""Header-only GGUF introspection.
+
+GGUF files (as produced for diffusion models by e.g. ComfyUI-GGUF's
+converter) start with a ``GGUF`` magic, a version, tensor and key/value
+counts, then the key/value metadata and one info record per tensor (name,
+dimensions, ggml type, data offset). The tensor data follows, aligned, so
+the header alone identifies the architecture and quantization without
+reading the weights.
+
+Only the UNet is stored in diffusion GGUF files; the text encoders and VAE
+come from the matching base pipeline.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+from pathlib import Path
+from typing import BinaryIO
+
+from forge.models.safetensors_header import (
+    SD2,
+    SD15,
+    SDXL,
+    SDXL_REFINER,
+    UNKNOWN,
+    SafetensorsInfo,
+)
+
+GGUF_MAGIC = b"GGUF"
+# Sanity limits so a corrupt header can't make us allocate unbounded memory
+MAX_TENSORS = 1_000_000
+MAX_KV = 100_000
+MAX_STRING_BYTES = 16 * 1024 * 1024
+MAX_ARRAY_ITEMS = 10_000_000
+
+# ggml tensor types seen in diffusion model files
+GGML_TYPES = {
+    0: "F32",
+    1: "F16",
+    2: "Q4_0",
+    3: "Q4_1",
+    6: "Q5_0",
+    7: "Q5_1",
+    8: "Q8_0",
+    9: "Q8_1",
+    10: "Q2_K",
+    11: "Q3_K",
+    12: "Q4_K",
+    13: "Q5_K",
+    14: "Q6_K",
+    15: "Q8_K",
+    24: "I8",
+    25: "I16",
+    26: "I32",
+    27: "I64",
+    28: "F64",
+    30: "BF16",
+}
+
+# ``general.architecture`` values written by diffusion GGUF converters
+GGUF_ARCHITECTURES = {"sd1": SD15, "sd2": SD2, "sdxl": SDXL}
+
+_SCALARS = {
+    0: "<B",
+    1: "<b",
+    2: "<H",
+    3: "<h",
+    4: "<I",
+    5: "<i",
+    6: "<f",
+    7: "<?",
+    10: "<Q",
+    11: "<q",
+    12: "<d",
+}
+_STRING = 8
+_ARRAY = 9
+
+# Cross-attention key whose input width is the text encoder's hidden size
+_CONTEXT_KEY = "input_blocks.1.1.transformer_blocks.0.attn2.to_k.weight"
+_CONTEXT_ARCHITECTURES = {768: SD15, 1024: SD2}
+
+
+class _Reader:
+    def __init__(self, f: BinaryIO, name: str) -> None:
+        self._f = f
+        self._name = name
+
+    def unpack(self, fmt: str) -> int | float | bool:
+        size = struct.calcsize(fmt)
+        raw = self._f.read(size)
+        if len(raw) != size:
+            raise ValueError(f"{self._name}: truncated GGUF header")
+        return struct.unpack(fmt, raw)[0]
+
+    def string(self) -> str:
+        length = self.unpack("<Q")
+        if length > MAX_STRING_BYTES:
+            raise ValueError(f"{self._name}: implausible GGUF string length {length}")
+        raw = self._f.read(length)
+        if len(raw) != length:
+            raise ValueError(f"{self._name}: truncated GGUF header")
+        return raw.decode("utf-8", errors="replace")
+
+    def value(self, value_type: int) -> object:
+        if value_type in _SCALARS:
+            return self.unpack(_SCALARS[value_type])
+        if value_type == _STRING:
+            return self.string()
+        if value_type == _ARRAY:
+            item_type = self.unpack("<I")
+            count = self.unpack("<Q")
+            if count > MAX_ARRAY_ITEMS:
+                raise ValueError(f"{self._name}: implausible GGUF array length {count}")
+            return [self.value(item_type) for _ in range(count)]
+        raise ValueError(f"{self._name}: unknown GGUF value type {value_type}")
+
+
+def read_gguf_header(
+    path: Path,
+) -> tuple[dict[str, object], dict[str, tuple[tuple[int, ...], int]]]:
+    """Read the metadata and tensor infos of a GGUF file.
+
+    Returns ``(metadata, tensors)`` where ``tensors`` maps each name to its
+    torch-order shape and ggml type. Raises ``ValueError`` if the file isn't
+    a valid GGUF file.
+    """
+    with open(path, "rb") as f:
+        if f.read(4) != GGUF_MAGIC:
+            raise ValueError(f"{path.name}: not a GGUF file")
+        reader = _Reader(f, path.name)
+        version = reader.unpack("<I")
+        if version < 2:
+            raise ValueError(f"{path.name}: unsupported GGUF version {version}")
+        tensor_count = reader.unpack("<Q")
+        kv_count = reader.unpack("<Q")
+        if tensor_count > MAX_TENSORS or kv_count > MAX_KV:
+            raise ValueError(f"{path.name}: implausible GGUF header counts")
+
+        metadata: dict[str, object] = {}
+        for _ in range(kv_count):
+            key = reader.string()
+            metadata[key] = reader.value(reader.unpack("<I"))
+
+        tensors: dict[str, tuple[tuple[int, ...], int]] = {}
+        for _ in range(tensor_count):
+            name = reader.string()
+            n_dims = reader.unpack("<I")
+            if n_dims > 8:
+                raise ValueError(f"{path.name}: implausible tensor rank {n_dims}")
+            dims = [reader.unpack("<Q") for _ in range(n_dims)]
+            ggml_type = reader.unpack("<I")
+            reader.unpack("<Q")  # data offset
+            # GGUF lists dimensions innermost first; torch order is the reverse
+            tensors[name] = (tuple(reversed(dims)), ggml_type)
+    return metadata, tensors
+
+
+def detect_gguf_architecture(
+    metadata: dict[str, object], tensors: dict[str, tuple[tuple[int, ...], int]]
+) -> str:
+    """Classify a diffusion GGUF file from its metadata, falling back to tensor names."""
+    declared = GGUF_ARCHITECTURES.get(str(metadata.get("general.architecture", "")))
+    if declared is not None:
+        return declared
+
+    shapes = {
+        name.removeprefix("model.diffusion_model."): shape for name, (shape, _) in tensors.items()
+    }
+    if "label_emb.0.0.weight" in shapes:
+        # Base SDXL adds 2816 pooled/size features; the refiner 2560
+        return SDXL_REFINER if shapes["label_emb.0.0.weight"][-1] == 2560 else SDXL
+    context = shapes.get(_CONTEXT_KEY)
+    if context:
+        return _CONTEXT_ARCHITECTURES.get(context[-1], UNKNOWN)
+    return UNKNOWN
+
+
+def inspect_gguf(path: Path) -> SafetensorsInfo:
+    """Describe a GGUF file from its header alone.
+
+    The result has the same shape as for safetensors files, with ggml type
+    names (``Q8_0``, ``Q4_K``...) as dtypes, so the catalog treats both alike.
+    """
+    metadata, tensors = read_gguf_header(path)
+    dtypes: dict[str, int] = {}
+    total = 0
+    for shape, ggml_type in tensors.values():
+        count = math.prod(shape)
+        dtype = GGML_TYPES.get(ggml_type, str(ggml_type))
+        dtypes[dtype] = dtypes.get(dtype, 0) + count
+        total += count
+    return SafetensorsInfo(
+        architecture=detect_gguf_architecture(metadata, tensors),
+        tensor_count=len(tensors),
+        parameter_count=total,
+        dtypes=dtypes,
+        # Arrays (tokenizer vocabularies and the like) are too bulky for the catalog
+        metadata={k: str(v) for k, v in metadata.items() if not isinstance(v, list)},
+    )
@@ -0,0 +1,215 @@
+"""Background model hashing with a persistent hash cache.
+
+Model files are hashed with SHA-256 using large sequential ``readinto``
+calls into one reused buffer, on a single low-priority thread that is
+rate-limited and pauses entirely while a model is being loaded. Results are
+stored in the ``model_hashes`` table keyed by (path, size, mtime), so a
+restart never re-hashes a file that hasn't changed.
+
+The short hash shown in the catalog is the A1111 "AutoV2" form: the first
+ten hex digits of the SHA-256.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from forge.db.tables import ModelHash
+
+if TYPE_CHECKING:
+    from forge.models.manager import CatalogEntry
+
+logger = logging.getLogger("forge.models.hashing")
+
+READ_CHUNK_BYTES = 16 * 1024 * 1024
+AUTOV2_LENGTH = 10
+
+
+class HashingCancelledError(Exception):
+    """Raised from inside ``hash_file`` when the hasher is shutting down."""
+
+
+def hash_file(
+    path: Path,
+    chunk_bytes: int = READ_CHUNK_BYTES,
+    checkpoint: Callable[[int], None] | None = None,
+) -> tuple[str, str]:
+    """Return ``(sha256, autov2)`` for ``path``.
+
+    ``checkpoint(bytes_read)`` is called after every chunk; it may sleep to
+    throttle, block to pause, or raise to abort.
+    """
+    import hashlib
+
+    digest = hashlib.sha256()
+    buf = bytearray(chunk_bytes)
+    view = memoryview(buf)
+    total = 0
+    with open(path, "rb", buffering=0) as f:
+        fd = f.fileno()
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while n := f.readinto(buf):
+            digest.update(view[:n])
+            total += n
+            if checkpoint:
+                checkpoint(total)
+        if hasattr(os, "posix_fadvise"):
+            # Don't let a background hash evict models the loader needs
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    sha256 = digest.hexdigest()
+    return sha256, sha256[:AUTOV2_LENGTH]
+
+
+def _lower_thread_priority() -> None:
+    # On Linux, niceness set on a thread id only affects that thread
+    with contextlib.suppress(AttributeError, OSError):
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+
+
+class ModelHasher:
+    """Hashes catalog entries in the background and persists the results."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        on_hashed: Callable[[CatalogEntry], Awaitable[None]],
+        max_mb_per_sec: float = 0.0,
+    ) -> None:
+        self._session_factory = session_factory
+        self._on_hashed = on_hashed
+        self._max_bytes_per_sec = max_mb_per_sec * 1024 * 1024
+        self._cache: dict[str, tuple[int, int, str, str]] = {}
+        self._queue: asyncio.Queue[CatalogEntry] = asyncio.Queue()
+        self._queued: set[Path] = set()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="forge-hash", initializer=_lower_thread_priority
+        )
+        self._resume = threading.Event()
+        self._resume.set()
+        self._pause_count = 0
+        self._pause_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._task: asyncio.Task | None = None
+
+    async def load_cache(self) -> None:
+        """Load every persisted hash into memory."""
+        async with self._session_factory() as session:
+            rows = await session.execute(select(ModelHash))
+            for row in rows.scalars():
+                self._cache[row.file_path] = (row.size_bytes, row.mtime_ns, row.sha256, row.autov2)
+
+    def apply_cached(self, entry: CatalogEntry) -> bool:
+        """Fill in ``entry``'s hash from the cache if the file is unchanged."""
+        cached = self._cache.get(str(entry.path))
+        if cached and cached[:2] == (entry.size_bytes, entry.mtime_ns):
+            entry.sha256, entry.hash = cached[2], cached[3]
+            return True
+        return False
+
+    def submit(self, entries: list[CatalogEntry]) -> None:
+        """Queue entries without a hash; cached ones are filled in immediately."""
+        for entry in entries:
+            if entry.sha256 or entry.path in self._queued or self.apply_cached(entry):
+                continue
+            self._queued.add(entry.path)
+            self._queue.put_nowait(entry)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        self._resume.set()
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def pause(self) -> None:
+        """Suspend hashing (e.g. while a model loads). Calls nest."""
+        with self._pause_lock:
+            self._pause_count += 1
+            self._resume.clear()
+
+    def resume(self) -> None:
+        with self._pause_lock:
+            self._pause_count = max(0, self._pause_count - 1)
+            if self._pause_count == 0:
+                self._resume.set()
+
+    @property
+    def pending_count(self) -> int:
+        return self._queue.qsize()
+
+    def _hash_entry(self, path: Path) -> tuple[str, str]:
+        started = time.monotonic()
+
+        def checkpoint(bytes_read: int) -> None:
+            self._resume.wait()
+            if self._stopping.is_set():
+                raise HashingCancelledError
+            if self._max_bytes_per_sec > 0:
+                ahead = bytes_read / self._max_bytes_per_sec - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+        return hash_file(path, checkpoint=checkpoint)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            entry = await self._queue.get()
+            self._queued.discard(entry.path)
+            try:
+                st = entry.path.stat()
+                if (st.st_size, st.st_mtime_ns) != (entry.size_bytes, entry.mtime_ns):
+                    continue  # superseded; the catalog will queue the new version
+                started = time.monotonic()
+                sha256, autov2 = await loop.run_in_executor(
+                    self._executor, self._hash_entry, entry.path
+                )
+            except HashingCancelledError:
+                return
+            except OSError as exc:
+                logger.warning("Could not hash %s: %s", entry.path, exc)
+                continue
+
+            logger.info(
+                "Hashed %s (%s) in %.1fs", entry.path.name, autov2, time.monotonic() - started
+            )
+            entry.sha256, entry.hash = sha256, autov2
+            self._cache[str(entry.path)] = (entry.size_bytes, entry.mtime_ns, sha256, autov2)
+            try:
+                async with self._session_factory() as session:
+                    await session.execute(
+                        delete(ModelHash).where(ModelHash.file_path == str(entry.path))
+                    )
+                    session.add(
+                        ModelHash(
+                            file_path=str(entry.path),
+                            size_bytes=entry.size_bytes,
+                            mtime_ns=entry.mtime_ns,
+                            sha256=sha256,
+                            autov2=autov2,
+                        )
+                    )
+                    await session.commit()
+            except SQLAlchemyError as exc:
+                # The hash is still known for this run; it's recomputed after a restart
+                logger.warning("Could not save hash of %s: %s", entry.path, exc)
+            await self._on_hashed(entry)
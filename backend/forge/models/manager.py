@@ -1,14 +1,41 @@
-"""Model manager — scan, metadata extraction, model listing."""
+"""Model manager — scan, metadata extraction, model listing.
+
+A single ``ModelManager`` is shared app-wide and keeps an in-memory catalog
+of every model file. The catalog is built once in a background thread and
+then kept current incrementally: only directories whose mtime changed are
+re-listed, and only new or modified files are re-stat'ed. Changes are
+detected with a filesystem watcher (``watchfiles``, when installed) or by
+polling directory mtimes, and pushed to clients as ``models:changed``
+events. When a session factory is given, file hashes are filled in by a
+background ``ModelHasher`` and published as updates once computed.
+
+New or modified ``.safetensors`` and ``.gguf`` files have their header parsed
+during the scan, so each entry's metadata carries the detected architecture, dtypes and
+parameter count without loading any weights.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from forge.config import ModelsConfig
+from forge.core.events import EventBus
+from forge.models.gguf_header import inspect_gguf
+from forge.models.hashing import ModelHasher
+from forge.models.safetensors_header import inspect_safetensors
+
 logger = logging.getLogger("forge.models")
 
-MODEL_EXTENSIONS = {".safetensors", ".ckpt", ".pt", ".pth", ".bin", ".onnx"}
+MODEL_EXTENSIONS = {".safetensors", ".ckpt", ".pt", ".pth", ".bin", ".onnx", ".gguf"}
 
 MODEL_DIRS = {
     "checkpoints": "checkpoint",
@@ -18,46 +45,265 @@ MODEL_DIRS = {
     "upscalers": "upscaler",
 }
 
+# Formats whose header describes the model without loading weights
+_HEADER_READERS = {".safetensors": inspect_safetensors, ".gguf": inspect_gguf}
+
+
+@dataclass
+class CatalogEntry:
+    """A model file in the catalog."""
+
+    path: Path
+    model_type: str
+    size_bytes: int
+    mtime_ns: int
+    hash: str = ""
+    sha256: str = ""
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    def to_info(self) -> dict[str, Any]:
+        return {
+            "id": self.path.name,
+            "name": self.path.stem,
+            "filename": self.path.name,
+            "type": self.model_type,
+            "size_bytes": self.size_bytes,
+            "hash": self.hash,
+            "sha256": self.sha256,
+            "metadata": dict(self.metadata),
+        }
+
+
+def _read_metadata(path: Path) -> dict[str, Any]:
+    inspect = _HEADER_READERS.get(path.suffix.lower())
+    if inspect is None:
+        return {}
+    try:
+        return inspect(path).to_dict()
+    except (OSError, ValueError) as exc:
+        logger.debug("Could not read model header of %s: %s", path, exc)
+        return {}
+
 
 class ModelManager:
-    """Scans model directories and provides model metadata."""
+    """Scans model directories and serves a cached catalog of model metadata."""
 
-    def __init__(self, models_dir: Path) -> None:
+    def __init__(
+        self,
+        models_dir: Path,
+        event_bus: EventBus | None = None,
+        config: ModelsConfig | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> None:
         self._models_dir = models_dir
+        self._event_bus = event_bus
+        self._config = config or ModelsConfig()
+        self._hasher: ModelHasher | None = None
+        if session_factory is not None and self._config.hashing:
+            self._hasher = ModelHasher(
+                session_factory, self._on_hashed, self._config.hash_max_mb_per_sec
+            )
+        self._entries: dict[str, dict[str, CatalogEntry]] = {d: {} for d in MODEL_DIRS}
+        self._dir_mtimes: dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._built = False
+        self._ready = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+
+    # --- Lifecycle ---------------------------------------------------------
+
+    async def start(self) -> None:
+        """Build the catalog in the background and start watching for changes."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        if self._hasher:
+            await self._hasher.stop()
+
+    async def wait_ready(self) -> None:
+        """Wait until the initial catalog build has finished."""
+        if not self._built:
+            await self._ready.wait()
+
+    @contextlib.contextmanager
+    def pause_hashing(self) -> Iterator[None]:
+        """Keep the background hasher off the disk, e.g. while loading a model."""
+        if self._hasher is None:
+            yield
+            return
+        self._hasher.pause()
+        try:
+            yield
+        finally:
+            self._hasher.resume()
+
+    # --- Queries (served from memory) --------------------------------------
 
     def scan_all(self) -> list[dict[str, Any]]:
-        """Scan all model directories and return model info."""
-        models = []
-        for dir_name, model_type in MODEL_DIRS.items():
-            subdir = self._models_dir / dir_name
-            if not subdir.exists():
-                continue
-            for path in subdir.iterdir():
-                if path.suffix.lower() in MODEL_EXTENSIONS:
-                    models.append(self._model_info(path, model_type))
+        """Return info for every model in the catalog."""
+        self._ensure_built()
+        with self._lock:
+            models = [e.to_info() for entries in self._entries.values() for e in entries.values()]
         return sorted(models, key=lambda m: m["name"].lower())
 
     def scan_type(self, model_type: str) -> list[dict[str, Any]]:
-        """Scan a specific model type directory."""
+        """Return info for every model of one type."""
+        self._ensure_built()
         reverse_map = {v: k for k, v in MODEL_DIRS.items()}
         dir_name = reverse_map.get(model_type, model_type)
-        subdir = self._models_dir / dir_name
-        if not subdir.exists():
-            return []
-
-        models = []
-        for path in subdir.iterdir():
-            if path.suffix.lower() in MODEL_EXTENSIONS:
-                models.append(self._model_info(path, model_type))
+        with self._lock:
+            models = [e.to_info() for e in self._entries.get(dir_name, {}).values()]
         return sorted(models, key=lambda m: m["name"].lower())
 
-    def _model_info(self, path: Path, model_type: str) -> dict[str, Any]:
-        return {
-            "id": path.name,
-            "name": path.stem,
-            "filename": path.name,
-            "type": model_type,
-            "size_bytes": path.stat().st_size,
-            "hash": "",
-            "metadata": {},
-        }
+    def get(self, model_id: str, model_type: str | None = None) -> CatalogEntry | None:
+        """Look up a catalog entry by model id (its filename)."""
+        self._ensure_built()
+        with self._lock:
+            for dir_name, entries in self._entries.items():
+                if model_type and MODEL_DIRS[dir_name] != model_type:
+                    continue
+                if model_id in entries:
+                    return entries[model_id]
+        return None
+
+    def resolve(self, model_id: str, model_type: str | None = None) -> Path | None:
+        """Resolve a model id to its file path, if it's in the catalog."""
+        entry = self.get(model_id, model_type)
+        return entry.path if entry else None
+
+    # --- Catalog maintenance -----------------------------------------------
+
+    def refresh(self, force: bool = False) -> dict[str, list]:
+        """Bring the catalog up to date with the filesystem.
+
+        Directories whose mtime hasn't changed are skipped unless ``force``.
+        Returns the diff as ``{"added": [...], "updated": [...], "removed": [...]}``.
+        """
+        diff: dict[str, list] = {"added": [], "updated": [], "removed": []}
+        with self._refresh_lock:
+            for dir_name, model_type in MODEL_DIRS.items():
+                subdir = self._models_dir / dir_name
+                try:
+                    dir_mtime = subdir.stat().st_mtime_ns
+                except OSError:
+                    dir_mtime = -1
+                if not force and self._dir_mtimes.get(dir_name) == dir_mtime:
+                    continue
+                self._dir_mtimes[dir_name] = dir_mtime
+                self._refresh_dir(subdir, dir_name, model_type, diff)
+            self._built = True
+        return diff
+
+    def _refresh_dir(
+        self, subdir: Path, dir_name: str, model_type: str, diff: dict[str, list]
+    ) -> None:
+        found: dict[str, CatalogEntry] = {}
+        if subdir.exists():
+            for path in subdir.iterdir():
+                if path.suffix.lower() not in MODEL_EXTENSIONS:
+                    continue
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                with self._lock:
+                    previous = self._entries[dir_name].get(path.name)
+                if (
+                    previous is not None
+                    and previous.size_bytes == st.st_size
+                    and previous.mtime_ns == st.st_mtime_ns
+                ):
+                    found[path.name] = previous
+                    continue
+                entry = CatalogEntry(
+                    path, model_type, st.st_size, st.st_mtime_ns, metadata=_read_metadata(path)
+                )
+                if self._hasher:
+                    self._hasher.apply_cached(entry)
+                found[path.name] = entry
+                diff["updated" if previous else "added"].append(entry.to_info())
+
+        with self._lock:
+            removed = set(self._entries[dir_name]) - set(found)
+            self._entries[dir_name] = found
+        diff["removed"].extend(removed)
+
+    def _ensure_built(self) -> None:
+        # Callers outside the app lifecycle (scripts, tests) get a synchronous scan
+        if not self._built:
+            self.refresh()
+
+    def _all_entries(self) -> list[CatalogEntry]:
+        with self._lock:
+            return [e for entries in self._entries.values() for e in entries.values()]
+
+    async def _run(self) -> None:
+        try:
+            if self._hasher:
+                await self._hasher.load_cache()
+            await asyncio.to_thread(self.refresh)
+            if self._hasher:
+                self._hasher.submit(self._all_entries())
+                self._hasher.start()
+            logger.info("Model catalog built (%d models)", len(self._all_entries()))
+        except Exception:
+            # Listing falls back to a synchronous scan; the watcher may recover
+            logger.exception("Building the model catalog failed")
+        finally:
+            # Never leave wait_ready() (and GET /models) hanging
+            self._ready.set()
+
+        mode = self._config.watch
+        if mode == "off":
+            return
+        if mode in ("auto", "watch"):
+            try:
+                await self._watch_events()
+                return
+            except ImportError:
+                if mode == "watch":
+                    logger.warning("watchfiles not installed, polling model directories")
+        await self._watch_poll()
+
+    async def _watch_events(self) -> None:
+        from watchfiles import awatch
+
+        async for _changes in awatch(self._models_dir, stop_event=self._stop):
+            # A rewritten file doesn't bump its directory's mtime, so force a re-stat
+            await self._apply_refresh(force=True)
+
+    async def _watch_poll(self) -> None:
+        while not self._stop.is_set():
+            await asyncio.sleep(self._config.poll_interval_seconds)
+            await self._apply_refresh()
+
+    async def _apply_refresh(self, force: bool = False) -> None:
+        diff = await asyncio.to_thread(self.refresh, force)
+        if self._hasher and (diff["added"] or diff["updated"]):
+            self._hasher.submit(self._all_entries())
+        if any(diff.values()):
+            logger.info(
+                "Model catalog changed: +%d ~%d -%d",
+                len(diff["added"]),
+                len(diff["updated"]),
+                len(diff["removed"]),
+            )
+            if self._event_bus:
+                await self._event_bus.publish({"type": "models:changed", **diff})
+
+    async def _on_hashed(self, entry: CatalogEntry) -> None:
+        with self._lock:
+            current = self._entries.get(entry.path.parent.name, {}).get(entry.path.name)
+        if current is not entry:
+            return  # replaced or removed while it was being hashed
+        if self._event_bus:
+            await self._event_bus.publish(
+                {"type": "models:changed", "added": [], "updated": [entry.to_info()], "removed": []}
+            )
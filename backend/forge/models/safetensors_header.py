@@ -0,0 +1,123 @@
+"""Header-only safetensors introspection.
+
+A safetensors file starts with a little-endian u64 header length followed by
+a JSON header describing every tensor (dtype, shape, byte offsets) plus an
+optional ``__metadata__`` string map. Reading just that header — usually well
+under a megabyte, even for multi-gigabyte checkpoints — is enough to tell an
+SDXL checkpoint from an SD1.5 one, a LoRA or a standalone VAE, without
+touching the weights.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+MAX_HEADER_BYTES = 100 * 1024 * 1024
+
+# Architecture identifiers stored in catalog metadata
+SD15 = "sd15"
+SD2 = "sd2"
+SDXL = "sdxl"
+SDXL_REFINER = "sdxl_refiner"
+LORA = "lora"
+VAE = "vae"
+UNKNOWN = "unknown"
+
+
+@dataclass
+class SafetensorsInfo:
+    """What the header of a safetensors file says about its contents."""
+
+    architecture: str
+    tensor_count: int
+    parameter_count: int
+    dtypes: dict[str, int] = field(default_factory=dict)  # dtype -> parameter count
+    metadata: dict[str, str] = field(default_factory=dict)  # the ``__metadata__`` map
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "architecture": self.architecture,
+            "tensor_count": self.tensor_count,
+            "parameter_count": self.parameter_count,
+            "dtypes": dict(self.dtypes),
+            "header_metadata": dict(self.metadata),
+        }
+
+
+def read_header(path: Path) -> dict[str, Any]:
+    """Read and decode the JSON header of a safetensors file.
+
+    Raises ``ValueError`` if the file isn't a valid safetensors file.
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(8)
+        if len(prefix) != 8:
+            raise ValueError(f"{path.name}: file too short for a safetensors header")
+        (length,) = struct.unpack("<Q", prefix)
+        if not 2 <= length <= MAX_HEADER_BYTES:
+            raise ValueError(f"{path.name}: implausible safetensors header length {length}")
+        raw = f.read(length)
+    if len(raw) != length:
+        raise ValueError(f"{path.name}: truncated safetensors header")
+    header = json.loads(raw)
+    if not isinstance(header, dict):
+        raise ValueError(f"{path.name}: safetensors header is not an object")
+    return header
+
+
+def detect_architecture(keys: list[str]) -> str:
+    """Classify a model from its tensor names."""
+    key_set = set(keys)
+
+    def has_prefix(prefix: str) -> bool:
+        return any(k.startswith(prefix) for k in keys)
+
+    lora_markers = (".lora_down.", ".lora.down.", ".lora_A.")
+    if any(k.startswith("lora_") or any(m in k for m in lora_markers) for k in keys):
+        return LORA
+    if has_prefix("conditioner.embedders.1."):
+        return SDXL
+    if has_prefix("conditioner.embedders.0.model."):
+        # The refiner conditions on OpenCLIP bigG alone
+        return SDXL_REFINER
+    if has_prefix("cond_stage_model.model."):
+        return SD2
+    if has_prefix("model.diffusion_model.") or has_prefix("cond_stage_model.transformer."):
+        return SD15
+    if has_prefix("encoder.") and has_prefix("decoder.") and "quant_conv.weight" in key_set:
+        return VAE
+    return UNKNOWN
+
+
+def inspect_safetensors(path: Path) -> SafetensorsInfo:
+    """Describe a safetensors file from its header alone."""
+    header = read_header(path)
+    raw_metadata = header.pop("__metadata__", None) or {}
+    if not isinstance(raw_metadata, dict):
+        raise ValueError(f"{path.name}: safetensors __metadata__ is not an object")
+    dtypes: dict[str, int] = {}
+    total = 0
+    for name, tensor in header.items():
+        shape = tensor.get("shape", []) if isinstance(tensor, dict) else None
+        dtype = tensor.get("dtype", "?") if isinstance(tensor, dict) else None
+        if (
+            not isinstance(shape, list)
+            or not all(isinstance(d, int) and d >= 0 for d in shape)
+            or not isinstance(dtype, str)
+        ):
+            raise ValueError(f"{path.name}: malformed safetensors entry {name!r}")
+        count = math.prod(shape)
+        dtypes[dtype] = dtypes.get(dtype, 0) + count
+        total += count
+    return SafetensorsInfo(
+        architecture=detect_architecture(list(header)),
+        tensor_count=len(header),
+        parameter_count=total,
+        dtypes=dtypes,
+        metadata={str(k): str(v) for k, v in raw_metadata.items()},
+    )
@@ -1,27 +1,54 @@
 """Pydantic request/response schemas."""
 
-from forge.schemas.gallery import GalleryImageResponse, GalleryListResponse
+from forge.schemas.gallery import (
+    FileTaskResponse,
+    GalleryBulkAction,
+    GalleryBulkRequest,
+    GalleryBulkResponse,
+    GalleryFilter,
+    GalleryImageResponse,
+    GalleryListResponse,
+    SimilarImageResponse,
+    SimilarImagesResponse,
+)
 from forge.schemas.generation import (
+    FeatureCacheOptions,
     GenerateRequest,
     GenerationMode,
     GenerationResult,
+    HiresFix,
     JobResponse,
     JobStatus,
+    LoraSpec,
     ProgressUpdate,
+    SamplerInfo,
+    UpscaleOptions,
 )
 from forge.schemas.models import ModelInfo, ModelListResponse
 from forge.schemas.system import SystemInfoResponse
 
 __all__ = [
+    "FeatureCacheOptions",
+    "FileTaskResponse",
+    "GalleryBulkAction",
+    "GalleryBulkRequest",
+    "GalleryBulkResponse",
+    "GalleryFilter",
     "GalleryImageResponse",
     "GalleryListResponse",
     "GenerateRequest",
     "GenerationMode",
     "GenerationResult",
+    "HiresFix",
     "JobResponse",
     "JobStatus",
+    "LoraSpec",
     "ModelInfo",
     "ModelListResponse",
     "ProgressUpdate",
+    "SamplerInfo",
+    "SimilarImageResponse",
+    "SimilarImagesResponse",
     "SystemInfoResponse",
+    "UpscaleOptions",
 ]
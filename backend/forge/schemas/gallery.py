@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 from datetime import datetime
+from enum import StrEnum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, model_validator
 
 
 class GalleryImageResponse(BaseModel):
@@ -24,6 +25,21 @@ class GalleryImageResponse(BaseModel):
     created_at: datetime
 
 
+class SimilarImageResponse(GalleryImageResponse):
+    """Gallery image with its similarity to the query image."""
+
+    score: float
+    distance: int | None = None  # Hamming distance for perceptual hashes
+
+
+class SimilarImagesResponse(BaseModel):
+    """Images most similar to a query image."""
+
+    image_id: str
+    method: str
+    images: list[SimilarImageResponse]
+
+
 class GalleryListResponse(BaseModel):
     """Paginated gallery response."""
 
@@ -31,3 +47,79 @@ class GalleryListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+
+
+class GalleryBulkAction(StrEnum):
+    FAVORITE = "favorite"
+    UNFAVORITE = "unfavorite"
+    DELETE = "delete"
+    MOVE = "move"
+
+
+class GalleryFilter(BaseModel):
+    """Selects gallery images by attributes instead of by id.
+
+    An empty filter would match the whole gallery, so it's rejected;
+    selecting everything takes an explicit ``all: true``. Unknown keys are
+    rejected too, so a misspelled condition can't silently widen the match.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    all: bool = False
+    favorites_only: bool = False
+    job_id: str | None = None
+    model_id: str | None = None
+    prompt_contains: str | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+
+    @model_validator(mode="after")
+    def _check_conditions(self) -> GalleryFilter:
+        active = (
+            self.favorites_only
+            or self.job_id
+            or self.model_id
+            or self.prompt_contains
+            or self.created_after is not None
+            or self.created_before is not None
+        )
+        if not active and not self.all:
+            raise ValueError("Filter has no conditions; set 'all': true to select every image")
+        return self
+
+
+class GalleryBulkRequest(BaseModel):
+    """Apply one action to many images, selected by ``ids`` or ``filter``."""
+
+    action: GalleryBulkAction
+    ids: list[str] | None = None
+    filter: GalleryFilter | None = None
+    destination: str = ""  # folder under the outputs dir, for MOVE
+
+    @model_validator(mode="after")
+    def _check_selection(self) -> GalleryBulkRequest:
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of 'ids' or 'filter'")
+        if self.action == GalleryBulkAction.MOVE and not self.destination:
+            raise ValueError("'destination' is required for move")
+        return self
+
+
+class FileTaskResponse(BaseModel):
+    """Progress of a background file operation."""
+
+    id: str
+    kind: str
+    total: int
+    done: int
+    failed: int
+    status: str
+
+
+class GalleryBulkResponse(BaseModel):
+    """Result of a bulk gallery operation."""
+
+    action: GalleryBulkAction
+    matched: int
+    task: FileTaskResponse | None = None
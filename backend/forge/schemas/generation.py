@@ -4,8 +4,11 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import StrEnum
+from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from forge.backends.samplers import resolve_sampler
 
 
 class GenerationMode(StrEnum):
@@ -16,6 +19,10 @@ class GenerationMode(StrEnum):
     UPSCALE = "upscale"
 
 
+# Modes that start from an uploaded source image
+SOURCE_MODES = (GenerationMode.IMG2IMG, GenerationMode.INPAINT, GenerationMode.OUTPAINT)
+
+
 class JobStatus(StrEnum):
     QUEUED = "queued"
     RUNNING = "running"
@@ -24,6 +31,38 @@ class JobStatus(StrEnum):
     CANCELLED = "cancelled"
 
 
+class LoraSpec(BaseModel):
+    """A LoRA adapter to apply to a generation."""
+
+    id: str = Field(min_length=1)  # model id from the loras directory
+    weight: float = Field(default=1.0, ge=-4.0, le=4.0)
+
+
+class HiresFix(BaseModel):
+    """Generate at the model's native size, upscale, then refine at width x height."""
+
+    upscaler: Literal["latent", "lanczos"] = "latent"
+    steps: int = Field(default=0, ge=0, le=150)  # refinement steps, 0 = steps x denoise
+    denoise: float = Field(default=0.5, ge=0.05, le=1.0)
+
+
+class FeatureCacheOptions(BaseModel):
+    """Reuse the UNet's deep features between full steps: faster, slightly less detail."""
+
+    interval: int = Field(default=3, ge=2, le=10)  # a full UNet step every N steps
+    # Also run a full step once shallow features drift this much (0 = fixed interval)
+    guard: float = Field(default=0.2, ge=0.0, le=1.0)
+
+
+class UpscaleOptions(BaseModel):
+    """Upscale the source image by ``scale``, tile by tile."""
+
+    upscaler: str = ""  # model id from the upscalers directory; "" = Lanczos
+    scale: float = Field(default=4.0, ge=1.0, le=8.0)
+    tile_size: int = Field(default=512, ge=64, le=2048)
+    tile_overlap: int = Field(default=32, ge=0, le=256)
+
+
 class GenerateRequest(BaseModel):
     """Request to generate an image."""
 
@@ -31,6 +70,8 @@ class GenerateRequest(BaseModel):
     prompt: str = ""
     negative_prompt: str = ""
     model_id: str = ""
+    vae: str = ""  # VAE override (a model id from the vaes directory)
+    loras: list[LoraSpec] = Field(default_factory=list, max_length=8)
     width: int = Field(default=512, ge=64, le=2048, multiple_of=8)
     height: int = Field(default=512, ge=64, le=2048, multiple_of=8)
     steps: int = Field(default=30, ge=1, le=150)
@@ -38,6 +79,44 @@ class GenerateRequest(BaseModel):
     seed: int = Field(default=-1)
     sampler: str = "euler_a"
     batch_size: int = Field(default=1, ge=1, le=4)
+    hires: HiresFix | None = None  # txt2img only
+    feature_cache: FeatureCacheOptions | None = None  # draft-quality acceleration
+    # Upload ids (POST /api/uploads). The source is resized to width x height,
+    # or for outpaint centered on that canvas; white mask pixels are repainted.
+    source_image: str = ""
+    mask_image: str = ""
+    # How far img2img/inpaint may depart from the source (outpaint uses 1.0)
+    strength: float = Field(default=0.75, gt=0.0, le=1.0)
+    # "masked" inpaints only the mask's bounding box (plus mask_padding of
+    # context) at the model's native size, when that's cheaper than the canvas
+    inpaint_area: Literal["full", "masked"] = "masked"
+    mask_padding: int = Field(default=32, ge=0, le=512)
+    upscale: UpscaleOptions = Field(default_factory=UpscaleOptions)  # upscale mode only
+
+    @field_validator("sampler")
+    @classmethod
+    def _known_sampler(cls, value: str) -> str:
+        return resolve_sampler(value).name
+
+    @model_validator(mode="after")
+    def _mode_inputs(self) -> GenerateRequest:
+        needs_source = self.mode in SOURCE_MODES or self.mode == GenerationMode.UPSCALE
+        if needs_source and not self.source_image:
+            raise ValueError(f"{self.mode} needs a source_image")
+        if self.mode == GenerationMode.INPAINT and not self.mask_image:
+            raise ValueError("inpaint needs a mask_image")
+        return self
+
+
+class SamplerInfo(BaseModel):
+    """A sampler and the settings it reaches full quality at."""
+
+    name: str
+    label: str
+    recommended_steps: list[int]
+    recommended_cfg: list[float]
+    distilled: bool = False  # needs an LCM/TCD-distilled model or LoRA
+    description: str = ""
 
 
 class ProgressUpdate(BaseModel):
@@ -48,6 +127,9 @@ class ProgressUpdate(BaseModel):
     total_steps: int
     percentage: float
     preview_image: str | None = None  # base64 JPEG
+    # Which pass is running, for multi-pass jobs such as hires fix
+    pass_index: int = 1
+    total_passes: int = 1
 
 
 class GenerationResult(BaseModel):
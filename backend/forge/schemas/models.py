@@ -13,7 +13,8 @@ class ModelInfo(BaseModel):
     filename: str
     type: str  # checkpoint, lora, vae, controlnet, upscaler
     size_bytes: int
-    hash: str = ""
+    hash: str = ""  # AutoV2 short hash
+    sha256: str = ""
     metadata: dict = {}
 
 
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from pydantic import BaseModel
 
 
@@ -20,3 +22,5 @@ class SystemInfoResponse(BaseModel):
     models_loaded: list[str] = []
     queue_length: int = 0
     python_version: str = ""
+    # Active weight quantization mode and measured memory/speed per loaded model
+    quantization: dict[str, Any] = {}
@@ -0,0 +1,85 @@
+"""Image feature extraction for similarity search.
+
+Two features are computed per image:
+
+* a 64-bit DCT perceptual hash (pHash), robust to resizing and mild edits
+  and compared by Hamming distance — good for near-duplicate detection;
+* an optional compact CPU embedding (colour layout + hue/saturation
+  histogram, L2-normalised) compared by cosine similarity — a cheap
+  "more like this" signal that needs no model.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image
+
+PHASH_SIZE = 32  # DCT input resolution
+PHASH_BITS = 8  # low-frequency block kept from the DCT → 64-bit hash
+
+LAYOUT_GRID = 8
+HUE_BINS = 16
+SAT_BINS = 4
+EMBEDDING_DIM = LAYOUT_GRID * LAYOUT_GRID * 3 + HUE_BINS * SAT_BINS
+
+
+@dataclass
+class ImageFeatures:
+    """Features extracted from a single image."""
+
+    phash: int
+    embedding: np.ndarray | None = None  # float32[EMBEDDING_DIM]
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so ``M @ x @ M.T`` is the 2-D DCT of ``x``."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    m[0] /= np.sqrt(2.0)
+    return m
+
+
+_DCT = _dct_matrix(PHASH_SIZE)
+
+
+def perceptual_hash(img: Image.Image) -> int:
+    """Compute the 64-bit DCT perceptual hash of ``img``."""
+    gray = img.convert("L").resize((PHASH_SIZE, PHASH_SIZE), Image.Resampling.LANCZOS)
+    pixels = np.asarray(gray, dtype=np.float64)
+    dct = _DCT @ pixels @ _DCT.T
+    low = dct[:PHASH_BITS, :PHASH_BITS].ravel()
+    # Exclude the DC term from the median so overall brightness doesn't dominate
+    bits = low > np.median(low[1:])
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def image_embedding(img: Image.Image) -> np.ndarray:
+    """Compute a small L2-normalised colour/layout embedding of ``img``."""
+    layout = img.convert("YCbCr").resize((LAYOUT_GRID, LAYOUT_GRID), Image.Resampling.BOX)
+    layout_vec = np.asarray(layout, dtype=np.float32).ravel() / 255.0
+    layout_vec -= layout_vec.mean()
+
+    hsv = np.asarray(img.convert("HSV").resize((64, 64)), dtype=np.int32)
+    hue = hsv[..., 0] * HUE_BINS // 256
+    sat = hsv[..., 1] * SAT_BINS // 256
+    hist = np.bincount((hue * SAT_BINS + sat).ravel(), minlength=HUE_BINS * SAT_BINS)
+    hist_vec = np.sqrt(hist.astype(np.float32) / hist.sum())
+
+    vec = np.concatenate([layout_vec, hist_vec])
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm > 0 else vec
+
+
+def extract_features(img: Image.Image, embeddings: bool = False) -> ImageFeatures:
+    """Extract the perceptual hash and, optionally, the embedding."""
+    return ImageFeatures(
+        phash=perceptual_hash(img),
+        embedding=image_embedding(img) if embeddings else None,
+    )
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
@@ -0,0 +1,188 @@
+"""Background file I/O for gallery housekeeping (bulk delete/move, import).
+
+Database changes for bulk deletes commit in a single transaction on the
+request path; the slow part — unlinking or renaming tens of thousands of
+image and thumbnail files — runs here in chunks on a worker thread, with
+``gallery:task_progress`` events published after each chunk. Moves repoint
+their rows after each chunk, and a chunk already on the worker thread is
+finished and committed even when the task is cancelled, so rows never
+point at files that have moved.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import shutil
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from forge.core.events import EventBus
+
+logger = logging.getLogger("forge.storage.tasks")
+
+CHUNK_SIZE = 256
+
+
+@dataclass
+class FileTask:
+    """Progress of one background file operation."""
+
+    id: str
+    kind: str  # "delete" | "move" | "import"
+    total: int
+    done: int = 0
+    failed: int = 0
+    status: str = "running"  # running | completed | failed
+    errors: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "status": self.status,
+        }
+
+
+def _unlink_chunk(paths: list[str]) -> list[str]:
+    """Delete files, returning paths that could not be removed."""
+    failed = []
+    for path in paths:
+        try:
+            Path(path).unlink(missing_ok=True)
+        except OSError as exc:
+            logger.warning("Could not delete %s: %s", path, exc)
+            failed.append(path)
+    return failed
+
+
+def _move_chunk(moves: list[tuple[str, str]]) -> list[str]:
+    """Move files, returning source paths that could not be moved."""
+    failed = []
+    for src, dst in moves:
+        if not src or src == dst:
+            continue
+        try:
+            Path(dst).parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(src, dst)
+        except OSError as exc:
+            logger.warning("Could not move %s -> %s: %s", src, dst, exc)
+            failed.append(src)
+    return failed
+
+
+class FileTaskRunner:
+    """Runs bulk file operations off the event loop with progress events."""
+
+    def __init__(self, event_bus: EventBus, chunk_size: int = CHUNK_SIZE) -> None:
+        self._event_bus = event_bus
+        self._chunk_size = chunk_size
+        self._tasks: dict[str, FileTask] = {}
+        self._running: set[asyncio.Task] = set()
+
+    def submit(
+        self, kind: str, total: int, work: Callable[[FileTask], Awaitable[None]]
+    ) -> FileTask:
+        """Run ``work(task)`` in the background; it updates ``task`` and calls ``report``."""
+        task = FileTask(id=uuid.uuid4().hex[:12], kind=kind, total=total)
+        self._start(task, work(task))
+        return task
+
+    def submit_delete(self, paths: list[str]) -> FileTask:
+        """Unlink ``paths`` in the background."""
+        return self.submit("delete", len(paths), lambda task: self._run_delete(task, paths))
+
+    def submit_move(
+        self,
+        moves: list[tuple[str, str]],
+        on_chunk: Callable[[list[tuple[str, str]], set[str]], Awaitable[None]] | None = None,
+    ) -> FileTask:
+        """Move ``(src, dst)`` pairs in the background.
+
+        ``on_chunk`` is awaited after each chunk with its moves and the set
+        of source paths among them that failed to move.
+        """
+        return self.submit(
+            "move", len(moves), lambda task: self._run_move(task, moves, on_chunk)
+        )
+
+    def get(self, task_id: str) -> FileTask | None:
+        return self._tasks.get(task_id)
+
+    def active(self, kind: str) -> FileTask | None:
+        """The running task of ``kind``, if any."""
+        for task in self._tasks.values():
+            if task.kind == kind and task.status == "running":
+                return task
+        return None
+
+    async def report(self, task: FileTask) -> None:
+        """Publish a progress event for ``task``."""
+        await self._event_bus.publish({"type": "gallery:task_progress", **task.to_dict()})
+
+    async def stop(self) -> None:
+        """Cancel any in-flight file operations."""
+        for t in list(self._running):
+            t.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await t
+
+    def _start(self, task: FileTask, coro: Awaitable[None]) -> None:
+        self._tasks[task.id] = task
+        runner = asyncio.create_task(self._guard(task, coro))
+        self._running.add(runner)
+        runner.add_done_callback(self._running.discard)
+
+    async def _guard(self, task: FileTask, coro: Awaitable[None]) -> None:
+        try:
+            await coro
+            task.status = "completed"
+        except Exception as exc:
+            logger.exception("File task %s failed", task.id)
+            task.status = "failed"
+            task.errors.append(str(exc))
+        await self.report(task)
+
+    async def _run_delete(self, task: FileTask, paths: list[str]) -> None:
+        for i in range(0, len(paths), self._chunk_size):
+            chunk = paths[i : i + self._chunk_size]
+            failed = await asyncio.to_thread(_unlink_chunk, chunk)
+            task.done += len(chunk)
+            task.failed += len(failed)
+            await self.report(task)
+
+    async def _run_move(
+        self,
+        task: FileTask,
+        moves: list[tuple[str, str]],
+        on_chunk: Callable[[list[tuple[str, str]], set[str]], Awaitable[None]] | None,
+    ) -> None:
+        for i in range(0, len(moves), self._chunk_size):
+            chunk = moves[i : i + self._chunk_size]
+            step = asyncio.ensure_future(self._move_chunk(task, chunk, on_chunk))
+            try:
+                await asyncio.shield(step)
+            except asyncio.CancelledError:
+                # The files are moving regardless; let their rows catch up
+                await step
+                raise
+
+    async def _move_chunk(
+        self,
+        task: FileTask,
+        chunk: list[tuple[str, str]],
+        on_chunk: Callable[[list[tuple[str, str]], set[str]], Awaitable[None]] | None,
+    ) -> None:
+        failed = await asyncio.to_thread(_move_chunk, chunk)
+        if on_chunk is not None:
+            await on_chunk(chunk, set(failed))
+        task.done += len(chunk)
+        task.failed += len(failed)
+        await self.report(task)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import uuid
 from datetime import UTC, datetime
@@ -10,6 +11,9 @@ from typing import Any
 
 from PIL import Image, PngImagePlugin
 
+from forge.storage.features import extract_features
+from forge.storage.similarity import get_similarity_index
+
 logger = logging.getLogger("forge.storage")
 
 THUMBNAIL_SIZE = 256
@@ -20,9 +24,19 @@ async def save_generation_images(
     job_id: str,
     seed: int,
     outputs_dir: Path,
+    similarity_index: bool = True,
+    embeddings: bool = False,
+    params: dict[str, Any] | None = None,
 ) -> list[dict[str, Any]]:
     """Save PIL images to disk with thumbnails and metadata.
 
+    When ``params`` (the job's request dict) is given, it is embedded in each
+    PNG so the gallery can be rebuilt from the files alone.
+
+    When ``similarity_index`` is set, each image's perceptual hash (and, with
+    ``embeddings``, its colour/layout embedding) is appended to the outputs
+    directory's similarity index.
+
     Returns list of image info dicts for DB storage.
     """
     date_str = datetime.now(UTC).strftime("%Y-%m-%d")
@@ -33,6 +47,7 @@ async def save_generation_images(
     thumb_dir.mkdir(exist_ok=True)
 
     results = []
+    indexed = []
     for i, img in enumerate(images):
         img_id = uuid.uuid4().hex[:12]
         filename = f"forge_{img_id}.png"
@@ -40,28 +55,77 @@ async def save_generation_images(
 
         # Save full image
         file_path = output_dir / filename
-        img.save(str(file_path), "PNG")
+        png_info = None
+        if params is not None:
+            png_info = PngImagePlugin.PngInfo()
+            for key, value in build_png_metadata(params, job_id, seed + i).items():
+                png_info.add_text(key, value)
+        img.save(str(file_path), "PNG", pnginfo=png_info)
 
         # Save thumbnail
         thumb_path = thumb_dir / thumb_filename
-        thumb = img.copy()
-        thumb.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.Resampling.LANCZOS)
-        thumb.save(str(thumb_path), "JPEG", quality=85)
-
-        results.append(
-            {
-                "id": img_id,
-                "file_path": str(file_path),
-                "thumbnail_path": str(thumb_path),
-                "width": img.width,
-                "height": img.height,
-                "seed": seed + i,
-            }
-        )
+        save_thumbnail(img, thumb_path)
+
+        info = {
+            "id": img_id,
+            "file_path": str(file_path),
+            "thumbnail_path": str(thumb_path),
+            "width": img.width,
+            "height": img.height,
+            "seed": seed + i,
+        }
+
+        if similarity_index:
+            features = extract_features(img, embeddings=embeddings)
+            indexed.append((img_id, features))
+            info["phash"] = f"{features.phash:016x}"
+
+        results.append(info)
+
+    if indexed:
+        get_similarity_index(outputs_dir).add_many(indexed)
 
     return results
 
 
+def thumbnail_path_for(file_path: Path) -> Path:
+    """Where the thumbnail for an output image lives."""
+    return file_path.parent / "thumbnails" / f"{file_path.stem}_thumb.jpg"
+
+
+def save_thumbnail(img: Image.Image, thumb_path: Path) -> None:
+    thumb = img.copy()
+    thumb.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.Resampling.LANCZOS)
+    if thumb.mode not in ("RGB", "L"):
+        thumb = thumb.convert("RGB")
+    thumb.save(str(thumb_path), "JPEG", quality=85)
+
+
+def build_png_metadata(params: dict[str, Any], job_id: str, seed: int) -> dict[str, str]:
+    """PNG text chunks for a generated image.
+
+    ``parameters`` follows the A1111 layout so other tools can read it;
+    ``forge`` carries the full request as JSON for lossless re-import.
+    """
+    lines = [params.get("prompt", "")]
+    if params.get("negative_prompt"):
+        lines.append(f"Negative prompt: {params['negative_prompt']}")
+    settings = [
+        f"Steps: {params.get('steps', '')}",
+        f"Sampler: {params.get('sampler', '')}",
+        f"CFG scale: {params.get('cfg_scale', '')}",
+        f"Seed: {seed}",
+        f"Size: {params.get('width', '')}x{params.get('height', '')}",
+    ]
+    if params.get("model_id"):
+        settings.append(f"Model: {params['model_id']}")
+    lines.append(", ".join(settings))
+    return {
+        "parameters": "\n".join(lines),
+        "forge": json.dumps({**params, "job_id": job_id, "seed": seed}, default=str),
+    }
+
+
 def embed_png_metadata(file_path: Path, metadata: dict[str, str]) -> None:
     """Embed metadata into PNG tEXt chunks (A1111-compatible)."""
     img = Image.open(file_path)
@@ -0,0 +1,323 @@
+"""Gallery importer — rebuild ``generated_images`` rows from the outputs tree.
+
+If the database is lost or moved, every file under ``<outputs>/<date>/`` is
+invisible to the gallery. The importer walks the outputs directory, reads
+each image's dimensions and embedded parameters from its header (PIL opens
+lazily, so pixels are only decoded when a missing thumbnail has to be
+regenerated) in a process pool, and bulk-upserts the rows in large batches.
+
+Progress is recorded per file in ``imported_files`` keyed by path + mtime,
+and each batch commits on its own, so an interrupted import resumes where it
+stopped and later runs only touch new or modified files.
+
+Usage:
+    python -m forge.storage.importer [--workers N] [--no-thumbnails]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import re
+import uuid
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from forge.db.tables import GeneratedImage, ImportedFile
+from forge.storage.images import save_thumbnail, thumbnail_path_for
+from forge.storage.similarity import INDEX_DIRNAME
+
+logger = logging.getLogger("forge.storage.importer")
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp"}
+SKIP_DIRS = {"thumbnails", INDEX_DIRNAME}
+CHUNK_SIZE = 256  # files per process-pool task
+BATCH_SIZE = 2000  # rows per committed transaction
+
+_FORGE_NAME = re.compile(r"^forge_([0-9a-f]{12})$")
+_A1111_SETTING = re.compile(r"\s*([\w ]+):\s*([^,]+)")
+
+
+@dataclass
+class ImportStats:
+    scanned: int = 0
+    skipped: int = 0
+    imported: int = 0
+    updated: int = 0
+    thumbnails: int = 0
+    failed: int = 0
+
+
+def scan_outputs(outputs_dir: Path) -> list[tuple[str, int, int]]:
+    """Return ``(path, mtime_ns, size)`` for every image under ``outputs_dir``."""
+    found = []
+    stack = [outputs_dir]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS and not entry.name.startswith("."):
+                    stack.append(Path(entry.path))
+            elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                st = entry.stat()
+                found.append((entry.path, st.st_mtime_ns, st.st_size))
+    return found
+
+
+def parse_a1111_parameters(text: str) -> dict[str, Any]:
+    """Parse an A1111 ``parameters`` chunk into Forge request fields."""
+    lines = text.strip().split("\n")
+    settings_line = lines.pop() if lines and "Steps:" in lines[-1] else ""
+    negative = ""
+    for i, line in enumerate(lines):
+        if line.startswith("Negative prompt:"):
+            negative = "\n".join(lines[i:])[len("Negative prompt:") :].strip()
+            lines = lines[:i]
+            break
+
+    fields: dict[str, Any] = {"prompt": "\n".join(lines).strip(), "negative_prompt": negative}
+    settings = {k.strip(): v.strip() for k, v in _A1111_SETTING.findall(settings_line)}
+    if settings.get("Seed", "").lstrip("-").isdigit():
+        fields["seed"] = int(settings["Seed"])
+    if "Model" in settings:
+        fields["model_id"] = settings["Model"]
+    return fields
+
+
+def _read_image(path: str, regenerate_thumbnails: bool) -> dict[str, Any]:
+    """Read one image's header metadata (runs in a worker process)."""
+    with Image.open(path) as img:
+        width, height = img.size
+        info = dict(img.info)
+
+    meta: dict[str, Any] = {}
+    if isinstance(info.get("forge"), str):
+        try:
+            meta = json.loads(info["forge"])
+        except ValueError:
+            meta = {}
+    elif isinstance(info.get("parameters"), str):
+        meta = parse_a1111_parameters(info["parameters"])
+
+    thumb = thumbnail_path_for(Path(path))
+    thumb_created = False
+    if regenerate_thumbnails and not thumb.exists():
+        thumb.parent.mkdir(parents=True, exist_ok=True)
+        with Image.open(path) as img:
+            save_thumbnail(img, thumb)
+        thumb_created = True
+
+    return {
+        "path": path,
+        "width": width,
+        "height": height,
+        "meta": meta,
+        "thumbnail_path": str(thumb) if thumb.exists() else "",
+        "thumb_created": thumb_created,
+    }
+
+
+def _read_chunk(paths: list[str], regenerate_thumbnails: bool) -> list[dict[str, Any]]:
+    results = []
+    for path in paths:
+        try:
+            results.append(_read_image(path, regenerate_thumbnails))
+        except Exception as exc:
+            results.append({"path": path, "error": str(exc)})
+    return results
+
+
+async def _write_batch(
+    session_factory: async_sessionmaker[AsyncSession],
+    images: list[dict[str, Any]],
+    imported: list[dict[str, Any]],
+) -> None:
+    if not images:
+        return
+    image_stmt = sqlite_insert(GeneratedImage)
+    image_stmt = image_stmt.on_conflict_do_update(
+        index_elements=[GeneratedImage.id],
+        set_={c: image_stmt.excluded[c] for c in images[0] if c != "id"},
+    )
+    file_stmt = sqlite_insert(ImportedFile)
+    file_stmt = file_stmt.on_conflict_do_update(
+        index_elements=[ImportedFile.file_path],
+        set_={c: file_stmt.excluded[c] for c in imported[0] if c != "file_path"},
+    )
+    async with session_factory() as session:
+        await session.execute(image_stmt, images)
+        await session.execute(file_stmt, imported)
+        await session.commit()
+
+
+async def import_outputs(
+    outputs_dir: Path,
+    session_factory: async_sessionmaker[AsyncSession],
+    workers: int | None = None,
+    regenerate_thumbnails: bool = True,
+    progress: Callable[[int, int], Awaitable[None]] | None = None,
+) -> ImportStats:
+    """Import new or modified images under ``outputs_dir`` into the gallery."""
+    stats = ImportStats()
+    files = await asyncio.to_thread(scan_outputs, outputs_dir)
+    stats.scanned = len(files)
+
+    async with session_factory() as session:
+        seen = {
+            path: (mtime, image_id)
+            for path, mtime, image_id in await session.execute(
+                select(ImportedFile.file_path, ImportedFile.mtime_ns, ImportedFile.image_id)
+            )
+        }
+        known = {
+            path: image_id
+            for image_id, path in await session.execute(
+                select(GeneratedImage.id, GeneratedImage.file_path)
+            )
+        }
+    taken_ids = set(known.values())
+
+    # Decide what to read and which row id each file maps to
+    todo: dict[str, tuple[int, int, str, bool]] = {}
+    for path, mtime, size in files:
+        previous = seen.get(path)
+        if previous is not None and previous[0] == mtime:
+            stats.skipped += 1
+            continue
+        if previous is None and path in known:
+            # Written by the worker with a live row — nothing to recover
+            stats.skipped += 1
+            continue
+        if previous is not None:
+            todo[path] = (mtime, size, previous[1], True)
+            continue
+        match = _FORGE_NAME.match(Path(path).stem)
+        image_id = match.group(1) if match and match.group(1) not in taken_ids else None
+        image_id = image_id or uuid.uuid4().hex[:12]
+        taken_ids.add(image_id)
+        todo[path] = (mtime, size, image_id, False)
+
+    if progress:
+        await progress(0, len(todo))
+    if not todo:
+        return stats
+
+    paths = list(todo)
+    chunks = [paths[i : i + CHUNK_SIZE] for i in range(0, len(paths), CHUNK_SIZE)]
+    loop = asyncio.get_running_loop()
+    images: list[dict[str, Any]] = []
+    imported: list[dict[str, Any]] = []
+    done = 0
+
+    # spawn, not fork: the server process has live DB and event-loop threads
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        pending = [
+            loop.run_in_executor(pool, _read_chunk, chunk, regenerate_thumbnails)
+            for chunk in chunks
+        ]
+        for next_result in asyncio.as_completed(pending):
+            for result in await next_result:
+                done += 1
+                if "error" in result:
+                    logger.warning("Could not import %s: %s", result["path"], result["error"])
+                    stats.failed += 1
+                    continue
+
+                mtime, size, image_id, is_update = todo[result["path"]]
+                meta = result["meta"]
+                images.append(
+                    {
+                        "id": image_id,
+                        "job_id": str(meta.get("job_id", "")),
+                        "file_path": result["path"],
+                        "thumbnail_path": result["thumbnail_path"],
+                        "width": result["width"],
+                        "height": result["height"],
+                        "seed": int(meta.get("seed", -1)),
+                        "prompt": str(meta.get("prompt", "")),
+                        "negative_prompt": str(meta.get("negative_prompt", "")),
+                        "model_id": str(meta.get("model_id", "")),
+                        "params_json": json.dumps(meta),
+                        "created_at": datetime.fromtimestamp(mtime / 1e9, UTC),
+                    }
+                )
+                imported.append(
+                    {
+                        "file_path": result["path"],
+                        "mtime_ns": mtime,
+                        "size_bytes": size,
+                        "image_id": image_id,
+                    }
+                )
+                stats.thumbnails += result["thumb_created"]
+                if is_update:
+                    stats.updated += 1
+                else:
+                    stats.imported += 1
+
+            if len(images) >= BATCH_SIZE:
+                await _write_batch(session_factory, images, imported)
+                images, imported = [], []
+            if progress:
+                await progress(done, len(todo))
+
+    await _write_batch(session_factory, images, imported)
+    logger.info(
+        "Imported %d new and %d modified images (%d unchanged, %d failed)",
+        stats.imported,
+        stats.updated,
+        stats.skipped,
+        stats.failed,
+    )
+    return stats
+
+
+def main() -> None:
+    from forge.config import load_settings
+    from forge.db.engine import create_engine_and_session, run_migrations
+
+    parser = argparse.ArgumentParser(description="Rebuild the gallery from the outputs directory")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-thumbnails", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    async def _run() -> ImportStats:
+        settings = load_settings()
+        engine, session_factory = create_engine_and_session(
+            settings.paths.resolved_db, settings.database
+        )
+        await run_migrations(engine)
+        try:
+            return await import_outputs(
+                settings.paths.resolved_outputs,
+                session_factory,
+                workers=args.workers,
+                regenerate_thumbnails=not args.no_thumbnails,
+            )
+        finally:
+            await engine.dispose()
+
+    print(asyncio.run(_run()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Memory-mapped similarity index over gallery image features.
+
+Each feature lives in an append-only pair of flat files under
+``<outputs>/.index/``: ``<name>.ids`` holds fixed-width image ids and
+``<name>.vec`` the matching rows (``uint64`` perceptual hashes or
+``float16`` embeddings). New images are appended with plain file writes;
+searches memory-map the files and score every row with vectorised NumPy,
+so nothing is loaded per-row into Python and the OS page cache does the
+caching.
+
+Rows are never rewritten. Deleted images simply stop resolving when the
+caller looks the hits up in the database, and a re-indexed image shadows its
+older row because lookups use the most recent match.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from forge.storage.features import EMBEDDING_DIM, ImageFeatures
+
+ID_WIDTH = 12
+INDEX_DIRNAME = ".index"
+SEARCH_BLOCK_ROWS = 65536  # float16 → float32 conversion happens per block
+
+
+@dataclass
+class SimilarityHit:
+    image_id: str
+    score: float  # 0..1, higher is more similar
+    distance: int | None = None  # Hamming distance, for perceptual hashes
+
+
+class _FeatureStore:
+    """Append-only ids + fixed-width vectors, memory-mapped for reads."""
+
+    def __init__(self, index_dir: Path, name: str, dtype: np.dtype, width: int) -> None:
+        self._ids_path = index_dir / f"{name}.ids"
+        self._vec_path = index_dir / f"{name}.vec"
+        self._dtype = np.dtype(dtype)
+        self._width = width
+        self._row_bytes = self._dtype.itemsize * width
+        self._ids: np.memmap | None = None
+        self._vecs: np.memmap | None = None
+        self._mapped_rows = 0
+        self._repair()
+
+    def _file_rows(self) -> int:
+        ids = self._ids_path.stat().st_size // ID_WIDTH if self._ids_path.exists() else 0
+        vecs = self._vec_path.stat().st_size // self._row_bytes if self._vec_path.exists() else 0
+        return min(ids, vecs)
+
+    def _repair(self) -> None:
+        """Trim a torn trailing append so ids and vectors stay aligned."""
+        rows = self._file_rows()
+        for path, width in ((self._ids_path, ID_WIDTH), (self._vec_path, self._row_bytes)):
+            if path.exists() and path.stat().st_size != rows * width:
+                with open(path, "r+b") as f:
+                    f.truncate(rows * width)
+
+    def append(self, ids: list[str], vectors: np.ndarray) -> None:
+        vectors = np.ascontiguousarray(vectors, dtype=self._dtype).reshape(len(ids), self._width)
+        packed = np.array([i.encode()[:ID_WIDTH] for i in ids], dtype=f"S{ID_WIDTH}")
+        # Vectors first: a crash between the two writes leaves an orphan
+        # vector that _repair() trims, never an id pointing at garbage.
+        with open(self._vec_path, "ab") as f:
+            f.write(vectors.tobytes())
+        with open(self._ids_path, "ab") as f:
+            f.write(packed.tobytes())
+
+    def mapped(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return (ids, vectors) views over every row currently on disk."""
+        rows = self._file_rows()
+        if rows == 0:
+            return np.empty(0, dtype=f"S{ID_WIDTH}"), np.empty((0, self._width), self._dtype)
+        if rows != self._mapped_rows:
+            self._ids = np.memmap(self._ids_path, dtype=f"S{ID_WIDTH}", mode="r", shape=(rows,))
+            self._vecs = np.memmap(
+                self._vec_path, dtype=self._dtype, mode="r", shape=(rows, self._width)
+            )
+            self._mapped_rows = rows
+        return self._ids, self._vecs
+
+    def lookup(self, image_id: str) -> np.ndarray | None:
+        ids, vecs = self.mapped()
+        rows = np.flatnonzero(ids == image_id.encode())
+        if len(rows) == 0:
+            return None
+        return np.array(vecs[rows[-1]])
+
+    def __len__(self) -> int:
+        return self._file_rows()
+
+
+def _popcount64(x: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x)
+    return np.unpackbits(x.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` largest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    part = np.argpartition(-scores, k)[:k]
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+class SimilarityIndex:
+    """Perceptual-hash and embedding index for one outputs directory."""
+
+    def __init__(self, index_dir: Path) -> None:
+        index_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._phash = _FeatureStore(index_dir, "phash", np.dtype("<u8"), 1)
+        self._embedding = _FeatureStore(index_dir, "embedding", np.dtype("<f2"), EMBEDDING_DIM)
+
+    def add(self, image_id: str, features: ImageFeatures) -> None:
+        """Append one image's features."""
+        self.add_many([(image_id, features)])
+
+    def add_many(self, items: list[tuple[str, ImageFeatures]]) -> None:
+        """Append features for several images with one write per file."""
+        if not items:
+            return
+        with self._lock:
+            self._phash.append(
+                [i for i, _ in items],
+                np.array([[f.phash] for _, f in items], dtype=np.uint64),
+            )
+            with_embedding = [(i, f.embedding) for i, f in items if f.embedding is not None]
+            if with_embedding:
+                self._embedding.append(
+                    [i for i, _ in with_embedding],
+                    np.stack([e for _, e in with_embedding]),
+                )
+
+    def has(self, image_id: str, method: str = "phash") -> bool:
+        with self._lock:
+            return self._store(method).lookup(image_id) is not None
+
+    def search(self, image_id: str, k: int = 20, method: str = "phash") -> list[SimilarityHit]:
+        """Return the ``k`` images most similar to ``image_id`` (excluding itself)."""
+        with self._lock:
+            store = self._store(method)
+            query = store.lookup(image_id)
+            if query is None:
+                return []
+            ids, vecs = store.mapped()
+
+        if method == "phash":
+            distances = _popcount64(vecs[:, 0] ^ query[0]).astype(np.int32)
+            scores = 1.0 - distances / 64.0
+        else:
+            q = query.astype(np.float32)
+            scores = np.empty(len(vecs), dtype=np.float32)
+            for start in range(0, len(vecs), SEARCH_BLOCK_ROWS):
+                block = vecs[start : start + SEARCH_BLOCK_ROWS].astype(np.float32)
+                scores[start : start + len(block)] = block @ q
+            distances = None
+
+        # Mask out every row of the query image itself
+        scores = np.where(ids == image_id.encode(), -np.inf, scores)
+
+        hits = []
+        seen: set[bytes] = set()
+        # Over-fetch so duplicate rows for re-indexed images don't starve the result
+        for row in _top_k(scores, min(len(scores), k * 2 + 8)):
+            if not np.isfinite(scores[row]) or ids[row] in seen:
+                continue
+            seen.add(ids[row])
+            hits.append(
+                SimilarityHit(
+                    image_id=ids[row].decode(),
+                    score=float(scores[row]),
+                    distance=int(distances[row]) if distances is not None else None,
+                )
+            )
+            if len(hits) == k:
+                break
+        return hits
+
+    def __len__(self) -> int:
+        return len(self._phash)
+
+    def _store(self, method: str) -> _FeatureStore:
+        if method == "phash":
+            return self._phash
+        if method == "embedding":
+            return self._embedding
+        raise ValueError(f"Unknown similarity method: {method}")
+
+
+_indexes: dict[Path, SimilarityIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_similarity_index(outputs_dir: Path) -> SimilarityIndex:
+    """Return the shared index for ``outputs_dir``, opening it on first use."""
+    key = outputs_dir.resolve()
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = SimilarityIndex(key / INDEX_DIRNAME)
+        return _indexes[key]
@@ -0,0 +1,119 @@
+"""Source and mask images uploaded for img2img, inpaint and outpaint jobs.
+
+Uploads arrive as a raw request body and are streamed to a temporary file
+while being hashed, so a large image is never held in memory whole. The
+file is then stored under its content hash: uploading the same image twice
+gives the same id and a single file. Gallery images are copied in the same
+way when sent to img2img, so editing one is an ordinary upload.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import re
+import uuid
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, ImageOps
+
+UPLOAD_ID = re.compile(r"[0-9a-f]{32}")
+TMP_PREFIX = ".tmp-"
+# Accepted formats and the suffix each is stored with
+IMAGE_FORMATS = {"PNG": ".png", "JPEG": ".jpg", "WEBP": ".webp"}
+COPY_CHUNK = 1024 * 1024
+
+
+class UploadError(ValueError):
+    """An upload was rejected; ``status_code`` is the HTTP status to report."""
+
+    def __init__(self, message: str, status_code: int = 400) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+async def save_upload(
+    chunks: AsyncIterator[bytes], uploads_dir: Path, max_bytes: int
+) -> dict[str, Any]:
+    """Stream an uploaded image to disk; returns its id, size and format."""
+    uploads_dir.mkdir(parents=True, exist_ok=True)
+    tmp = uploads_dir / f"{TMP_PREFIX}{uuid.uuid4().hex}"
+    digest = hashlib.sha256()
+    received = 0
+    try:
+        with tmp.open("wb") as f:
+            async for chunk in chunks:
+                received += len(chunk)
+                if received > max_bytes:
+                    raise UploadError(
+                        f"Upload exceeds the {max_bytes // (1024 * 1024)}MB limit", 413
+                    )
+                digest.update(chunk)
+                await asyncio.to_thread(f.write, chunk)
+        upload_id = digest.hexdigest()[:32]
+        info = await asyncio.to_thread(_store, tmp, uploads_dir / upload_id)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return {"id": upload_id, **info}
+
+
+def copy_to_uploads(source: Path, uploads_dir: Path) -> dict[str, Any]:
+    """Store an image already on the server (e.g. a generated one) as an upload."""
+    uploads_dir.mkdir(parents=True, exist_ok=True)
+    tmp = uploads_dir / f"{TMP_PREFIX}{uuid.uuid4().hex}"
+    digest = hashlib.sha256()
+    try:
+        with source.open("rb") as src, tmp.open("wb") as dst:
+            while chunk := src.read(COPY_CHUNK):
+                digest.update(chunk)
+                dst.write(chunk)
+        upload_id = digest.hexdigest()[:32]
+        info = _store(tmp, uploads_dir / upload_id)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return {"id": upload_id, **info}
+
+
+def _store(tmp: Path, path: Path) -> dict[str, Any]:
+    """Check the file is an image we can read, then move it into place."""
+    try:
+        with Image.open(tmp) as img:
+            image_format, (width, height) = img.format, img.size
+            img.verify()
+    except Exception as exc:
+        raise UploadError("Upload is not a readable image") from exc
+    if image_format not in IMAGE_FORMATS:
+        raise UploadError(f"Unsupported image format {image_format}; use PNG, JPEG or WebP")
+    path = path.with_suffix(IMAGE_FORMATS[image_format])
+    # Same content, same id: replacing an earlier copy is harmless
+    os.replace(tmp, path)
+    return {
+        "width": width,
+        "height": height,
+        "format": image_format.lower(),
+        "size_bytes": path.stat().st_size,
+    }
+
+
+def upload_path(uploads_dir: Path, upload_id: str) -> Path | None:
+    if not UPLOAD_ID.fullmatch(upload_id):
+        return None
+    for suffix in IMAGE_FORMATS.values():
+        path = uploads_dir / f"{upload_id}{suffix}"
+        if path.is_file():
+            return path
+    return None
+
+
+def load_upload(uploads_dir: Path, upload_id: str, mode: str = "RGB") -> Image.Image:
+    """Open an upload upright (EXIF orientation applied) in ``mode``."""
+    path = upload_path(uploads_dir, upload_id)
+    if path is None:
+        raise FileNotFoundError(f"Upload not found: {upload_id}")
+    with Image.open(path) as img:
+        return ImageOps.exif_transpose(img).convert(mode)
@@ -0,0 +1,30 @@
+"""Shared fixtures for the Forge backend tests."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from forge.config import Settings
+from forge.main import create_app
+
+
+@pytest.fixture
+def settings(tmp_path):
+    """Create test settings with temp directories."""
+    return Settings(
+        paths={"base_dir": str(tmp_path / ".forge")},
+        backend={"active": "diffusers"},
+    )
+
+
+@pytest.fixture
+def app(settings):
+    return create_app(settings)
+
+
+@pytest.fixture
+async def client(app):
+    """Create test HTTP client with full lifespan."""
+    transport = ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
@@ -1,29 +1,10 @@
 """Basic API tests for the Forge backend."""
 
-import pytest
-from httpx import ASGITransport, AsyncClient
-
-from forge.config import Settings
-from forge.main import create_app
-
-
-@pytest.fixture
-def settings(tmp_path):
-    """Create test settings with temp directories."""
-    return Settings(
-        paths={"base_dir": str(tmp_path / ".forge")},
-        backend={"active": "diffusers"},
-    )
-
+import asyncio
+import io
 
-@pytest.fixture
-async def client(settings):
-    """Create test HTTP client with full lifespan."""
-    app = create_app(settings)
-    transport = ASGITransport(app=app)
-    async with app.router.lifespan_context(app):
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            yield client
+import pytest
+from PIL import Image
 
 
 @pytest.mark.asyncio
@@ -71,3 +52,158 @@ async def test_get_settings(client):
 async def test_get_job_not_found(client):
     resp = await client.get("/api/jobs/nonexistent")
     assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_generate_round_trip(client):
+    resp = await client.post(
+        "/api/generate", json={"prompt": "a lighthouse", "steps": 2, "width": 64, "height": 64}
+    )
+    assert resp.status_code == 200
+    job_id = resp.json()["id"]
+
+    for _ in range(100):
+        job = (await client.get(f"/api/jobs/{job_id}")).json()
+        if job["status"] in ("completed", "failed"):
+            break
+        await asyncio.sleep(0.05)
+
+    assert job["status"] == "completed"
+    assert len(job["images"]) == 1
+
+    gallery = (await client.get("/api/gallery")).json()
+    assert gallery["total"] == 1
+    assert gallery["images"][0]["prompt"] == "a lighthouse"
+
+
+@pytest.mark.asyncio
+async def test_generate_hires_round_trip(client):
+    resp = await client.post(
+        "/api/generate",
+        json={
+            "prompt": "a lighthouse",
+            "steps": 2,
+            "width": 1024,
+            "height": 768,
+            "hires": {"denoise": 0.5},
+        },
+    )
+    assert resp.status_code == 200
+    job_id = resp.json()["id"]
+
+    for _ in range(100):
+        job = (await client.get(f"/api/jobs/{job_id}")).json()
+        if job["status"] in ("completed", "failed"):
+            break
+        await asyncio.sleep(0.05)
+
+    assert job["status"] == "completed"
+    assert (job["images"][0]["width"], job["images"][0]["height"]) == (1024, 768)
+
+
+@pytest.mark.asyncio
+async def test_upload_and_inpaint_round_trip(client):
+    def png(color):
+        buffer = io.BytesIO()
+        Image.new("RGB", (64, 64), color).save(buffer, "PNG")
+        return buffer.getvalue()
+
+    source = (await client.post("/api/uploads", content=png("red"))).json()
+    mask = (await client.post("/api/uploads", content=png("white"))).json()
+    assert (await client.get(f"/api/uploads/{source['id']}")).status_code == 200
+    assert (await client.post("/api/uploads", content=b"nope")).status_code == 400
+
+    resp = await client.post(
+        "/api/generate",
+        json={
+            "mode": "inpaint",
+            "prompt": "a lighthouse",
+            "steps": 2,
+            "width": 64,
+            "height": 64,
+            "source_image": source["id"],
+            "mask_image": mask["id"],
+        },
+    )
+    assert resp.status_code == 200
+    job_id = resp.json()["id"]
+
+    for _ in range(100):
+        job = (await client.get(f"/api/jobs/{job_id}")).json()
+        if job["status"] in ("completed", "failed"):
+            break
+        await asyncio.sleep(0.05)
+
+    assert job["status"] == "completed"
+    assert job["mode"] == "inpaint"
+
+    missing = await client.post(
+        "/api/generate", json={"mode": "img2img", "source_image": "0" * 32}
+    )
+    assert missing.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_send_gallery_image_to_uploads(client):
+    resp = await client.post(
+        "/api/generate", json={"prompt": "a harbor", "steps": 1, "width": 64, "height": 64}
+    )
+    job_id = resp.json()["id"]
+    for _ in range(100):
+        job = (await client.get(f"/api/jobs/{job_id}")).json()
+        if job["status"] in ("completed", "failed"):
+            break
+        await asyncio.sleep(0.05)
+    assert job["status"] == "completed"
+
+    image_id = job["images"][0]["id"]
+    upload = (await client.post(f"/api/gallery/{image_id}/upload")).json()
+    assert (upload["width"], upload["height"], upload["format"]) == (64, 64, "png")
+    # Content-addressed: sending it again gives the same upload
+    again = (await client.post(f"/api/gallery/{image_id}/upload")).json()
+    assert again["id"] == upload["id"]
+    assert (await client.get(f"/api/uploads/{upload['id']}")).status_code == 200
+    assert (await client.post("/api/gallery/nope/upload")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_upscale_round_trip(client):
+    buffer = io.BytesIO()
+    Image.new("RGB", (96, 64), "teal").save(buffer, "PNG")
+    source = (await client.post("/api/uploads", content=buffer.getvalue())).json()
+
+    resp = await client.post(
+        "/api/generate",
+        json={
+            "mode": "upscale",
+            "source_image": source["id"],
+            "upscale": {"upscaler": "4x-demo", "scale": 2, "tile_size": 64},
+        },
+    )
+    assert resp.status_code == 200
+    job_id = resp.json()["id"]
+    for _ in range(100):
+        job = (await client.get(f"/api/jobs/{job_id}")).json()
+        if job["status"] in ("completed", "failed"):
+            break
+        await asyncio.sleep(0.05)
+
+    assert job["status"] == "completed"
+    assert (job["images"][0]["width"], job["images"][0]["height"]) == (192, 128)
+    assert (await client.post("/api/generate", json={"mode": "upscale"})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_samplers(client):
+    resp = await client.get("/api/samplers")
+    assert resp.status_code == 200
+    samplers = {s["name"]: s for s in resp.json()}
+    assert {"euler_a", "unipc", "dpm++_2m_karras", "lcm", "tcd"} <= set(samplers)
+    assert samplers["lcm"]["distilled"] is True
+    assert samplers["unipc"]["recommended_steps"][1] <= 15
+
+
+@pytest.mark.asyncio
+async def test_generate_rejects_unknown_sampler(client):
+    resp = await client.post("/api/generate", json={"prompt": "x", "sampler": "nope"})
+    assert resp.status_code == 422
@@ -0,0 +1,62 @@
+"""Tests for torch.compile warm-up bookkeeping."""
+
+from forge.backends.diffusers_backend.compile_cache import (
+    UNET,
+    VAE_DECODER,
+    CompileArtifactCache,
+    CompileState,
+    CompileTarget,
+    artifact_key,
+    warmup_buckets,
+)
+from forge.config import Settings
+
+
+class Owner:
+    def __init__(self):
+        self.module = "eager"
+
+
+def test_warmup_buckets_default_to_native_size():
+    assert warmup_buckets([], 1024) == [(1024, 1024, 1)]
+    assert warmup_buckets([(512, 768), (512, 768), (768, 512)], 512) == [
+        (512, 768, 1),
+        (768, 512, 1),
+    ]
+    assert Settings(gpu={"compile_sizes": [[832, 1216]]}).gpu.compile_sizes == [(832, 1216)]
+
+
+def test_artifact_key_covers_model_dtype_bucket_and_torch():
+    base = artifact_key("abc", "torch.float16", (1024, 1024, 1), "2.7.0")
+    assert base == artifact_key("abc", "torch.float16", (1024, 1024, 1), "2.7.0")
+    assert base != artifact_key("abd", "torch.float16", (1024, 1024, 1), "2.7.0")
+    assert base != artifact_key("abc", "torch.float32", (1024, 1024, 1), "2.7.0")
+    assert base != artifact_key("abc", "torch.float16", (1024, 768, 1), "2.7.0")
+    assert base != artifact_key("abc", "torch.float16", (1024, 1024, 1), "2.8.0")
+
+
+def test_artifact_cache_round_trip(tmp_path):
+    cache = CompileArtifactCache(tmp_path / "artifacts")
+    assert cache.load("k") is None
+    cache.store("k", b"graph")
+    assert cache.load("k") == b"graph"
+    assert [p.name for p in (tmp_path / "artifacts").iterdir()] == ["k.bin"]
+
+
+def test_jobs_use_compiled_modules_only_for_warm_buckets():
+    unet_owner, vae_owner = Owner(), Owner()
+    state = CompileState("abc", [(512, 512, 1)])
+    state.targets[UNET] = CompileTarget(unet_owner, "module", "eager", "compiled")
+    state.targets[VAE_DECODER] = CompileTarget(vae_owner, "module", "eager", "compiled")
+
+    assert state.use((512, 512, 1)) == []
+    state.mark_warm((512, 512, 1), {UNET, VAE_DECODER})
+
+    assert state.use((512, 512, 1), allowed={UNET}) == [UNET]
+    assert (unet_owner.module, vae_owner.module) == ("compiled", "eager")
+    state.restore()
+    assert unet_owner.module == "eager"
+
+    assert state.use((768, 768, 1)) == []
+    state.fail("boom")
+    assert state.use((512, 512, 1)) == [] and state.cancelled.is_set()
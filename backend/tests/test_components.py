@@ -0,0 +1,51 @@
+"""Tests for pipeline component deduplication."""
+
+import gc
+
+from forge.backends.diffusers_backend.components import ComponentRegistry
+
+
+class FakeModule:
+    def __init__(self, layout, weights):
+        self.layout = layout
+        self.weights = weights
+
+
+class FakePipe:
+    def __init__(self, text_encoder, vae):
+        self.text_encoder = text_encoder
+        self.vae = vae
+        self.unet = object()
+
+
+def _registry(fingerprinted):
+    def fingerprint(module):
+        fingerprinted.append(module)
+        return module.weights
+
+    return ComponentRegistry(lambda m: m.layout, fingerprint)
+
+
+def test_identical_components_are_shared():
+    fingerprinted = []
+    registry = _registry(fingerprinted)
+    first = FakePipe(FakeModule("clip", "w1"), FakeModule("vae", "v1"))
+    assert registry.dedupe(first) == []
+    assert fingerprinted == []  # nothing to compare against yet
+
+    second = FakePipe(FakeModule("clip", "w1"), FakeModule("vae", "v2"))
+    assert registry.dedupe(second) == ["text_encoder"]
+    assert second.text_encoder is first.text_encoder
+    assert second.vae is not first.vae
+    assert registry.hits == 1
+
+
+def test_registry_does_not_keep_modules_alive():
+    registry = _registry([])
+    module = FakeModule("clip", "w1")
+    registry.intern(module)
+    del module
+    gc.collect()
+
+    replacement = FakeModule("clip", "w1")
+    assert registry.intern(replacement) is replacement
@@ -0,0 +1,49 @@
+"""Tests for the converted-pipeline disk cache."""
+
+import os
+
+from forge.backends.diffusers_backend.conversion_cache import ConversionCache, conversion_key
+
+
+def _saver(size):
+    def save(directory):
+        directory.mkdir(parents=True)
+        (directory / "model_index.json").write_text("{}")
+        (directory / "unet.safetensors").write_bytes(b"\0" * size)
+
+    return save
+
+
+def test_key_includes_hash_and_dtype():
+    assert conversion_key("ab" * 32, "torch.float16") == "abababababababab-float16"
+
+
+def test_store_lookup_and_lru_eviction(tmp_path):
+    cache = ConversionCache(tmp_path, max_bytes=2500)
+    assert cache.lookup("a") is None
+
+    path = cache.store("a", _saver(1000), source="a.safetensors")
+    assert path == tmp_path / "a"
+    assert (path / "unet.safetensors").exists()
+    cache.store("b", _saver(1000))
+
+    # Make "a" the oldest, then use it so "b" becomes least recently used
+    os.utime(tmp_path / "a" / "forge_conversion.json", (0, 0))
+    assert cache.lookup("a") == path
+    os.utime(tmp_path / "b" / "forge_conversion.json", (1, 1))
+
+    cache.store("c", _saver(1000))
+    assert [e["key"] for e in cache.entries()] == ["c", "a"]
+    assert cache.lookup("b") is None
+
+
+def test_failed_save_leaves_nothing_behind(tmp_path):
+    cache = ConversionCache(tmp_path, max_bytes=10_000)
+
+    def broken(directory):
+        directory.mkdir()
+        (directory / "partial.safetensors").write_bytes(b"\0")
+        raise RuntimeError("disk full")
+
+    assert cache.store("a", broken) is None
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,50 @@
+"""Tests for CPU profile resolution."""
+
+import pytest
+
+from forge.backends.diffusers_backend.cpu_profile import (
+    available_memory,
+    parse_cpu_list,
+    physical_cores,
+    resolve_cpu_profile,
+)
+from forge.config import CPUConfig
+
+# Two physical cores with two hyper-threads each
+CPUINFO = "\n\n".join(
+    f"processor\t: {cpu}\nphysical id\t: 0\ncore id\t\t: {cpu % 2}\n"
+    "flags\t\t: fpu sse avx2 avx512f avx512_bf16"
+    for cpu in range(4)
+)
+
+
+def test_parse_cpu_list():
+    assert parse_cpu_list("0-3,8, 10-11") == [0, 1, 2, 3, 8, 10, 11]
+    assert parse_cpu_list("5") == [5]
+    with pytest.raises(ValueError):
+        parse_cpu_list("3-1")
+
+
+def test_physical_cores_ignore_hyperthreads():
+    assert physical_cores(CPUINFO) == 2
+    assert physical_cores(CPUINFO, [0, 2]) == 1
+    # No topology lines: fall back to the CPUs we may use
+    assert physical_cores("", [0, 1, 2]) == 3
+
+
+def test_profile_resolves_auto_settings():
+    profile = resolve_cpu_profile(CPUConfig(affinity="0-1"), CPUINFO)
+    assert profile.bf16 is True
+    assert profile.intra_op_threads == 2
+    assert profile.affinity == [0, 1]
+
+    profile = resolve_cpu_profile(CPUConfig(bf16="off", intra_op_threads=6), CPUINFO)
+    assert profile.bf16 is False
+    assert profile.intra_op_threads == 6
+    assert resolve_cpu_profile(CPUConfig(), "flags\t: avx2").bf16 is False
+
+
+def test_available_memory_reads_meminfo():
+    meminfo = "MemTotal:       32000000 kB\nMemAvailable:    1024 kB\n"
+    assert available_memory(meminfo) == 1024 * 1024
+    assert available_memory("MemTotal: 1 kB\n") == 0
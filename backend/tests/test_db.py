@@ -0,0 +1,53 @@
+"""Tests for the SQLite engine profile."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from forge.config import DatabaseConfig
+from forge.db.engine import (
+    create_engine_and_session,
+    create_read_engine_and_session,
+    run_migrations,
+)
+from forge.db.tables import Job
+
+
+@pytest.fixture
+async def engines(tmp_path):
+    db_path = tmp_path / "forge.db"
+    config = DatabaseConfig(cache_size_mb=8, busy_timeout_ms=1234)
+    engine, session_factory = create_engine_and_session(db_path, config)
+    await run_migrations(engine)
+    read_engine, read_session_factory = create_read_engine_and_session(db_path, config)
+    yield session_factory, read_session_factory
+    await read_engine.dispose()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_writer_pragmas(engines):
+    session_factory, _ = engines
+    async with session_factory() as session:
+        journal = (await session.execute(text("PRAGMA journal_mode"))).scalar()
+        sync = (await session.execute(text("PRAGMA synchronous"))).scalar()
+        cache = (await session.execute(text("PRAGMA cache_size"))).scalar()
+        busy = (await session.execute(text("PRAGMA busy_timeout"))).scalar()
+    assert journal == "wal"
+    assert sync == 1  # NORMAL
+    assert cache == -8 * 1024
+    assert busy == 1234
+
+
+@pytest.mark.asyncio
+async def test_reader_is_query_only(engines):
+    session_factory, read_session_factory = engines
+    async with session_factory() as session:
+        session.add(Job(id="abc"))
+        await session.commit()
+
+    async with read_session_factory() as session:
+        count = (await session.execute(text("SELECT count(*) FROM jobs"))).scalar()
+        assert count == 1
+        with pytest.raises(OperationalError):
+            await session.execute(text("DELETE FROM jobs"))
@@ -0,0 +1,95 @@
+"""Tests for UNet deep-feature caching."""
+
+import numpy as np
+
+from forge.backends.diffusers_backend.feature_cache import FeatureCache
+
+
+class _Block:
+    """Stands in for a torch module: calls go through ``forward``."""
+
+    def __init__(self, name, calls, returns_residuals=False):
+        self.name = name
+        self.calls = calls
+        self.returns_residuals = returns_residuals
+
+    def __call__(self, *args, **kwargs):
+        return self.forward(*args, **kwargs)
+
+    def forward(self, x):
+        self.calls.append(self.name)
+        out = x + 1
+        return (out, (out,)) if self.returns_residuals else out
+
+
+class _UNet(_Block):
+    def __init__(self, calls):
+        super().__init__("unet", calls)
+        self.down_blocks = [_Block("down0", calls, True), _Block("down1", calls, True)]
+        self.mid_block = _Block("mid", calls)
+        self.up_blocks = [_Block("up0", calls), _Block("up1", calls)]
+
+    def forward(self, x):
+        h, _ = self.down_blocks[0](x)
+        h, _ = self.down_blocks[1](h)
+        return self.up_blocks[1](self.up_blocks[0](self.mid_block(h)))
+
+
+def _run(cache, unet, inputs):
+    cache.start(len(inputs))
+    return [unet(x) for x in inputs]
+
+
+def test_full_steps_follow_interval_warmup_and_last_step():
+    calls = []
+    unet = _UNet(calls)
+    cache = FeatureCache(interval=3, guard=0)
+    detach = cache.attach(unet)
+    outputs = _run(cache, unet, [np.full(4, float(i)) for i in range(10)])
+
+    # Warm-up steps 0-1, then every third step, and the last one
+    assert cache.to_dict() == {
+        "interval": 3,
+        "guard": 0,
+        "full_steps": 5,
+        "reused_steps": 5,
+    }
+    assert calls.count("down0") == calls.count("up1") == 10
+    assert calls.count("down1") == calls.count("mid") == calls.count("up0") == 5
+    # The stand-in's last block only sees the deep path, so a reused step
+    # repeats the previous full step's output
+    assert outputs[2][0] == outputs[1][0]
+    assert outputs[4][0] == outputs[1][0] + 3
+
+    detach()
+    assert "forward" not in unet.__dict__
+    assert "forward" not in unet.down_blocks[1].__dict__
+    calls.clear()
+    unet(np.zeros(4))
+    assert calls == ["down0", "down1", "mid", "up0", "up1"]
+
+
+def test_guard_forces_full_steps_when_features_drift():
+    unet = _UNet([])
+    steady = FeatureCache(interval=4, guard=0.5)
+    steady.attach(unet)
+    _run(steady, unet, [np.full(4, 10.0)] * 12)
+    assert steady.reused_steps > 0
+
+    unet = _UNet([])
+    drifting = FeatureCache(interval=4, guard=0.5)
+    drifting.attach(unet)
+    _run(drifting, unet, [np.full(4, 2.0**i) for i in range(12)])
+    assert drifting.reused_steps == 0
+
+
+def test_start_resets_between_pipeline_calls():
+    calls = []
+    unet = _UNet(calls)
+    cache = FeatureCache(interval=10, guard=0)
+    cache.attach(unet)
+    _run(cache, unet, [np.zeros(2)] * 3)
+    calls.clear()
+    # A new call never replays the previous call's (differently shaped) features
+    out = _run(cache, unet, [np.zeros(5)])
+    assert out[0].shape == (5,) and "down1" in calls
@@ -0,0 +1,160 @@
+"""Tests for bulk gallery operations."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+
+from forge.core.events import EventBus
+from forge.db.tables import GeneratedImage
+from forge.storage.file_tasks import FileTaskRunner
+
+
+async def _seed_images(app, count, prompt="test"):
+    outputs = app.state.settings.paths.resolved_outputs / "2026-01-01"
+    (outputs / "thumbnails").mkdir(parents=True, exist_ok=True)
+    ids = []
+    async with app.state.session_factory() as session:
+        for i in range(count):
+            image_id = f"{prompt[:4]}{i:04d}"
+            file_path = outputs / f"forge_{image_id}.png"
+            thumb_path = outputs / "thumbnails" / f"forge_{image_id}_thumb.jpg"
+            file_path.write_bytes(b"png")
+            thumb_path.write_bytes(b"jpg")
+            session.add(
+                GeneratedImage(
+                    id=image_id,
+                    job_id="job",
+                    file_path=str(file_path),
+                    thumbnail_path=str(thumb_path),
+                    width=64,
+                    height=64,
+                    prompt=f"{prompt} {i}",
+                )
+            )
+            ids.append(image_id)
+        await session.commit()
+    return ids
+
+
+async def _wait_for_task(client, task_id):
+    for _ in range(100):
+        task = (await client.get(f"/api/gallery/tasks/{task_id}")).json()
+        if task["status"] != "running":
+            return task
+        await asyncio.sleep(0.02)
+    raise AssertionError("task did not finish")
+
+
+@pytest.mark.asyncio
+async def test_bulk_favorite_by_ids(app, client):
+    ids = await _seed_images(app, 5)
+    resp = await client.post(
+        "/api/gallery/bulk", json={"action": "favorite", "ids": ids[:3]}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["matched"] == 3
+
+    favorites = (await client.get("/api/gallery?favorites_only=true")).json()
+    assert favorites["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_by_filter_removes_files(app, client):
+    keep = await _seed_images(app, 2, prompt="keep")
+    drop = await _seed_images(app, 3, prompt="drop")
+    async with app.state.session_factory() as session:
+        paths = [
+            (img.file_path, img.thumbnail_path)
+            for img in (
+                await session.execute(select(GeneratedImage).where(GeneratedImage.id.in_(drop)))
+            ).scalars()
+        ]
+
+    resp = await client.post(
+        "/api/gallery/bulk",
+        json={"action": "delete", "filter": {"prompt_contains": "drop"}},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["matched"] == 3
+
+    task = await _wait_for_task(client, body["task"]["id"])
+    assert task == {**task, "status": "completed", "total": 6, "done": 6, "failed": 0}
+    for file_path, thumb_path in paths:
+        assert not Path(file_path).exists()
+        assert not Path(thumb_path).exists()
+
+    gallery = (await client.get("/api/gallery")).json()
+    assert sorted(img["id"] for img in gallery["images"]) == sorted(keep)
+
+
+@pytest.mark.asyncio
+async def test_bulk_filter_must_select_something(app, client):
+    ids = await _seed_images(app, 2)
+    for bad in ({}, {"prompt_contain": "x"}, {"all": False}):
+        resp = await client.post("/api/gallery/bulk", json={"action": "delete", "filter": bad})
+        assert resp.status_code == 422
+    assert (await client.get("/api/gallery")).json()["total"] == len(ids)
+
+    resp = await client.post(
+        "/api/gallery/bulk", json={"action": "favorite", "filter": {"all": True}}
+    )
+    assert resp.json()["matched"] == len(ids)
+
+
+@pytest.mark.asyncio
+async def test_bulk_move(app, client):
+    ids = await _seed_images(app, 2)
+    resp = await client.post(
+        "/api/gallery/bulk",
+        json={"action": "move", "ids": ids, "destination": "archive"},
+    )
+    assert resp.status_code == 200
+    await _wait_for_task(client, resp.json()["task"]["id"])
+
+    archive = app.state.settings.paths.resolved_outputs / "archive"
+    async with app.state.read_session_factory() as session:
+        images = (await session.execute(select(GeneratedImage))).scalars().all()
+    for img in images:
+        assert img.file_path.startswith(str(archive))
+        assert img.thumbnail_path.startswith(str(archive / "thumbnails"))
+        assert Path(img.file_path).exists()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_move_commits_the_chunk_in_flight(tmp_path):
+    sources = [tmp_path / f"{i}.png" for i in range(3)]
+    for path in sources:
+        path.write_bytes(b"png")
+    moves = [(str(path), str(tmp_path / "archive" / path.name)) for path in sources]
+    runner = FileTaskRunner(EventBus(), chunk_size=1)
+    committed: list[list[tuple[str, str]]] = []
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def on_chunk(chunk, failed):
+        started.set()
+        await release.wait()
+        committed.append(chunk)
+
+    runner.submit_move(moves, on_chunk=on_chunk)
+    await started.wait()
+    stopping = asyncio.create_task(runner.stop())
+    await asyncio.sleep(0)
+    release.set()
+    await stopping
+
+    assert committed == [moves[:1]]
+    assert Path(moves[0][1]).exists()
+    assert sources[1].exists()
+
+
+@pytest.mark.asyncio
+async def test_bulk_rejects_bad_requests(client):
+    resp = await client.post("/api/gallery/bulk", json={"action": "delete"})
+    assert resp.status_code == 422
+    resp = await client.post(
+        "/api/gallery/bulk", json={"action": "move", "ids": ["x"], "destination": "../etc"}
+    )
+    assert resp.status_code == 400
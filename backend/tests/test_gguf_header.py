@@ -0,0 +1,82 @@
+"""Tests for header-only GGUF introspection."""
+
+import struct
+
+import pytest
+
+from forge.models.gguf_header import inspect_gguf
+from forge.models.manager import ModelManager
+from forge.models.safetensors_header import SD2, SD15, SDXL
+
+
+def _string(value):
+    raw = value.encode()
+    return struct.pack("<Q", len(raw)) + raw
+
+
+def _write_gguf(path, tensors, metadata=None):
+    """Write a GGUF v3 header; ``tensors`` maps names to (torch shape, ggml type)."""
+    metadata = metadata or {}
+    out = b"GGUF" + struct.pack("<IQQ", 3, len(tensors), len(metadata))
+    for key, value in metadata.items():
+        if isinstance(value, str):
+            out += _string(key) + struct.pack("<I", 8) + _string(value)
+        else:
+            out += _string(key) + struct.pack("<II", 9, 5) + struct.pack("<Q", len(value))
+            out += b"".join(struct.pack("<i", v) for v in value)
+    for name, (shape, ggml_type) in tensors.items():
+        out += _string(name) + struct.pack("<I", len(shape))
+        out += b"".join(struct.pack("<Q", dim) for dim in reversed(shape))
+        out += struct.pack("<IQ", ggml_type, 0)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(out)
+
+
+CONTEXT_KEY = "input_blocks.1.1.transformer_blocks.0.attn2.to_k.weight"
+
+
+@pytest.mark.parametrize(
+    ("tensors", "expected"),
+    [
+        ({CONTEXT_KEY: ((320, 768), 8)}, SD15),
+        ({CONTEXT_KEY: ((320, 1024), 8)}, SD2),
+        ({"label_emb.0.0.weight": ((1280, 2816), 8)}, SDXL),
+    ],
+)
+def test_architecture_from_tensor_shapes(tmp_path, tensors, expected):
+    path = tmp_path / "unet.gguf"
+    _write_gguf(path, tensors)
+    assert inspect_gguf(path).architecture == expected
+
+
+def test_inspect_reads_types_and_metadata(tmp_path):
+    path = tmp_path / "unet.gguf"
+    _write_gguf(
+        path,
+        {
+            "input_blocks.0.0.weight": ((320, 4, 3, 3), 12),
+            "input_blocks.0.0.bias": ((320,), 0),
+        },
+        metadata={"general.architecture": "sdxl", "general.file_type": [1, 2]},
+    )
+
+    info = inspect_gguf(path)
+    assert info.architecture == SDXL
+    assert info.tensor_count == 2
+    assert info.dtypes == {"Q4_K": 320 * 4 * 9, "F32": 320}
+    # Arrays are left out of the catalog metadata
+    assert info.metadata == {"general.architecture": "sdxl"}
+
+
+def test_inspect_rejects_non_gguf(tmp_path):
+    path = tmp_path / "bad.gguf"
+    path.write_bytes(b"GGUF" + b"\xff" * 12)
+    with pytest.raises(ValueError):
+        inspect_gguf(path)
+
+
+def test_catalog_lists_gguf_checkpoints(tmp_path):
+    _write_gguf(tmp_path / "checkpoints" / "xl-q8.gguf", {}, {"general.architecture": "sdxl"})
+
+    manager = ModelManager(tmp_path)
+    assert manager.get("xl-q8.gguf").metadata["architecture"] == SDXL
@@ -0,0 +1,35 @@
+"""Tests for two-pass hires sizing."""
+
+import pytest
+from pydantic import ValidationError
+
+from forge.backends.hires import first_pass_size, refine_schedule, refine_steps
+from forge.schemas.generation import GenerateRequest, HiresFix
+
+
+def test_first_pass_keeps_aspect_at_native_pixel_count():
+    assert first_pass_size(2048, 2048, 1024) == (1024, 1024)
+    width, height = first_pass_size(1536, 1024, 512)
+    assert width * height <= 512 * 512
+    assert width % 8 == 0 and height % 8 == 0
+    assert abs(width / height - 1.5) < 0.05
+    # Already at or below native size: a single pass
+    assert first_pass_size(512, 512, 1024) == (512, 512)
+
+
+def test_refine_schedule_runs_the_requested_steps():
+    assert refine_steps(HiresFix(denoise=0.5), 30) == 15
+    assert refine_steps(HiresFix(steps=10), 30) == 10
+    for denoise in (0.05, 0.3, 0.45, 0.7, 1.0):
+        for steps in (1, 7, 10, 20):
+            hires = HiresFix(steps=steps, denoise=denoise)
+            # diffusers' img2img runs int(schedule * strength) steps
+            assert int(refine_schedule(hires, 30) * denoise) == steps
+
+
+def test_hires_is_optional_and_validated():
+    assert GenerateRequest(prompt="x").hires is None
+    request = GenerateRequest(prompt="x", hires={"upscaler": "lanczos"})
+    assert request.hires.upscaler == "lanczos"
+    with pytest.raises(ValidationError):
+        GenerateRequest(prompt="x", hires={"upscaler": "nearest"})
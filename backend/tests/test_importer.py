@@ -0,0 +1,77 @@
+"""Tests for the gallery importer."""
+
+import os
+
+import pytest
+from PIL import Image, PngImagePlugin
+from sqlalchemy import select
+
+from forge.db.engine import create_engine_and_session, run_migrations
+from forge.db.tables import GeneratedImage
+from forge.storage.images import save_generation_images
+from forge.storage.importer import import_outputs, parse_a1111_parameters
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine, factory = create_engine_and_session(tmp_path / "forge.db")
+    await run_migrations(engine)
+    yield factory
+    await engine.dispose()
+
+
+def test_parse_a1111_parameters():
+    fields = parse_a1111_parameters(
+        "a castle\non a hill\nNegative prompt: blurry\n"
+        "Steps: 20, Sampler: Euler a, CFG scale: 7, Seed: 1234, Size: 512x512, Model: sd15"
+    )
+    assert fields == {
+        "prompt": "a castle\non a hill",
+        "negative_prompt": "blurry",
+        "seed": 1234,
+        "model_id": "sd15",
+    }
+
+
+@pytest.mark.asyncio
+async def test_import_is_incremental_and_regenerates_thumbnails(tmp_path, session_factory):
+    outputs = tmp_path / "outputs"
+    infos = await save_generation_images(
+        [Image.new("RGB", (64, 48), "red"), Image.new("RGB", (32, 32), "blue")],
+        job_id="job1",
+        seed=7,
+        outputs_dir=outputs,
+        params={"prompt": "forge prompt", "model_id": "m.safetensors", "steps": 4},
+    )
+    os.remove(infos[1]["thumbnail_path"])
+
+    foreign = outputs / "2025-12-31" / "a1111.png"
+    foreign.parent.mkdir(parents=True)
+    png_info = PngImagePlugin.PngInfo()
+    png_info.add_text("parameters", "old prompt\nSteps: 20, Seed: 99, Size: 16x16")
+    Image.new("RGB", (16, 16)).save(foreign, pnginfo=png_info)
+
+    stats = await import_outputs(outputs, session_factory, workers=2)
+    assert (stats.imported, stats.skipped, stats.failed, stats.thumbnails) == (3, 0, 0, 2)
+
+    async with session_factory() as session:
+        rows = {r.file_path: r for r in (await session.execute(select(GeneratedImage))).scalars()}
+    first = rows[infos[0]["file_path"]]
+    assert first.id == infos[0]["id"]
+    assert (first.job_id, first.prompt, first.seed) == ("job1", "forge prompt", 7)
+    assert (first.width, first.height) == (64, 48)
+    assert rows[infos[1]["file_path"]].seed == 8
+    assert os.path.exists(infos[1]["thumbnail_path"])
+    assert rows[str(foreign)].prompt == "old prompt"
+    assert os.path.exists(rows[str(foreign)].thumbnail_path)
+
+    stats = await import_outputs(outputs, session_factory, workers=2)
+    assert (stats.imported, stats.updated, stats.skipped) == (0, 0, 3)
+
+    st = foreign.stat()
+    os.utime(foreign, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    stats = await import_outputs(outputs, session_factory, workers=2)
+    assert (stats.imported, stats.updated, stats.skipped) == (0, 1, 2)
+    async with session_factory() as session:
+        count = len((await session.execute(select(GeneratedImage.id))).all())
+    assert count == 3
@@ -0,0 +1,59 @@
+"""Tests for mask-bounded inpainting crops."""
+
+from PIL import Image, ImageDraw
+
+from forge.backends.inpaint_crop import crop_sources, mask_box, paste_crop, plan_crop
+from forge.backends.sources import SourceImages
+
+
+def _mask(size, box):
+    mask = Image.new("L", size, 0)
+    ImageDraw.Draw(mask).rectangle(box, fill=255)
+    return mask
+
+
+def test_mask_box_pads_and_clamps():
+    assert mask_box(_mask((256, 256), (100, 50, 149, 79)), 16) == (84, 34, 166, 96)
+    assert mask_box(_mask((256, 256), (0, 0, 9, 9)), 16) == (0, 0, 26, 26)
+    assert mask_box(Image.new("L", (64, 64), 0), 16) is None
+
+
+def test_small_masks_on_large_canvases_are_cropped():
+    crop = plan_crop(_mask((2048, 2048), (900, 900, 1099, 1099)), 512, 32)
+    assert crop.box == (868, 868, 1132, 1132)
+    # Scaled up to the model's native size, a sixteenth of the canvas
+    assert crop.size == (512, 512)
+    assert crop.to_dict()["compute_saved"] == 0.9375
+
+    # At native size the crop is no cheaper than the whole canvas
+    assert plan_crop(_mask((512, 512), (200, 200, 260, 260)), 512, 32) is None
+
+
+def test_large_boxes_keep_their_resolution():
+    # More pixels than 512², so denoised at its own size (in multiples of 8)
+    crop = plan_crop(_mask((4096, 4096), (1000, 1000, 1999, 1299)), 512, 0)
+    assert crop.box == (1000, 1000, 2000, 1300)
+    assert crop.size == (1000, 304)
+
+
+def test_wide_crops_are_denoised_at_their_planned_size():
+    size = (2048, 2048)
+    sources = SourceImages(Image.new("RGB", size), _mask(size, (700, 900, 1099, 1099)))
+    crop = plan_crop(sources.mask, 512, 16)
+    assert crop.size[0] > 1.5 * crop.size[1]
+    kwargs = crop_sources(sources, crop).inpaint_kwargs()
+    assert (kwargs["width"], kwargs["height"]) == crop.size
+
+
+def test_paste_crop_only_changes_the_masked_area():
+    size = (1024, 1024)
+    sources = SourceImages(Image.new("RGB", size, "red"), _mask(size, (400, 400, 599, 599)))
+    crop = plan_crop(sources.mask, 256, 64)
+    cropped = crop_sources(sources, crop)
+    assert cropped.image.size == cropped.mask.size == crop.size
+
+    result = paste_crop(sources, Image.new("RGB", crop.size, "blue"), crop)
+    assert result.size == size
+    assert result.getpixel((500, 500)) == (0, 0, 255)
+    assert result.getpixel((350, 500)) == (255, 0, 0)  # padding: context only
+    assert result.getpixel((10, 10)) == (255, 0, 0)
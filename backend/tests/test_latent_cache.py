@@ -0,0 +1,69 @@
+"""Tests for the img2img source latent cache."""
+
+import os
+from pathlib import Path
+
+from PIL import Image
+
+from forge.backends.diffusers_backend.latent_cache import LatentCache, image_digest, latent_key
+
+
+def _cache(tmp_path, memory_bytes=200, disk_bytes=250):
+    return LatentCache(
+        memory_bytes,
+        tmp_path,
+        disk_bytes,
+        size_of=len,
+        save=lambda value, path: path.write_bytes(value),
+        load=Path.read_bytes,
+    )
+
+
+def test_keys_follow_pixels_not_encoding(tmp_path):
+    image = Image.new("RGB", (16, 8), "red")
+    image.save(tmp_path / "a.png")
+    with Image.open(tmp_path / "a.png") as reloaded:
+        assert image_digest(reloaded.convert("RGB")) == image_digest(image)
+    assert image_digest(image.resize((8, 16))) != image_digest(image)
+    key = latent_key(image_digest(image), "vae|torch.float16")
+    assert key != latent_key(image_digest(image), "vae|torch.float32")
+
+
+def test_memory_lru_spills_to_disk(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("a", b"a" * 100)
+    cache.put("b", b"b" * 100)
+    assert cache.get("a") == b"a" * 100  # "b" is now least recently used
+    cache.put("c", b"c" * 100)
+
+    assert [p.name for p in tmp_path.iterdir()] == ["b.pt"]
+    # Read back from disk and promoted, which spills "a"
+    assert cache.get("b") == b"b" * 100
+    assert cache.get("missing") is None
+    assert cache.stats() == {
+        "memory_entries": 2,
+        "memory_mb": 0,
+        "hits": 1,
+        "disk_hits": 1,
+        "misses": 1,
+    }
+
+
+def test_disk_is_trimmed_least_recently_used_first(tmp_path):
+    cache = _cache(tmp_path, memory_bytes=0)
+    cache.put("a", b"a" * 100)
+    cache.put("b", b"b" * 100)
+    os.utime(tmp_path / "a.pt", (0, 0))
+    os.utime(tmp_path / "b.pt", (1, 1))
+    assert cache.get("a") is not None  # refreshes "a"'s mtime
+
+    cache.put("c", b"c" * 100)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.pt", "c.pt"]
+
+
+def test_disabled_tiers(tmp_path):
+    cache = _cache(tmp_path, memory_bytes=0, disk_bytes=0)
+    assert not cache.enabled
+    cache.put("a", b"a")
+    assert cache.get("a") is None
+    assert not list(tmp_path.iterdir())
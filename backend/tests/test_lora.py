@@ -0,0 +1,72 @@
+"""Tests for LoRA adapter planning."""
+
+from pathlib import Path
+
+import pytest
+
+from forge.backends.diffusers_backend.lora import LoraAdapterCache
+from forge.schemas.generation import GenerateRequest
+
+STYLE = ("style.safetensors", Path("/loras/style.safetensors"))
+DETAIL = ("detail-v2.safetensors", Path("/loras/detail-v2.safetensors"))
+
+
+def _apply(cache, *loras):
+    plan = cache.plan([(lora_id, path, weight) for (lora_id, path), weight in loras])
+    cache.commit(plan)
+    return plan
+
+
+def test_adapters_load_once_and_switch_by_weight():
+    cache = LoraAdapterCache("p1")
+
+    plan = _apply(cache, (STYLE, 0.8))
+    assert plan.load == [("p1_style", STYLE[1])]
+    assert plan.activate == [("p1_style", 0.8)]
+
+    # Same combination again: nothing to do
+    plan = _apply(cache, (STYLE, 0.8))
+    assert (plan.load, plan.activate, plan.disable) == ([], None, False)
+
+    plan = _apply(cache, (STYLE, 0.5), (DETAIL, 1.0))
+    assert plan.load == [("p1_detail_v2", DETAIL[1])]
+    assert plan.activate == [("p1_style", 0.5), ("p1_detail_v2", 1.0)]
+
+    plan = _apply(cache)
+    assert plan.disable and plan.load == []
+    assert cache.loaded == ["p1_style", "p1_detail_v2"]
+
+
+def test_least_recently_used_adapters_are_deleted():
+    cache = LoraAdapterCache("p1", max_adapters=1)
+    _apply(cache, (STYLE, 1.0))
+
+    plan = _apply(cache, (DETAIL, 1.0))
+    assert plan.delete == ["p1_style"]
+    assert cache.loaded == ["p1_detail_v2"]
+
+
+def test_frequent_combination_is_fused_until_it_changes():
+    cache = LoraAdapterCache("p1", fuse_after=2)
+    assert not _apply(cache, (STYLE, 1.0)).fuse
+    assert _apply(cache, (STYLE, 1.0)).fuse
+    assert cache.fused == (("p1_style", 1.0),)
+
+    plan = _apply(cache, (STYLE, 1.0))
+    assert not plan.fuse and not plan.unfuse and plan.activate is None
+
+    plan = _apply(cache, (STYLE, 0.3))
+    assert plan.unfuse and plan.activate == [("p1_style", 0.3)]
+    assert cache.fused == ()
+
+
+def test_duplicate_loras_are_rejected():
+    cache = LoraAdapterCache("p1")
+    with pytest.raises(ValueError):
+        cache.plan([(*STYLE, 1.0), (*STYLE, 0.5)])
+
+
+def test_generate_request_accepts_loras():
+    req = GenerateRequest(prompt="x", loras=[{"id": "style.safetensors", "weight": 0.7}])
+    assert req.loras[0].weight == 0.7
+    assert GenerateRequest(prompt="x").loras == []
@@ -0,0 +1,78 @@
+"""Tests for per-job memory planning."""
+
+from forge.backends.diffusers_backend.memory_planner import (
+    MemoryPlan,
+    ModelMemory,
+    estimate_peak_bytes,
+    plan_job,
+)
+from forge.models.safetensors_header import SD15, SDXL
+
+GB = 1024**3
+
+
+def test_small_jobs_need_no_savers():
+    plan = plan_job(ModelMemory(SD15), 512, 512, 1, 8 * GB)
+    assert plan.fits
+    assert plan.optimizations == []
+    assert plan.batches == [1]
+    assert 0 < plan.estimated_bytes <= plan.available_bytes
+
+
+def test_large_images_get_vae_tiling_only():
+    model = ModelMemory(SD15)
+    untiled = estimate_peak_bytes(model, 1536, 1536, MemoryPlan())
+    tiled = estimate_peak_bytes(model, 1536, 1536, MemoryPlan(vae_tiling=True))
+    plan = plan_job(model, 1536, 1536, 1, (untiled + tiled) // 2)
+    assert plan.optimizations == ["vae_tiling"]
+    assert plan.batches == [1]
+
+
+def test_oversized_batches_are_split():
+    plan = plan_job(ModelMemory(SDXL), 1024, 1024, 4, 4 * GB)
+    assert plan.fits
+    assert plan.batches == [1, 1, 1, 1]
+    assert plan.vae_slicing and plan.vae_tiling
+    assert not plan.cpu_offload
+
+    # Uneven splits keep every image
+    plan = plan_job(ModelMemory(SDXL), 1024, 1024, 5, 6 * GB)
+    assert sum(plan.batches) == 5
+    assert plan.batches == [2, 2, 1]
+
+
+def test_demoting_and_offloading_add_headroom():
+    model = ModelMemory(SD15, reclaimable_bytes=GB)
+    plan = plan_job(model, 512, 512, 1, GB // 4)
+    assert plan.optimizations == ["demote_others"]
+    assert plan.available_bytes == GB + GB // 4
+
+    model = ModelMemory(SDXL, offloadable_bytes=5 * GB)
+    plan = plan_job(model, 1024, 1024, 1, GB)
+    assert plan.cpu_offload and plan.fits
+
+
+def test_attention_slicing_only_without_sdpa():
+    model = ModelMemory(SD15, sdpa=False)
+    plain = estimate_peak_bytes(model, 1024, 1024, MemoryPlan())
+    sliced = estimate_peak_bytes(model, 1024, 1024, MemoryPlan(attention_slicing=True))
+    assert sliced < plain
+    plan = plan_job(model, 1024, 1024, 1, plain - 1)
+    assert plan.attention_slicing
+
+    plan = plan_job(ModelMemory(SD15), 1024, 1024, 1, 1)
+    assert not plan.attention_slicing
+
+
+def test_forced_savers_are_kept():
+    forced = MemoryPlan(attention_slicing=True, vae_tiling=True)
+    plan = plan_job(ModelMemory(SD15), 512, 512, 1, 8 * GB, forced=forced)
+    assert plan.optimizations == ["attention_slicing", "vae_tiling"]
+
+
+def test_reports_when_nothing_fits():
+    plan = plan_job(ModelMemory(SDXL, can_offload=False), 2048, 2048, 2, 0)
+    assert not plan.fits
+    assert plan.batches == [1, 1]
+    assert not plan.cpu_offload
+    assert plan.to_dict()["fits"] is False
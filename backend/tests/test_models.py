@@ -0,0 +1,203 @@
+"""Tests for the model catalog."""
+
+import asyncio
+import hashlib
+import os
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from forge.config import ModelsConfig
+from forge.core.events import EventBus
+from forge.core.prefetch import ModelPrefetcher
+from forge.core.queue import JobQueue, QueuedJob
+from forge.db.engine import create_engine_and_session, run_migrations
+from forge.models import hashing
+from forge.models.manager import ModelManager
+
+
+def _touch(path, size=16):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\0" * size)
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine, factory = create_engine_and_session(tmp_path / "forge.db")
+    await run_migrations(engine)
+    yield factory
+    await engine.dispose()
+
+
+def test_refresh_reports_incremental_diff(tmp_path):
+    _touch(tmp_path / "checkpoints" / "a.safetensors")
+    _touch(tmp_path / "loras" / "style.safetensors")
+    _touch(tmp_path / "checkpoints" / "notes.txt")
+    manager = ModelManager(tmp_path)
+
+    assert [m["id"] for m in manager.scan_all()] == ["a.safetensors", "style.safetensors"]
+    assert [m["type"] for m in manager.scan_type("lora")] == ["lora"]
+    assert manager.resolve("a.safetensors") == tmp_path / "checkpoints" / "a.safetensors"
+
+    # Unchanged directories are not re-listed
+    assert manager.refresh() == {"added": [], "updated": [], "removed": []}
+
+    _touch(tmp_path / "checkpoints" / "b.safetensors")
+    os.remove(tmp_path / "loras" / "style.safetensors")
+    diff = manager.refresh()
+    assert [m["id"] for m in diff["added"]] == ["b.safetensors"]
+    assert diff["removed"] == ["style.safetensors"]
+
+    _touch(tmp_path / "checkpoints" / "a.safetensors", size=32)
+    diff = manager.refresh(force=True)
+    assert [(m["id"], m["size_bytes"]) for m in diff["updated"]] == [("a.safetensors", 32)]
+
+
+@pytest.mark.asyncio
+async def test_poll_watcher_publishes_changes(tmp_path):
+    _touch(tmp_path / "checkpoints" / "a.safetensors")
+    bus = EventBus()
+    events = bus.subscribe()
+    manager = ModelManager(tmp_path, bus, ModelsConfig(watch="poll", poll_interval_seconds=0.01))
+    await manager.start()
+    await manager.wait_ready()
+    assert len(manager.scan_all()) == 1
+
+    _touch(tmp_path / "checkpoints" / "b.safetensors")
+    event = await asyncio.wait_for(events.get(), timeout=2.0)
+    await manager.stop()
+
+    assert event["type"] == "models:changed"
+    assert [m["id"] for m in event["added"]] == ["b.safetensors"]
+
+
+@pytest.mark.asyncio
+async def test_list_models_endpoint_uses_catalog(app, client):
+    _touch(app.state.settings.paths.resolved_models / "checkpoints" / "sd.safetensors")
+    await asyncio.to_thread(app.state.model_manager.refresh)
+
+    resp = await client.get("/api/models?type=checkpoint")
+    assert resp.status_code == 200
+    assert [m["id"] for m in resp.json()["models"]] == ["sd.safetensors"]
+
+
+@pytest.mark.asyncio
+async def test_failed_catalog_build_still_sets_ready(tmp_path, monkeypatch):
+    manager = ModelManager(tmp_path, config=ModelsConfig(watch="off"))
+
+    def broken():
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setattr(manager, "refresh", broken)
+    await manager.start()
+    await asyncio.wait_for(manager.wait_ready(), timeout=1)
+    await manager.stop()
+
+
+def test_hash_file_streams_in_chunks(tmp_path):
+    path = tmp_path / "model.safetensors"
+    data = os.urandom(100_000)
+    path.write_bytes(data)
+    seen = []
+
+    sha256, autov2 = hashing.hash_file(path, chunk_bytes=4096, checkpoint=seen.append)
+    assert sha256 == hashlib.sha256(data).hexdigest()
+    assert autov2 == sha256[:10]
+    assert seen[-1] == len(data) and len(seen) == 25
+
+
+@pytest.mark.asyncio
+async def test_hashes_are_published_and_persisted(tmp_path, session_factory, monkeypatch):
+    models_dir = tmp_path / "models"
+    _touch(models_dir / "checkpoints" / "a.safetensors", size=64)
+    bus = EventBus()
+    events = bus.subscribe()
+    manager = ModelManager(models_dir, bus, ModelsConfig(watch="off"), session_factory)
+    await manager.start()
+    event = await asyncio.wait_for(events.get(), timeout=2.0)
+    await manager.stop()
+
+    expected = hashlib.sha256(b"\0" * 64).hexdigest()
+    assert event["type"] == "models:changed"
+    assert [(m["id"], m["sha256"], m["hash"]) for m in event["updated"]] == [
+        ("a.safetensors", expected, expected[:10])
+    ]
+
+    # A restart reuses the stored hash without reading the file again
+    def fail(*args, **kwargs):
+        raise AssertionError("unchanged file was re-hashed")
+
+    monkeypatch.setattr(hashing, "hash_file", fail)
+    manager = ModelManager(models_dir, bus, ModelsConfig(watch="off"), session_factory)
+    await manager.start()
+    await manager.wait_ready()
+    assert manager.get("a.safetensors").sha256 == expected
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_hashing_continues_when_saving_fails(tmp_path, session_factory):
+    models_dir = tmp_path / "models"
+    _touch(models_dir / "checkpoints" / "a.safetensors", size=64)
+    _touch(models_dir / "checkpoints" / "b.safetensors", size=32)
+
+    async def fail_commit():
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    def failing_factory():
+        session = session_factory()
+        session.commit = fail_commit
+        return session
+
+    bus = EventBus()
+    events = bus.subscribe()
+    manager = ModelManager(models_dir, bus, ModelsConfig(watch="off"), failing_factory)
+    await manager.start()
+    hashed = set()
+    while len(hashed) < 2:
+        event = await asyncio.wait_for(events.get(), timeout=2.0)
+        hashed.update(m["id"] for m in event["updated"])
+    await manager.stop()
+
+    assert manager.get("b.safetensors").sha256 == hashlib.sha256(b"\0" * 32).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_prefetcher_warms_upcoming_checkpoints(tmp_path):
+    _touch(tmp_path / "checkpoints" / "a.safetensors")
+    _touch(tmp_path / "checkpoints" / "b.safetensors")
+    _touch(tmp_path / "checkpoints" / "big.safetensors", size=2 * 1024 * 1024)
+    manager = ModelManager(tmp_path)
+    queue = JobQueue()
+    for i, model_id in enumerate(["a.safetensors", "b.safetensors", "big.safetensors"]):
+        await queue.put(QueuedJob(job_id=str(i), params={"model_id": model_id}))
+
+    assert not ModelPrefetcher(queue, manager, ModelsConfig(prefetch_max_mb=0)).enabled
+
+    # "a" is already loaded and "big" doesn't fit the 1MB budget
+    prefetcher = ModelPrefetcher(queue, manager, ModelsConfig(prefetch_max_mb=1))
+    prefetcher.schedule(current_model_id="a.safetensors")
+    await prefetcher.wait_idle()
+    await prefetcher.stop()
+
+    assert [p.name for p in prefetcher.warm_paths] == ["b.safetensors"]
+
+
+@pytest.mark.asyncio
+async def test_model_load_runs_as_queued_operation(app, client):
+    events = app.state.event_bus.subscribe()
+
+    resp = await client.post("/api/models/demo-model/load")
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "loaded"
+
+    resp = await client.post("/api/models/unload", params={"wait": "false"})
+    assert resp.status_code == 202
+    op_id = resp.json()["op_id"]
+
+    seen = []
+    while not any(e.get("op_id") == op_id for e in seen):
+        seen.append(await asyncio.wait_for(events.get(), timeout=2.0))
+    types = [e["type"] for e in seen]
+    assert "model:loading" in types
+    assert types.index("model:loaded") < types.index("model:unloaded")
@@ -0,0 +1,124 @@
+"""Tests for write-behind job state persistence."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from forge.core.persistence import JobStateWriter
+from forge.db.engine import create_engine_and_session, run_migrations
+from forge.db.tables import GeneratedImage, Job
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine, factory = create_engine_and_session(tmp_path / "forge.db")
+    await run_migrations(engine)
+    yield factory
+    await engine.dispose()
+
+
+async def _add_jobs(session_factory, *job_ids):
+    async with session_factory() as session:
+        for job_id in job_ids:
+            session.add(Job(id=job_id, prompt=f"prompt {job_id}"))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_transitions_are_batched_in_order(session_factory):
+    await _add_jobs(session_factory, "a", "b")
+    writer = JobStateWriter(session_factory, flush_interval=10.0, max_batch=100)
+    writer.start()
+
+    writer.mark_running("a")
+    writer.mark_running("b")
+    writer.mark_failed("b", "boom")
+    done = writer.mark_finished(
+        "a",
+        "completed",
+        [{"id": "img1", "file_path": "/x.png", "width": 64, "height": 64, "seed": 3}],
+        {"prompt": "prompt a", "negative_prompt": "", "model_id": "m", "params_json": "{}"},
+    )
+    assert writer.pending_count == 4
+
+    await writer.stop()
+    assert done.done()
+
+    async with session_factory() as session:
+        jobs = {j.id: j for j in (await session.execute(select(Job))).scalars()}
+        images = (await session.execute(select(GeneratedImage))).scalars().all()
+
+    assert jobs["a"].status == "completed"
+    assert jobs["a"].started_at is not None
+    assert jobs["b"].status == "failed"
+    assert jobs["b"].error_message == "boom"
+    assert [(i.id, i.job_id, i.seed, i.prompt) for i in images] == [
+        ("img1", "a", 3, "prompt a")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_is_full(session_factory):
+    await _add_jobs(session_factory, "a", "b")
+    writer = JobStateWriter(session_factory, flush_interval=10.0, max_batch=2)
+    writer.start()
+
+    writer.mark_running("a")
+    done = writer.mark_running("b")
+    await asyncio.wait_for(done, timeout=1.0)
+    assert writer.pending_count == 0
+
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_write_only_fails_its_own_job(session_factory, monkeypatch):
+    monkeypatch.setattr("forge.core.persistence.RETRY_DELAY", 0)
+    await _add_jobs(session_factory, "a", "b")
+    writer = JobStateWriter(session_factory, flush_interval=10.0, max_batch=100)
+    fields = {"prompt": "p", "negative_prompt": "", "model_id": "m", "params_json": "{}"}
+    image = {"id": "img1", "file_path": "/x.png", "width": 64, "height": 64, "seed": 3}
+
+    writer.mark_running("a")
+    writer.mark_running("b")
+    done_a = writer.mark_finished("a", "completed", [image], fields)
+    # Reuses the image id, so its insert violates the primary key
+    done_b = writer.mark_finished("b", "completed", [image], fields)
+    await writer.flush()
+
+    assert done_a.result() is None
+    with pytest.raises(Exception, match="UNIQUE"):
+        done_b.result()
+    async with session_factory() as session:
+        jobs = {j.id: j for j in (await session.execute(select(Job))).scalars()}
+    assert jobs["a"].status == "completed"
+    assert jobs["b"].status == "running"
+    assert jobs["b"].started_at is not None
+
+
+@pytest.mark.asyncio
+async def test_failed_running_write_stays_ahead_of_the_terminal_one(session_factory, monkeypatch):
+    monkeypatch.setattr("forge.core.persistence.RETRY_DELAY", 0)
+    await _add_jobs(session_factory, "a")
+    writer = JobStateWriter(session_factory, flush_interval=10.0, max_batch=100)
+    commit = writer._commit
+
+    async def reject_running(writes):
+        if any(w.values.get("status") == "running" for w in writes):
+            raise RuntimeError("database is locked")
+        await commit(writes)
+
+    monkeypatch.setattr(writer, "_commit", reject_running)
+    running = writer.mark_running("a")
+    await writer.flush()
+    assert not running.done() and writer.pending_count == 1  # requeued
+
+    failed = writer.mark_failed("a", "boom")
+    await writer.flush()
+    assert running.result() is None and failed.result() is None
+
+    async with session_factory() as session:
+        job = await session.get(Job, "a")
+    assert job.status == "failed"
+    assert job.started_at is not None
@@ -0,0 +1,88 @@
+"""Tests for the diffusers backend's resident pipeline cache."""
+
+from forge.backends.diffusers_backend.pipeline_cache import CPU, DEVICE, PipelineCache
+
+
+class FakePipe:
+    def __init__(self, name):
+        self.name = name
+        self.location = "cpu"
+        self.moves = 0
+
+
+def _move(location):
+    def move(pipe):
+        pipe.location = location
+        pipe.moves += 1
+        return pipe
+
+    return move
+
+
+def _cache(device_budget, cpu_budget, evicted):
+    return PipelineCache(
+        device_budget, cpu_budget, _move("device"), _move("cpu"), on_evict=evicted.append
+    )
+
+
+def test_lru_demotes_to_cpu_then_evicts():
+    evicted = []
+    cache = _cache(device_budget=10, cpu_budget=10, evicted=evicted)
+    a, b, c = FakePipe("a"), FakePipe("b"), FakePipe("c")
+
+    assert cache.put("a", a, 6).location == "device"
+    cache.put("b", b, 6)
+    assert (cache.tier_of("a"), cache.tier_of("b")) == (CPU, DEVICE)
+    assert a.location == "cpu"
+
+    # Promoting "a" demotes "b"; nothing has been dropped yet
+    assert cache.get("a") is a and a.location == "device"
+    assert cache.tier_of("b") == CPU
+    assert evicted == []
+
+    # A third pipeline pushes "a" to RAM, which evicts the older "b"
+    cache.put("c", c, 6)
+    assert evicted == ["b"]
+    assert "b" not in cache
+    assert [(s["model_id"], s["tier"]) for s in cache.stats()] == [("c", DEVICE), ("a", CPU)]
+
+
+def test_device_hits_do_not_move_pipelines():
+    cache = _cache(device_budget=20, cpu_budget=0, evicted=[])
+    a = FakePipe("a")
+    cache.put("a", a, 6)
+    cache.put("b", FakePipe("b"), 6)
+
+    assert cache.get("a") is a
+    assert a.moves == 1
+    assert cache.get("missing") is None
+
+
+def test_oversized_pipelines_skip_the_cpu_tier():
+    evicted = []
+    cache = _cache(device_budget=10, cpu_budget=4, evicted=evicted)
+    cache.put("a", FakePipe("a"), 8)
+    cache.put("b", FakePipe("b"), 12)  # larger than the device budget, still loads
+
+    assert evicted == ["a"]
+    assert cache.tier_of("b") == DEVICE
+
+    cache.clear()
+    assert evicted == ["a", "b"]
+    assert cache.stats() == []
+
+
+def test_demote_others_keeps_only_the_active_pipeline():
+    evicted = []
+    cache = _cache(device_budget=30, cpu_budget=8, evicted=evicted)
+    a, b, c = FakePipe("a"), FakePipe("b"), FakePipe("c")
+    cache.put("a", a, 6)
+    cache.put("b", b, 10)
+    cache.put("c", c, 6)
+
+    # "b" doesn't fit the CPU tier and is dropped, but its memory is freed all the same
+    assert cache.demote_others("c") == 16
+    assert (a.location, c.location) == ("cpu", "device")
+    assert evicted == ["b"]
+    assert [(s["model_id"], s["tier"]) for s in cache.stats()] == [("c", DEVICE), ("a", CPU)]
+    assert cache.demote_others("c") == 0
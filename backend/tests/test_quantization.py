@@ -0,0 +1,44 @@
+"""Tests for weight quantization planning and reporting."""
+
+import pytest
+
+from forge.backends.diffusers_backend.quantization import (
+    INT4,
+    INT8_DYNAMIC,
+    NONE,
+    QuantizationReport,
+    quantization_targets,
+)
+from forge.config import Settings
+
+
+def test_targets_cover_denoiser_and_text_encoders():
+    mode, names = quantization_targets(INT4, "cuda")
+    assert mode == INT4
+    assert names == ["unet", "transformer", "text_encoder", "text_encoder_2"]
+
+    _, names = quantization_targets(INT4, "cuda", text_encoders=False, skip=["unet"])
+    assert names == ["transformer"]
+
+
+def test_dynamic_quantization_is_cpu_only():
+    assert quantization_targets(INT8_DYNAMIC, "cpu")[0] == INT8_DYNAMIC
+    assert quantization_targets(INT8_DYNAMIC, "cuda:0") == (NONE, [])
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        quantization_targets("fp4", "cpu")
+    with pytest.raises(ValueError):
+        Settings(gpu={"quantization": "fp4"})
+
+
+def test_report_measures_speed():
+    report = QuantizationReport(mode=INT4, weight_bytes_before=4 << 20, weight_bytes_after=1 << 20)
+    assert report.steps_per_second == 0.0
+    report.record(20, 4.0)
+    report.record(10, 2.0)
+
+    info = report.to_dict()
+    assert info["steps_per_second"] == 5.0
+    assert (info["weights_mb_before"], info["weights_mb"]) == (4.0, 1.0)
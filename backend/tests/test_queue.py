@@ -4,7 +4,10 @@ import asyncio
 
 import pytest
 
+from forge.core.events import EventBus
 from forge.core.queue import JobQueue, QueuedJob
+from forge.core.worker import GPUWorker
+from forge.db.engine import create_engine_and_session, run_migrations
 
 
 @pytest.mark.asyncio
@@ -29,9 +32,100 @@ async def test_cancel_skips_job():
     assert result.job_id == "keep_me"
 
 
+@pytest.mark.asyncio
+async def test_peek_does_not_dequeue():
+    q = JobQueue()
+    for job_id in ("a", "b", "c"):
+        await q.put(QueuedJob(job_id=job_id))
+    q.cancel("b")
+
+    assert [j.job_id for j in q.peek(2)] == ["a", "c"]
+    assert q.size == 3
+    assert (await q.get()).job_id == "a"
+
+
 @pytest.mark.asyncio
 async def test_is_cancelled():
     q = JobQueue()
     q.cancel("abc")
     assert q.is_cancelled("abc") is True
     assert q.is_cancelled("xyz") is False
+
+
+class _SlowBackend:
+    name = "slow"
+
+    def __init__(self):
+        self.closed = asyncio.Event()
+
+    def get_supported_modes(self):
+        return ["txt2img"]
+
+    async def generate(self, params, job_id):
+        try:
+            for step in range(1, 1000):
+                yield {"type": "progress", "step": step, "total_steps": 1000, "percentage": 0}
+                await asyncio.sleep(0.01)
+        finally:
+            # Stands in for waiting on the backend's pipeline thread
+            await asyncio.sleep(0.1)
+            self.closed.set()
+
+    async def shutdown(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_cancelled_job_closes_its_generation(settings, tmp_path):
+    engine, factory = create_engine_and_session(tmp_path / "forge.db")
+    await run_migrations(engine)
+    queue, bus = JobQueue(), EventBus()
+    events = bus.subscribe()
+    worker = GPUWorker(queue, bus, settings, factory)
+    worker._backend = backend = _SlowBackend()
+    worker.start()
+
+    await queue.put(QueuedJob(job_id="a", params={"prompt": "x"}))
+    while (await asyncio.wait_for(events.get(), timeout=2.0))["type"] != "job:progress":
+        pass
+    queue.cancel("a")
+    while (await asyncio.wait_for(events.get(), timeout=2.0))["type"] != "job:completed":
+        pass
+
+    assert backend.closed.is_set()
+    await worker.stop()
+    await engine.dispose()
+
+
+class _FailingBackend(_SlowBackend):
+    async def generate(self, params, job_id):
+        if job_id == "a":
+            raise RuntimeError("boom")
+        yield {"type": "result", "images": [], "stats": {}}
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_a_failed_state_write(settings, tmp_path, monkeypatch):
+    engine, factory = create_engine_and_session(tmp_path / "forge.db")
+    await run_migrations(engine)
+    queue, bus = JobQueue(), EventBus()
+    events = bus.subscribe()
+    worker = GPUWorker(queue, bus, settings, factory)
+    worker._backend = _FailingBackend()
+
+    async def fail_write(job_id, error):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(worker._state, "mark_failed", fail_write)
+    worker.start()
+
+    await queue.put(QueuedJob(job_id="a", params={"prompt": "x"}))
+    await queue.put(QueuedJob(job_id="b", params={"prompt": "x"}))
+    seen = []
+    while ("job:completed", "b") not in seen:
+        event = await asyncio.wait_for(events.get(), timeout=2.0)
+        seen.append((event["type"], event.get("job_id")))
+
+    assert ("job:failed", "a") in seen
+    await worker.stop()
+    await engine.dispose()
@@ -0,0 +1,102 @@
+"""Tests for header-only safetensors introspection."""
+
+import json
+import struct
+
+import pytest
+
+from forge.models.manager import ModelManager
+from forge.models.safetensors_header import (
+    LORA,
+    SD2,
+    SD15,
+    SDXL,
+    SDXL_REFINER,
+    UNKNOWN,
+    VAE,
+    detect_architecture,
+    inspect_safetensors,
+)
+
+
+def _write_safetensors(path, tensors, metadata=None):
+    header = {}
+    offset = 0
+    for name, (dtype, shape) in tensors.items():
+        size = 2 if dtype in ("F16", "BF16") else 4
+        for dim in shape:
+            size *= dim
+        header[name] = {"dtype": dtype, "shape": shape, "data_offsets": [offset, offset + size]}
+        offset += size
+    if metadata is not None:
+        header["__metadata__"] = metadata
+    raw = json.dumps(header).encode()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(struct.pack("<Q", len(raw)) + raw + b"\0" * offset)
+
+
+@pytest.mark.parametrize(
+    ("keys", "expected"),
+    [
+        (["model.diffusion_model.input_blocks.0.0.weight"], SD15),
+        (["cond_stage_model.model.transformer.resblocks.0.attn.in_proj_weight"], SD2),
+        (
+            [
+                "conditioner.embedders.0.transformer.text_model.final_layer_norm.weight",
+                "conditioner.embedders.1.model.ln_final.weight",
+            ],
+            SDXL,
+        ),
+        (["conditioner.embedders.0.model.ln_final.weight"], SDXL_REFINER),
+        (["lora_unet_down_blocks_0_attentions_0_proj_in.lora_down.weight"], LORA),
+        (["unet.down_blocks.0.attentions.0.to_q.lora_A.weight"], LORA),
+        (["encoder.conv_in.weight", "decoder.conv_in.weight", "quant_conv.weight"], VAE),
+        (["something.else"], UNKNOWN),
+    ],
+)
+def test_detect_architecture(keys, expected):
+    assert detect_architecture(keys) == expected
+
+
+def test_inspect_reads_header_only(tmp_path):
+    path = tmp_path / "model.safetensors"
+    _write_safetensors(
+        path,
+        {
+            "model.diffusion_model.out.2.weight": ("F16", [4, 320, 3, 3]),
+            "model.diffusion_model.out.2.bias": ("F32", [4]),
+        },
+        metadata={"ss_base_model_version": "sd_v1"},
+    )
+
+    info = inspect_safetensors(path)
+    assert info.architecture == SD15
+    assert info.tensor_count == 2
+    assert info.parameter_count == 4 * 320 * 9 + 4
+    assert info.dtypes == {"F16": 4 * 320 * 9, "F32": 4}
+    assert info.metadata == {"ss_base_model_version": "sd_v1"}
+
+
+def test_inspect_rejects_non_safetensors(tmp_path):
+    path = tmp_path / "bad.safetensors"
+    path.write_bytes(b"\xff" * 16)
+    with pytest.raises(ValueError):
+        inspect_safetensors(path)
+
+    for header in ({"model.diffusion_model.x": [1, 2]}, {"x": {"shape": ["1"]}}):
+        raw = json.dumps(header).encode()
+        path.write_bytes(struct.pack("<Q", len(raw)) + raw)
+        with pytest.raises(ValueError, match="malformed"):
+            inspect_safetensors(path)
+
+
+def test_catalog_entries_carry_architecture(tmp_path):
+    _write_safetensors(
+        tmp_path / "checkpoints" / "xl.safetensors",
+        {"conditioner.embedders.1.model.ln_final.weight": ("F16", [1280])},
+    )
+    (tmp_path / "checkpoints" / "broken.safetensors").write_bytes(b"\0" * 4)
+
+    manager = ModelManager(tmp_path)
+    assert manager.get("xl.safetensors").metadata["architecture"] == SDXL
+    assert manager.get("broken.safetensors").metadata == {}
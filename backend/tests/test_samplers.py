@@ -0,0 +1,24 @@
+"""Tests for the sampler registry."""
+
+import pytest
+
+from forge.backends.samplers import SAMPLERS, resolve_sampler
+from forge.schemas.generation import GenerateRequest
+
+
+def test_aliases_resolve_to_canonical_names():
+    assert resolve_sampler("euler_ancestral").name == "euler_a"
+    assert GenerateRequest(prompt="x", sampler="euler_ancestral").sampler == "euler_a"
+
+
+def test_unknown_sampler_is_rejected():
+    with pytest.raises(ValueError, match="available"):
+        resolve_sampler("dpm_fast")
+
+
+def test_registry_entries_are_consistent():
+    for name, sampler in SAMPLERS.items():
+        assert sampler.name == name
+        low, high = sampler.steps
+        assert 1 <= low <= high <= 150
+        assert sampler.scheduler.endswith("Scheduler")
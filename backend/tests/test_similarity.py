@@ -0,0 +1,102 @@
+"""Tests for perceptual hashing and the similarity index."""
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+from sqlalchemy import delete
+
+from forge.db.tables import GeneratedImage
+from forge.storage.features import extract_features, hamming_distance, perceptual_hash
+from forge.storage.images import save_generation_images
+from forge.storage.similarity import SimilarityIndex
+
+
+def _pattern(seed: int, size: int = 256) -> Image.Image:
+    rng = np.random.default_rng(seed)
+    img = Image.new("RGB", (size, size), tuple(int(c) for c in rng.integers(0, 255, 3)))
+    draw = ImageDraw.Draw(img)
+    for _ in range(6):
+        x0, y0 = (int(v) for v in rng.integers(0, size // 2, 2))
+        x1, y1 = x0 + size // 3, y0 + size // 3
+        draw.ellipse([x0, y0, x1, y1], fill=tuple(int(c) for c in rng.integers(0, 255, 3)))
+    return img
+
+
+def test_phash_is_robust_to_resizing():
+    img = _pattern(1)
+    resized = img.resize((200, 200))
+    other = _pattern(2)
+    assert hamming_distance(perceptual_hash(img), perceptual_hash(resized)) <= 4
+    assert hamming_distance(perceptual_hash(img), perceptual_hash(other)) > 10
+
+
+def test_index_search_ranks_near_duplicates_first(tmp_path):
+    index = SimilarityIndex(tmp_path / "index")
+    base = _pattern(1)
+    index.add_many(
+        [
+            ("base", extract_features(base, embeddings=True)),
+            ("other", extract_features(_pattern(2), embeddings=True)),
+            ("dupe", extract_features(base.resize((180, 180)), embeddings=True)),
+        ]
+    )
+
+    for method in ("phash", "embedding"):
+        hits = index.search("base", k=2, method=method)
+        assert [h.image_id for h in hits] == ["dupe", "other"]
+        assert hits[0].score > hits[1].score
+
+    assert index.search("missing") == []
+
+
+def test_index_survives_reopen_and_torn_append(tmp_path):
+    index_dir = tmp_path / "index"
+    index = SimilarityIndex(index_dir)
+    index.add("a", extract_features(_pattern(1)))
+    index.add("b", extract_features(_pattern(2)))
+
+    # Simulate a crash after the vector write but before the id write
+    with open(index_dir / "phash.vec", "ab") as f:
+        f.write(b"\x00" * 8)
+
+    reopened = SimilarityIndex(index_dir)
+    assert len(reopened) == 2
+    assert [h.image_id for h in reopened.search("a")] == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_similar_endpoint(app, client):
+    outputs = app.state.settings.paths.resolved_outputs
+    base = _pattern(1)
+    infos = await save_generation_images(
+        [base, _pattern(2), base.resize((200, 200))], job_id="job", seed=0, outputs_dir=outputs
+    )
+    async with app.state.session_factory() as session:
+        for info in infos:
+            session.add(
+                GeneratedImage(
+                    id=info["id"],
+                    job_id="job",
+                    file_path=info["file_path"],
+                    thumbnail_path=info["thumbnail_path"],
+                    width=info["width"],
+                    height=info["height"],
+                )
+            )
+        await session.commit()
+
+    resp = await client.get(f"/api/gallery/{infos[0]['id']}/similar?k=5")
+    assert resp.status_code == 200
+    images = resp.json()["images"]
+    assert [img["id"] for img in images] == [infos[2]["id"], infos[1]["id"]]
+    assert images[0]["distance"] <= 4
+
+    # A deleted image's hit is replaced by the next live one
+    async with app.state.session_factory() as session:
+        await session.execute(delete(GeneratedImage).where(GeneratedImage.id == infos[2]["id"]))
+        await session.commit()
+    resp = await client.get(f"/api/gallery/{infos[0]['id']}/similar?k=1")
+    assert [img["id"] for img in resp.json()["images"]] == [infos[1]["id"]]
+
+    resp = await client.get("/api/gallery/nope/similar")
+    assert resp.status_code == 404
@@ -0,0 +1,86 @@
+"""Tests for source image uploads and their preparation."""
+
+import io
+
+import pytest
+from PIL import Image
+
+from forge.backends.sources import SourceImages, edit_steps, outpaint_canvas, prepare_sources
+from forge.schemas.generation import GenerateRequest
+from forge.storage.uploads import UploadError, load_upload, save_upload, upload_path
+
+
+def _png(size=(32, 24), color=(200, 40, 40)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+async def _chunks(data: bytes, size: int = 100):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def test_uploads_are_stored_by_content(tmp_path):
+    data = _png()
+    first = await save_upload(_chunks(data), tmp_path, max_bytes=1 << 20)
+    second = await save_upload(_chunks(data), tmp_path, max_bytes=1 << 20)
+    assert first == second
+    assert (first["width"], first["height"], first["format"]) == (32, 24, "png")
+    assert upload_path(tmp_path, first["id"]).name == f"{first['id']}.png"
+    assert load_upload(tmp_path, first["id"]).size == (32, 24)
+    assert [p.name for p in tmp_path.iterdir()] == [f"{first['id']}.png"]
+
+
+async def test_rejected_uploads_leave_nothing_behind(tmp_path):
+    with pytest.raises(UploadError) as too_large:
+        await save_upload(_chunks(_png()), tmp_path, max_bytes=10)
+    assert too_large.value.status_code == 413
+    with pytest.raises(UploadError):
+        await save_upload(_chunks(b"not an image" * 10), tmp_path, max_bytes=1 << 20)
+    assert list(tmp_path.iterdir()) == []
+    assert upload_path(tmp_path, "../../etc/passwd") is None
+
+
+async def test_prepare_inpaint_sources(tmp_path):
+    source = await save_upload(_chunks(_png((64, 64))), tmp_path, 1 << 20)
+    mask = await save_upload(_chunks(_png((32, 32), (255, 255, 255))), tmp_path, 1 << 20)
+    params = GenerateRequest(
+        mode="inpaint",
+        source_image=source["id"],
+        mask_image=mask["id"],
+        width=128,
+        height=96,
+        steps=20,
+        strength=0.5,
+    )
+    sources = prepare_sources(params, tmp_path)
+    assert sources.image.size == sources.mask.size == (128, 96)
+    assert sources.mask.mode == "L"
+    assert edit_steps(params) == 10
+    kwargs = sources.inpaint_kwargs()
+    assert (kwargs["width"], kwargs["height"]) == (128, 96)
+    assert kwargs["mask_image"] is sources.mask
+
+
+def test_outpaint_masks_the_new_border():
+    sources = outpaint_canvas(Image.new("RGB", (64, 64), "red"), (128, 64))
+    mask = sources.mask
+    assert sources.image.size == mask.size == (128, 64)
+    assert sources.image.getpixel((64, 32)) == (255, 0, 0)
+    assert mask.getpixel((0, 32)) == 255  # new canvas
+    assert mask.getpixel((33, 32)) == 255  # overlap into the source
+    assert mask.getpixel((64, 32)) == 0  # kept
+    # The source spans the full height, so there's no overlap at the top
+    assert mask.getpixel((64, 0)) == 0
+    # The pipeline denoises the whole canvas, not the model's default square
+    kwargs = sources.inpaint_kwargs()
+    assert (kwargs["width"], kwargs["height"]) == (128, 64)
+    assert SourceImages(Image.new("RGB", (64, 64))).inpaint_kwargs() == {}
+
+
+def test_source_modes_need_their_images():
+    with pytest.raises(ValueError, match="source_image"):
+        GenerateRequest(mode="img2img")
+    with pytest.raises(ValueError, match="mask_image"):
+        GenerateRequest(mode="inpaint", source_image="a" * 32)
@@ -0,0 +1,79 @@
+"""Tests for tiled upscaling."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from forge.backends.upscale import axis_weights, output_size, tile_starts, upscale_tiled
+
+
+def _repeat(scale):
+    def upscale(tiles):
+        return tiles.repeat(scale, axis=1).repeat(scale, axis=2)
+
+    return upscale
+
+
+def _noise(width, height):
+    rng = np.random.default_rng(0)
+    return Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8))
+
+
+def test_tiles_cover_the_axis_with_overlap():
+    assert tile_starts(300, 512, 32) == [0]
+    starts = tile_starts(1000, 256, 32)
+    assert starts[0] == 0 and starts[-1] == 1000 - 256
+    assert all(b - a <= 256 - 32 for a, b in zip(starts, starts[1:], strict=False))
+
+
+def test_weights_ramp_only_across_overlaps():
+    first, middle, last = axis_weights([0, 8, 16], 16, 2)
+    assert first[0] == 1 and last[-1] == 1
+    assert first[-1] < 0.1 and middle[0] < 0.1 and middle[-1] < 0.1
+    # Neighbouring ramps add up to one across each overlap
+    np.testing.assert_allclose(first[16:] + middle[:16], 1, rtol=1e-6)
+
+
+def test_tiled_matches_whole_image_upscale():
+    image = _noise(150, 90)
+    calls = []
+
+    def upscale(tiles):
+        calls.append(len(tiles))
+        return _repeat(2)(tiles)
+
+    progress = []
+    result = upscale_tiled(
+        image,
+        upscale,
+        2,
+        tile=64,
+        overlap=16,
+        batch=2,
+        workers=2,
+        progress=lambda done, total: progress.append((done, total)),
+    )
+    expected = np.asarray(image).repeat(2, axis=0).repeat(2, axis=1)
+    assert result.size == (300, 180)
+    np.testing.assert_array_equal(np.asarray(result), expected)
+    assert max(calls) <= 2
+    assert progress[-1][0] == progress[-1][1] == sum(calls)
+
+
+def test_seams_are_blended():
+    # A model that darkens tile borders leaves no hard edge once blended
+    def upscale(tiles):
+        out = tiles.copy()
+        out[:, :4] = out[:, -4:] = out[:, :, :4] = out[:, :, -4:] = 0
+        return out
+
+    result = np.asarray(upscale_tiled(Image.new("RGB", (200, 64), "white"), upscale, 1, 64, 24))
+    assert result[32, 8:-8].min() > 0
+
+
+def test_wrong_model_scale_and_size_limit():
+    with pytest.raises(ValueError, match="expected"):
+        upscale_tiled(_noise(64, 64), _repeat(2), 4, tile=32)
+    assert output_size((2048, 1024), 4) == (8192, 4096)
+    with pytest.raises(ValueError, match="exceeds"):
+        output_size((2048, 2048), 5)
@@ -11,6 +11,24 @@ export const api = axios.create({
 });
 
 // Types matching backend schemas
+export interface HiresFix {
+  upscaler?: "latent" | "lanczos";
+  steps?: number;
+  denoise?: number;
+}
+
+export interface FeatureCacheOptions {
+  interval?: number;
+  guard?: number;
+}
+
+export interface UpscaleOptions {
+  upscaler?: string; // model id from the upscalers directory; "" = Lanczos
+  scale?: number;
+  tile_size?: number;
+  tile_overlap?: number;
+}
+
 export interface GenerateRequest {
   mode?: string;
   prompt: string;
@@ -23,6 +41,22 @@ export interface GenerateRequest {
   seed?: number;
   sampler?: string;
   batch_size?: number;
+  hires?: HiresFix | null;
+  feature_cache?: FeatureCacheOptions | null;
+  source_image?: string;
+  mask_image?: string;
+  strength?: number;
+  inpaint_area?: "full" | "masked";
+  mask_padding?: number;
+  upscale?: UpscaleOptions;
+}
+
+export interface UploadInfo {
+  id: string;
+  width: number;
+  height: number;
+  format: string;
+  size_bytes: number;
 }
 
 export interface GeneratedImageInfo {
@@ -112,6 +146,18 @@ export const generateImage = async (
 ): Promise<JobResponse> =>
   api.post<JobResponse>("/generate", params).then(extractData);
 
+// Sent as the raw body so the server can stream it to disk
+export const uploadImage = async (file: Blob): Promise<UploadInfo> =>
+  api
+    .post<UploadInfo>("/uploads", file, {
+      headers: { "Content-Type": file.type || "application/octet-stream" },
+    })
+    .then(extractData);
+
+// Use a gallery image as a job's source, e.g. "send to img2img"
+export const sendToUploads = async (imageId: string): Promise<UploadInfo> =>
+  api.post<UploadInfo>(`/gallery/${imageId}/upload`).then(extractData);
+
 export const getJob = async (jobId: string): Promise<JobResponse> =>
   api.get<JobResponse>(`/jobs/${jobId}`).then(extractData);
 
@@ -9,6 +9,8 @@ export interface ProgressEvent {
   total_steps: number;
   percentage: number;
   preview_image: string | null;
+  pass_index: number;
+  total_passes: number;
 }
 
 export interface JobStartedEvent {
@@ -12,6 +12,8 @@ const buildProgressUpdate = (
   id: event.job_id,
   step: event.step,
   totalSteps: event.total_steps,
+  passIndex: event.pass_index,
+  totalPasses: event.total_passes,
   percentage: event.percentage,
   preview: event.preview_image,
 });
@@ -34,6 +34,9 @@ const OutputPanel = ({ error }: { error: string | null }): JSX.Element => {
           <div className="w-64">
             <div className="mb-1 flex justify-between text-xs text-neutral-500">
               <span>
+                {latestJob.totalPasses > 1
+                  ? `Pass ${String(latestJob.passIndex)}/${String(latestJob.totalPasses)} · `
+                  : ""}
                 Step {latestJob.step}/{latestJob.totalSteps}
               </span>
               <span>{Math.round(latestJob.progress)}%</span>
@@ -13,6 +13,13 @@ const SAMPLERS = [
   { value: "euler", label: "Euler" },
   { value: "dpm++_2m", label: "DPM++ 2M" },
   { value: "dpm++_2m_karras", label: "DPM++ 2M Karras" },
+  { value: "dpm++_2m_sde_karras", label: "DPM++ 2M SDE Karras" },
+  { value: "dpm++_3m_karras", label: "DPM++ 3M Karras" },
+  { value: "dpm++_sde_karras", label: "DPM++ SDE Karras" },
+  { value: "unipc", label: "UniPC" },
+  { value: "ddim", label: "DDIM" },
+  { value: "lcm", label: "LCM (distilled models)" },
+  { value: "tcd", label: "TCD (distilled models)" },
 ];
 
 const SIZES = [
@@ -9,6 +9,8 @@ interface QueueJob {
   progress: number;
   step: number;
   totalSteps: number;
+  passIndex: number;
+  totalPasses: number;
   previewImage: string | null;
   images: GeneratedImageInfo[];
   error: string | null;
@@ -19,6 +21,8 @@ export interface ProgressUpdate {
   id: string;
   step: number;
   totalSteps: number;
+  passIndex: number;
+  totalPasses: number;
   percentage: number;
   preview: string | null;
 }
@@ -51,6 +55,8 @@ const createNewJob = (id: string, prompt: string): QueueJob => ({
   progress: 0,
   step: 0,
   totalSteps: 0,
+  passIndex: 1,
+  totalPasses: 1,
   previewImage: null,
   images: [],
   error: null,
@@ -61,6 +67,8 @@ const applyProgress = (job: QueueJob, u: ProgressUpdate): QueueJob => ({
   ...job,
   step: u.step,
   totalSteps: u.totalSteps,
+  passIndex: u.passIndex,
+  totalPasses: u.totalPasses,
   progress: u.percentage,
   previewImage: u.preview ?? job.previewImage,
 });